@@ -4,49 +4,60 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 import streamlit as st
 import pandas as pd
-import base64
-import tempfile
-from pathlib import Path
+import time
+import ipaddress
+from datetime import timedelta
 
 # === SET PAGE TITLE ===
 st.set_page_config(page_title="Network Intrusion Detector Dashboard", layout="wide")
 
 sys.path.append(".")
 
-from core.auto_parser import parse_pcap_auto
-from pages.Analysis_Summary import show_analysis_summary
-from pages.Anomaly_Detection import show_anomaly_detection
-from pages.PCA_Analysis import show_pca_visualization
-from pages.Summary import show_summary
-
-# ===== DEBUG STARTUP LOG =====
-st.markdown("✅ App started (milzon debug)")
-st.markdown("### 📂 File di direktori saat ini:")
-try:
-    st.code("\n".join(os.listdir(".")))
-except Exception as e:
-    st.error(f"Gagal list root dir: {e}")
-
-if os.path.exists("assets"):
-    st.markdown("### 📁 Isi folder /assets:")
+from core.parse_cache import get_parse_cache
+from core.file_processor import spool_upload, max_upload_bytes, UploadTooLarge, load_background_image
+from core.jobs import get_job_manager, take_result, QUEUED, DONE, FAILED, CANCELLED
+from core.live_ingest import LiveSession, WINDOWS_MINUTES
+from core.packet_store import get_packet_store
+from core.datasets import get_dataset_registry
+from core.aggregates import build_summary_cube
+from core.flows import build_flows
+from core.indexes import PacketFilter, sort_by_time, build_packet_index
+from core.protocols import L3_NAMES, L4_NAMES, L7_NAMES
+from core.sketches import TrafficSketches, build_sketches, sketch_key, DEFAULT_CAPACITY, DEFAULT_PRECISION
+from core.metrics import metrics, profilers, RequestProfiler
+# Modul halaman (plotly, matplotlib, sklearn) diimpor saat halamannya dibuka, bukan saat start
+
+# ===== DEBUG STARTUP LOG (hanya bila NIDS_DEBUG=1) =====
+if os.environ.get("NIDS_DEBUG") == "1":
+    st.markdown("✅ App started (milzon debug)")
+    st.markdown("### 📂 File di direktori saat ini:")
     try:
-        st.code("\n".join(os.listdir("assets")))
+        st.code("\n".join(os.listdir(".")))
     except Exception as e:
-        st.error(f"Gagal list isi assets/: {e}")
-else:
-    st.warning("❗ Folder assets tidak ditemukan!")
+        st.error(f"Gagal list root dir: {e}")
+
+    if os.path.exists("assets"):
+        st.markdown("### 📁 Isi folder /assets:")
+        try:
+            st.code("\n".join(os.listdir("assets")))
+        except Exception as e:
+            st.error(f"Gagal list isi assets/: {e}")
+    else:
+        st.warning("❗ Folder assets tidak ditemukan!")
 
 
 # === BACKGROUND IMAGE SETUP ===
-background_image_path = "assets/background_NIDS.jpg"
+background_image_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "background_NIDS.jpg")
 
-if os.path.exists(background_image_path):
-    with open(background_image_path, "rb") as img_file:
-        img_bytes = img_file.read()
-        img_base64 = base64.b64encode(img_bytes).decode()
 
+@st.cache_resource(show_spinner=False)
+def background_css(image_path: str, mtime: float) -> str | None:
+    # Gambar dibaca & di-encode base64 sekali per proses (kunci mtime: berubah bila file diganti)
+    img_base64 = load_background_image(image_path)
+    if img_base64 is None:
+        return None
     # ⬇️ TIDAK BOLEH ADA INDENT DI SINI
-    st.markdown(f"""
+    return f"""
 <style>
 .stApp {{
     background-image: url("data:image/jpg;base64,{img_base64}");
@@ -78,7 +89,13 @@ p, li, span {{
     box-shadow: 0 0 15px rgba(0,0,0,0.4);
 }}
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+background_style = (background_css(background_image_path, os.path.getmtime(background_image_path))
+                    if os.path.exists(background_image_path) else None)
+if background_style is not None:
+    st.markdown(background_style, unsafe_allow_html=True)
 else:
     st.warning("⚠️ Background image tidak ditemukan.")
 
@@ -92,9 +109,227 @@ page = st.sidebar.radio("Pilih halaman:", (
     "Summary"
 ))
 
-# === INIT SESSION STATE DF ===
-if "df" not in st.session_state:
-    st.session_state["df"] = pd.DataFrame()
+# === STATISTIK CACHE PARSING ===
+with st.sidebar.expander("⚡ Parse Cache"):
+    cache_stats = get_parse_cache().stats()
+    st.write(f"Hit: {cache_stats['hits']} | Miss: {cache_stats['misses']}")
+    st.write(f"Byte dihemat: {cache_stats['bytes_saved'] / 1e6:,.1f} MB")
+    st.write(f"Ukuran cache: {cache_stats['size_bytes'] / 1e6:,.1f} / {cache_stats['max_bytes'] / 1e6:,.0f} MB ({cache_stats['entries']} file)")
+
+# === DATASET BERSAMA (satu salinan per capture untuk semua sesi) ===
+dataset_registry = get_dataset_registry()
+with st.sidebar.expander("🧠 Memori Dataset"):
+    registry_stats = dataset_registry.stats()
+    st.write(f"Di memori: {registry_stats['resident_bytes'] / 1e6:,.1f} / {registry_stats['budget_bytes'] / 1e6:,.0f} MB "
+             f"| Di disk: {registry_stats['spilled_bytes'] / 1e6:,.1f} MB")
+    st.write(f"Dibagi: {registry_stats['shares']} | Spill: {registry_stats['spills']} | Muat ulang: {registry_stats['reloads']}")
+    if registry_stats["datasets"]:
+        st.dataframe(dataset_registry.report(), use_container_width=True, hide_index=True)
+
+
+def set_dataset(handle):
+    # Sesi hanya memegang handle; handle lama dilepas agar registry bisa men-spill/melepas datanya
+    old = st.session_state.pop("dataset", None)
+    st.session_state.pop("filtered", None)
+    if old is not None and old is not handle:
+        old.release()
+    if handle is not None:
+        st.session_state["dataset"] = handle
+
+
+# === LIVE CAPTURE (tail file/direktori capture yang terus bertambah) ===
+with st.sidebar.expander("📡 Live Capture"):
+    live_path = st.text_input("File atau direktori capture:", value=st.session_state.get("live_path", ""),
+                              help="Mis. output `tcpdump -w` atau direktori rotasi `tcpdump -G`")
+    col_start, col_stop = st.columns(2)
+    if col_start.button("▶️ Mulai") and live_path:
+        if os.path.exists(live_path):
+            st.session_state["live"] = LiveSession(live_path)
+            st.session_state["live_path"] = live_path
+        else:
+            st.error("❌ Path capture tidak ditemukan.")
+    if col_stop.button("⏹️ Stop"):
+        st.session_state.pop("live", None)
+    live_window = st.radio("Jendela (menit):", WINDOWS_MINUTES, horizontal=True)
+    live_auto = st.checkbox("Refresh otomatis", value=False)
+    live_interval = st.number_input("Interval (detik):", min_value=1, max_value=300, value=5)
+
+live = st.session_state.get("live")
+if live is not None:
+    # Hanya record baru sejak checkpoint yang diparse pada setiap rerun
+    try:
+        live.refresh()
+    except Exception as e:
+        st.sidebar.error(f"❌ Live capture gagal: {e}")
+    st.sidebar.caption(f"📡 {live.total_packets:,} paket | +{live.last_new_packets:,} ({live.last_refresh_s:.2f}s)")
+
+# === SKETCH (top-K & hitungan unik dengan memori tetap) ===
+with st.sidebar.expander("🧮 Sketch"):
+    use_sketches = st.toggle("Gunakan sketch (memori konstan)", value=False,
+                             help="Top-K dengan Space-Saving + Count-Min, IP unik dengan HyperLogLog. "
+                                  "Berlaku untuk ingest berikutnya: cube tidak menyimpan grup per host")
+    sketch_params = {
+        "capacity": int(st.number_input("Counter top-K:", min_value=50, max_value=100_000, value=DEFAULT_CAPACITY, step=50)),
+        "epsilon": st.select_slider("Epsilon Count-Min:", options=[1e-5, 1e-4, 1e-3, 1e-2], value=1e-4),
+        "precision": st.slider("Presisi HyperLogLog (2^p register):", min_value=8, max_value=18, value=DEFAULT_PRECISION),
+    }
+
+
+# Mode sketch dipakai saat ingest: cube menyimpan sketch, bukan grup per host
+ingest_sketch_params = sketch_params if use_sketches else None
+
+
+def new_sketches() -> TrafficSketches | None:
+    return TrafficSketches(**sketch_params) if use_sketches else None
+
+
+def current_sketches(df: pd.DataFrame, dataset_key: str | None, cube=None):
+    # Cube mode sketch sudah membawa sketch-nya (satu-satunya sumber angka host)
+    if cube is not None and cube.sketches is not None:
+        return cube.sketches
+    # Dataset eksak (mis. jendela live): sketch dibangun sekali per dataset & parameter, disimpan di sesi
+    if not use_sketches or df.empty:
+        return None
+    key = (dataset_key or id(df), len(df), tuple(sorted(sketch_params.items())))
+    cached = st.session_state.get("sketches")
+    if cached is None or cached[0] != key:
+        cached = (key, build_sketches(df, **sketch_params))
+        st.session_state["sketches"] = cached
+    return cached[1]
+
+
+# === JOB INGEST DI BACKGROUND ===
+job_manager = get_job_manager()
+job = job_manager.get(st.session_state.get("job_id"))
+if job is not None and job.finished:
+    # Hasil job dikirim ke halaman sekali, lalu job dilepas dari sesi
+    if job.status == DONE:
+        set_dataset((take_result(job) or {}).get("dataset"))
+    elif job.status == FAILED:
+        set_dataset(None)
+        st.sidebar.error(f"❌ Ingest {job.name} gagal: {job.error}")
+    elif job.status == CANCELLED:
+        st.sidebar.warning(f"⏹️ Ingest {job.name} dibatalkan.")
+    st.session_state.pop("job_id", None)
+    job = None
+
+if job is not None:
+    with st.sidebar:
+        if job.status == QUEUED:
+            st.info(f"⏳ {job.name}: antre (posisi {job_manager.queue_position(job.job_id)})")
+        else:
+            eta = job.eta_seconds
+            st.progress(job.progress, text=f"{job.stage}: {job.bytes_done / 1e6:,.1f}/{job.total_bytes / 1e6:,.1f} MB, "
+                                           f"{job.packets_done:,} paket" + (f", ETA {eta:,.0f}s" if eta is not None else ""))
+        if st.button("⏹️ Batalkan ingest"):
+            job.cancel()
+
+with st.sidebar.expander("🧵 Antrean Ingest"):
+    st.caption(f"Worker: {job_manager.max_workers}")
+    for queued_job in job_manager.jobs()[-10:]:
+        st.write(f"{queued_job.name}: {queued_job.status} ({queued_job.progress:.0%})")
+
+# === PACKET STORE (arsip Parquet per jam, query dengan predicate pushdown) ===
+packet_store = get_packet_store()
+with st.sidebar.expander("🗄️ Packet Store"):
+    store_datasets = packet_store.datasets()
+    if not store_datasets:
+        st.caption("Belum ada dataset tersimpan.")
+    else:
+        store_name = st.selectbox("Dataset:", store_datasets)
+        store_info = packet_store.describe(store_name)
+        st.caption(f"{store_info['rows']:,} paket | {store_info['size_bytes'] / 1e6:,.1f} MB | "
+                   f"{store_info['start']} → {store_info['end']}")
+        store_start = st.text_input("Mulai:", value=str(store_info["start"] or ""))
+        store_end = st.text_input("Sampai:", value=str(store_info["end"] or ""))
+        store_src = st.text_input("Source IP (pisahkan koma):", value="")
+        store_protocol = st.text_input("Protocol (nomor):", value="")
+        if st.button("📂 Buka dari store"):
+            try:
+                started = time.perf_counter()
+
+                def load_from_store() -> dict:
+                    store_df = sort_by_time(packet_store.query(
+                        store_name,
+                        start=store_start or None,
+                        # batas akhir inklusif untuk input dari UI
+                        end=pd.Timestamp(store_end) + pd.Timedelta(1, "ns") if store_end else None,
+                        src=[s.strip() for s in store_src.split(",") if s.strip()] or None,
+                        protocol=int(store_protocol) if store_protocol.strip() else None,
+                    ))
+                    return {"df": store_df, "cube": build_summary_cube(store_df, sketches=new_sketches()),
+                            "flows": build_flows(store_df),
+                            "name": store_name, "index": build_packet_index(store_df)}
+
+                # versi store (jumlah file + mtime terakhir) agar hasil lama tidak dipakai setelah append
+                handle = dataset_registry.get_or_load(
+                    f"store:{store_name}@{store_info['version']}:{store_start}:{store_end}:{store_src}:{store_protocol}"
+                    + sketch_key(ingest_sketch_params), load_from_store)
+                set_dataset(handle)
+                st.success(f"✅ {handle.rows:,} paket dimuat ({time.perf_counter() - started:.2f}s)")
+            except (ValueError, FileNotFoundError) as e:
+                st.error(f"❌ Query gagal: {e}")
+
+# === PERFORMANCE (metrik per stage; tabel diisi setelah halaman dirender) ===
+perf_panel = st.sidebar.expander("⏱️ Performance")
+with perf_panel:
+    profile_tool = st.selectbox("Profil rerun ini:", ["off"] + profilers(),
+                                help="cProfile/pyinstrument untuk satu rerun halaman (menambah overhead)")
+profiler = RequestProfiler(profile_tool).start() if profile_tool != "off" else None
+
+# Dataset aktif sesi ini (dimuat ulang dari disk oleh registry bila sempat di-spill)
+dataset = st.session_state.get("dataset")
+df = dataset.df if dataset is not None else pd.DataFrame()
+
+
+# === FILTER GLOBAL (index dibangun saat ingest: irisan waktu + daftar posting host/port) ===
+def filter_sidebar(index) -> PacketFilter:
+    packet_filter = PacketFilter()
+    with st.sidebar.expander("🔎 Filter"):
+        bounds = index.time_bounds()
+        if bounds is not None and bounds[0] < bounds[1]:
+            t0, t1 = bounds[0].floor("s").to_pydatetime(), bounds[1].ceil("s").to_pydatetime()
+            chosen = st.slider("Rentang waktu:", min_value=t0, max_value=t1, value=(t0, t1),
+                               step=timedelta(seconds=1), format="YYYY-MM-DD HH:mm:ss")
+            if chosen != (t0, t1):
+                packet_filter.start, packet_filter.end = pd.Timestamp(chosen[0]), pd.Timestamp(chosen[1])
+        for field, label in (("src_cidr", "Source IP / CIDR:"), ("dst_cidr", "Destination IP / CIDR:")):
+            value = st.text_input(label, placeholder="10.0.0.0/8").strip()
+            if value:
+                try:
+                    ipaddress.ip_network(value, strict=False)
+                    setattr(packet_filter, field, value)
+                except ValueError:
+                    st.error(f"❌ CIDR tidak valid: {value}")
+        ports_text = st.text_input("Port (pisahkan koma):", placeholder="53, 443")
+        try:
+            packet_filter.ports = tuple(sorted({int(p) for p in ports_text.split(",") if p.strip()}))
+        except ValueError:
+            st.error(f"❌ Port tidak valid: {ports_text}")
+        packet_filter.protocols = tuple(st.multiselect(
+            "Protocol:", L7_NAMES + [n for n in L4_NAMES + L3_NAMES if n != "Other"]))
+    return packet_filter
+
+
+def filtered_view(dataset, df: pd.DataFrame, packet_filter: PacketFilter):
+    # (df, cube, flows, key) yang dipakai semua halaman; view terfilter disimpan di sesi per filter
+    if dataset is None or not packet_filter.active:
+        return df, (dataset.cube if dataset else None), (dataset.flows if dataset else None), \
+            (dataset.key if dataset else None)
+    key = f"{dataset.key}|{packet_filter.key}{sketch_key(ingest_sketch_params)}"
+    cached = st.session_state.get("filtered")
+    if cached is None or cached[0] != key:
+        view_df = dataset.index.select(df, packet_filter)
+        cached = (key, view_df, build_summary_cube(view_df, sketches=new_sketches()))
+        st.session_state["filtered"] = cached
+    # flow dibangun (sekali per key, lihat pages.Anomaly_Detection) hanya oleh halaman yang membutuhkannya
+    return cached[1], cached[2], None, key
+
+
+packet_filter = filter_sidebar(dataset.index) if dataset is not None and dataset.index is not None else PacketFilter()
+view_df, view_cube, view_flows, view_key = filtered_view(dataset, df, packet_filter)
+if packet_filter.active:
+    st.sidebar.caption(f"🔎 Filter aktif: {len(view_df):,} dari {len(df):,} paket")
 
 # === UPLOAD & HOME ===
 if page == "Upload & Home":
@@ -105,53 +340,151 @@ if page == "Upload & Home":
     uploaded_file = st.file_uploader(
         "Upload file:",
         type=["pcap", "pcapng", "csv"],
-        help="Limit 200MB per file – PCAP, PCAPNG, CSV"
+        help=f"Limit {max_upload_bytes() // (1024 * 1024)}MB per file – PCAP, PCAPNG, CSV"
     )
 
     if uploaded_file is not None:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(uploaded_file.name).suffix) as tmp_file:
-            tmp_file.write(uploaded_file.read())
-            tmp_path = tmp_file.name
+        # Ingest dikirim ke job manager sekali per file upload; script tidak menunggu parsing
+        if st.session_state.get("file_id") != uploaded_file.file_id:
+            try:
+                # Upload disalin per potongan + di-hash sekaligus; job yang menghapus file setelah selesai
+                with spool_upload(uploaded_file) as spooled:
+                    if job is not None:
+                        job.cancel()
+                    st.session_state["job_id"] = job_manager.submit(
+                        spooled.path, uploaded_file.name, delete_after=True, digest=spooled.digest,
+                        sketch_params=ingest_sketch_params)
+                    spooled.detach()
+            except UploadTooLarge as e:
+                st.error(str(e))
+            st.session_state["file_id"] = uploaded_file.file_id
+            job = job_manager.get(st.session_state.get("job_id"))
 
-        df = parse_pcap_auto(tmp_path)
+    # === BATCH: direktori / glob berisi banyak file capture ===
+    with st.expander("🗂️ Analisis batch (direktori / glob di server)"):
+        batch_spec = st.text_input("Direktori atau pola glob:", placeholder="/data/captures/*.pcap")
+        batch_jobs = st.number_input("Proses paralel:", min_value=1, max_value=os.cpu_count() or 1,
+                                     value=os.cpu_count() or 1)
+        if st.button("🚀 Proses batch") and batch_spec:
+            try:
+                if job is not None:
+                    job.cancel()
+                st.session_state["job_id"] = job_manager.submit_batch(batch_spec, batch_jobs=int(batch_jobs),
+                                                                     sketch_params=ingest_sketch_params)
+                job = job_manager.get(st.session_state["job_id"])
+            except FileNotFoundError as e:
+                st.error(f"❌ {e}")
 
-        if df is not None and not df.empty:
-            st.session_state["df"] = df
+    if uploaded_file is not None or job is not None or not df.empty:
+        if job is not None:
+            st.info(f"⏳ {job.name} sedang diproses di background. Halaman lain tetap bisa dibuka.")
+        elif df is not None and not df.empty:
             st.success(f"✅ File berhasil diproses! Jumlah baris: {len(df)}")
             st.markdown("### Contoh Data:")
-            st.dataframe(df.head(10), use_container_width=True)
+            st.dataframe(view_df.head(10), use_container_width=True)
+
+            flows = dataset.flows
+            if flows is not None and not flows.empty:
+                st.markdown(f"### 🔗 Flow 5-tuple: {len(flows):,}")
+                st.dataframe(flows.sort_values("bytes", ascending=False).head(10), use_container_width=True)
+
+            batch_report = dataset.extra.get("batch_report")
+            if batch_report is not None:
+                st.markdown("### 🗂️ Throughput per File")
+                st.dataframe(batch_report, use_container_width=True)
+
+            # === SIMPAN KE PACKET STORE ===
+            store_target = st.text_input("Nama dataset di packet store:",
+                                         value=dataset.name)
+            if st.button("💾 Simpan ke Packet Store") and store_target:
+                written = packet_store.append(store_target, df)
+                st.success(f"✅ {written:,} paket disimpan ke packet store: {store_target}")
         else:
             st.error("❌ Gagal memproses file atau data kosong.")
     st.markdown('</div>', unsafe_allow_html=True)
 
 # === ANALYSIS SUMMARY ===
 elif page == "Analysis Summary":
-    if st.session_state["df"].empty:
+    if df.empty:
         st.warning("⚠️ Belum ada data. Silakan upload file terlebih dahulu.")
+    elif view_df.empty:
+        st.info("ℹ️ Tidak ada paket yang cocok dengan filter.")
     else:
-        show_analysis_summary()
+        from pages.Analysis_Summary import show_analysis_summary
+        show_analysis_summary(view_df, view_cube, current_sketches(view_df, view_key, view_cube))
 
 # === ANOMALY DETECTION ===
 elif page == "Anomaly Detection":
-    df = st.session_state.get("df", pd.DataFrame())
-    if df.empty:
+    from pages.Anomaly_Detection import show_anomaly_detection
+    if live is not None:
+        st.caption(f"📡 Live: {live_window} menit terakhir")
+        live_df = live.windows.frame(live_window)
+        if live_df.empty:
+            st.info("⏳ Menunggu paket dari live capture...")
+        else:
+            show_anomaly_detection(live_df, live.windows.cube(live_window), live.windows.flows(live_window),
+                                   live.dataset_key(live_window))
+    elif df.empty:
         st.warning("⚠️ Belum ada data. Silakan upload file terlebih dahulu.")
+    elif view_df.empty:
+        st.info("ℹ️ Tidak ada paket yang cocok dengan filter.")
     else:
-        show_anomaly_detection(df)
+        show_anomaly_detection(view_df, view_cube, view_flows, view_key)
 
 # === PCA ANALYSIS ===
 elif page == "PCA Analysis":
-    df = st.session_state.get("df", pd.DataFrame())
+    from pages.PCA_Analysis import show_pca_visualization
     if df.empty:
         st.warning("⚠️ Belum ada data. Silakan upload file terlebih dahulu.")
+    elif view_df.empty:
+        st.info("ℹ️ Tidak ada paket yang cocok dengan filter.")
     else:
-        show_pca_visualization(df)
+        show_pca_visualization(view_df, view_key)
 
 # === SUMMARY ===
 elif page == "Summary":
-    if st.session_state["df"].empty:
+    from pages.Summary import show_summary
+    if live is not None:
+        st.caption(f"📡 Live: {live_window} menit terakhir")
+        live_df = live.windows.frame(live_window)
+        if live_df.empty:
+            st.info("⏳ Menunggu paket dari live capture...")
+        else:
+            show_summary(live_df, live.windows.cube(live_window),
+                         current_sketches(live_df, live.dataset_key(live_window)))
+    elif df.empty:
         st.warning("⚠️ Belum ada data. Silakan upload file terlebih dahulu.")
+    elif view_df.empty:
+        st.info("ℹ️ Tidak ada paket yang cocok dengan filter.")
+    else:
+        show_summary(view_df, view_cube, current_sketches(view_df, view_key, view_cube))
+
+# === HASIL PROFIL & METRIK ===
+if profiler is not None:
+    with st.expander(f"🔬 Profil rerun ({profile_tool})"):
+        st.code(profiler.stop())
+
+with perf_panel:
+    perf_summary = metrics.summary()
+    if perf_summary.empty:
+        st.caption("Belum ada stage yang tercatat.")
     else:
-        show_summary(st.session_state["df"])
+        st.dataframe(perf_summary, use_container_width=True, hide_index=True)
+        st.caption("Stage terakhir:")
+        st.dataframe(metrics.recent(20)[["stage", "wall_s", "cpu_s", "rows_in", "rows_out", "mem_delta_mb"]],
+                     use_container_width=True, hide_index=True)
+        col_json, col_prom = st.columns(2)
+        col_json.download_button("JSON", metrics.to_json(), file_name="nids_metrics.jsonl", mime="application/json")
+        col_prom.download_button("Prometheus", metrics.to_prometheus(), file_name="nids_metrics.prom", mime="text/plain")
+        if st.button("🧹 Reset metrik"):
+            metrics.reset()
+
+# === AUTO REFRESH (progres job / live capture) ===
+if job is not None:
+    time.sleep(1)
+    st.rerun()
+elif live is not None and live_auto:
+    time.sleep(live_interval)
+    st.rerun()
 
 # ✅ NID_ Milzon-QG-Ramin, Aug 2025
@@ -0,0 +1,60 @@
+# benchmarks/bench_compact_table.py
+#
+# Memori per paket dan kecepatan query top-talker: tabel object-string vs tabel compact.
+#   python -m benchmarks.bench_compact_table --packets 1000000 --hosts 50000
+
+import os
+import time
+import argparse
+import tempfile
+
+import pandas as pd
+
+from benchmarks.synthetic import generate_capture
+from core.auto_parser import parse_pcap_auto
+
+
+def _as_object_table(df: pd.DataFrame) -> pd.DataFrame:
+    # Representasi lama: alamat & protokol sebagai object/string per baris
+    out = df.copy()
+    for col in ("src", "dst", "protocol"):
+        if col in out.columns:
+            out[col] = out[col].astype(object)
+    return out
+
+
+def _top_talker_queries(df: pd.DataFrame) -> float:
+    start = time.perf_counter()
+    df["src"].value_counts().head(10)
+    df["dst"].value_counts().head(10)
+    df["src"].nunique()
+    df["dst"].nunique()
+    df["protocol"].value_counts()
+    return time.perf_counter() - start
+
+
+def measure(df: pd.DataFrame, label: str, repeat: int = 3) -> dict:
+    bytes_total = int(df.memory_usage(deep=True).sum())
+    seconds = min(_top_talker_queries(df) for _ in range(repeat))
+    return {"table": label, "bytes_per_packet": bytes_total / len(df), "query_seconds": seconds}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tabel paket compact (categorical) vs object.")
+    parser.add_argument("--packets", type=int, default=1_000_000)
+    parser.add_argument("--hosts", type=int, default=10_000, help="Jumlah host unik")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.pcap")
+        generate_capture(path, args.packets, n_hosts=args.hosts, ipv6_ratio=0.2)
+        compact = parse_pcap_auto(path)
+
+    results = [measure(_as_object_table(compact), "object"), measure(compact, "compact")]
+    print(f"{'tabel':<10}{'byte/paket':>12}{'query (s)':>12}")
+    for r in results:
+        print(f"{r['table']:<10}{r['bytes_per_packet']:>12.1f}{r['query_seconds']:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
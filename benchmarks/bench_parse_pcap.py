@@ -0,0 +1,75 @@
+# benchmarks/bench_parse_pcap.py
+#
+# Bandingkan parser native (mmap) dengan backend tshark (-T fields), keduanya dual-stack satu pass.
+#   python -m benchmarks.bench_parse_pcap --packets 200000
+#   python -m benchmarks.bench_parse_pcap --packets 200000 --mixed
+#   python -m benchmarks.bench_parse_pcap --file capture.pcapng --tshark-limit 20000
+
+import os
+import time
+import argparse
+import tempfile
+
+from benchmarks.synthetic import generate_capture
+from benchmarks.run_benchmarks import DEFAULT_STACK_MIX, MIXED_IPV6_RATIO
+
+
+def _time_call(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def bench_native(path: str) -> dict:
+    from parsers.parse_pcap_native import parse_pcap_file
+
+    df, elapsed = _time_call(parse_pcap_file, path)
+    return {"parser": "native", "rows": len(df), "seconds": elapsed, "rows_per_sec": len(df) / elapsed if elapsed else 0.0}
+
+
+def bench_tshark(path: str) -> dict:
+    import shutil
+
+    if shutil.which("tshark") is None:
+        return {"parser": "tshark", "skipped": "tshark tidak ditemukan"}
+    from parsers.parse_pcap import parse_pcap_file
+
+    df, elapsed = _time_call(parse_pcap_file, path)
+    return {"parser": "tshark", "rows": len(df), "seconds": elapsed, "rows_per_sec": len(df) / elapsed if elapsed else 0.0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parser PCAP native vs tshark.")
+    parser.add_argument("--file", help="Capture yang sudah ada (default: buat capture sintetis)")
+    parser.add_argument("--packets", type=int, default=200_000, help="Jumlah paket capture sintetis")
+    parser.add_argument("--format", choices=["pcap", "pcapng"], default="pcap")
+    parser.add_argument("--mixed", action="store_true",
+                        help="Capture sintetis dual-stack dengan ARP & tunnel (IP-in-IP, 6in4, GRE, VXLAN)")
+    parser.add_argument("--tshark-limit", type=int, default=20_000,
+                        help="Capture sintetis terpisah untuk tshark (proses eksternal, jauh lebih lambat)")
+    args = parser.parse_args()
+    options = {"ipv6_ratio": MIXED_IPV6_RATIO, "stack_mix": DEFAULT_STACK_MIX} if args.mixed else {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.file
+        if path is None:
+            path = os.path.join(tmp, f"bench.{args.format}")
+            generate_capture(path, args.packets, fmt=args.format, **options)
+        results = [bench_native(path)]
+
+        tshark_path = path
+        if args.file is None and args.tshark_limit < args.packets:
+            tshark_path = os.path.join(tmp, f"bench_small.{args.format}")
+            generate_capture(tshark_path, args.tshark_limit, fmt=args.format, **options)
+        results.append(bench_tshark(tshark_path))
+
+    print(f"{'parser':<10}{'rows':>12}{'detik':>10}{'rows/s':>14}")
+    for r in results:
+        if "skipped" in r:
+            print(f"{r['parser']:<10}  dilewati: {r['skipped']}")
+        else:
+            print(f"{r['parser']:<10}{r['rows']:>12,}{r['seconds']:>10.2f}{r['rows_per_sec']:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
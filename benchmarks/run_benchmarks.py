@@ -0,0 +1,325 @@
+# benchmarks/run_benchmarks.py
+#
+# Ukur setiap tahap pipeline (parse, preprocess, agregasi halaman, PCA, detektor, batch) pada capture
+# sintetis, simpan waktu/throughput/peak RSS ke JSON, dan gagal bila lebih lambat dari baseline.
+#   python -m benchmarks.run_benchmarks --sizes 10k,1m -o results.json
+#   python -m benchmarks.run_benchmarks --sizes 10k,1m --baseline benchmarks/baseline.json
+#   python -m benchmarks.run_benchmarks --sizes 10k,1m,10m --update-baseline benchmarks/baseline.json
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import resource
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from benchmarks.synthetic import generate_capture
+
+DEFAULT_SIZES = "10k,1m"
+
+# Campuran trafik: 2% port scan + 5% SYN flood dari sumber spoofed
+DEFAULT_PATTERNS = {"scan": 0.02, "ddos": 0.05}
+
+# Capture dual-stack terpisah: 30% IPv6, 5% ARP, 10% tunnel (IP-in-IP, 6in4, GRE, VXLAN)
+DEFAULT_STACK_MIX = {"arp": 0.05, "ipip": 0.025, "6in4": 0.025, "gre": 0.025, "vxlan": 0.025}
+MIXED_IPV6_RATIO = 0.3
+
+# Toleransi regresi: lebih lambat >25% (dan >100 ms) atau peak RSS >25% (dan >32 MB)
+TIME_TOLERANCE = 0.25
+RSS_TOLERANCE = 0.25
+MIN_SECONDS_DELTA = 0.1
+MIN_RSS_DELTA_MB = 32
+
+# Jalur interaktif setelah parse (parse sama persis di kedua jalur): ingest job + render semua halaman
+# (figur Plotly/matplotlib & serialisasinya). Pembanding tahap batch_analyze_capture.
+INTERACTIVE_STAGES = ("packet_index", "summary_cube", "flows", "interactive_pages")
+BATCH_SPEEDUP_TARGET = 10.0
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+DASHBOARD_PAGES = ("Summary", "Analysis Summary", "Anomaly Detection", "PCA Analysis")
+PAGE_TIMEOUT = 600
+
+# Tiap tahap diulang (waktu terbaik dipakai) selama total waktunya masih di bawah batas ini
+DEFAULT_REPEAT = 3
+REPEAT_BUDGET_SECONDS = 5.0
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1], 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+
+def reset_peak_rss():
+    # Linux: tulis "5" ke clear_refs mengembalikan VmHWM ke RSS saat ini
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def peak_rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # fallback (tidak bisa di-reset): puncak seluruh proses
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class StageTimer:
+    def __init__(self, packets: int, repeat: int = DEFAULT_REPEAT):
+        self.packets = packets
+        self.repeat = repeat
+        self.results = []
+
+    def run(self, stage: str, func, *args, rows: int | None = None, **kwargs):
+        timings, peak, spent = [], 0.0, 0.0
+        while len(timings) < self.repeat and (not timings or spent < REPEAT_BUDGET_SECONDS):
+            value = None  # lepaskan hasil ulangan sebelumnya agar tidak ikut peak RSS
+            reset_peak_rss()
+            start = time.perf_counter()
+            value = func(*args, **kwargs)
+            timings.append(time.perf_counter() - start)
+            spent += timings[-1]
+            peak = max(peak, peak_rss_mb())
+        seconds = min(timings)
+        rows = self.packets if rows is None else rows
+        self.results.append({
+            "packets": self.packets,
+            "stage": stage,
+            "seconds": round(seconds, 4),
+            "rows": rows,
+            "rows_per_sec": round(rows / seconds) if seconds > 0 else 0,
+            "runs": len(timings),
+            "peak_rss_mb": round(peak, 1),
+        })
+        print(f"  {stage:<34}{seconds:>9.3f}s{self.results[-1]['rows_per_sec']:>14,} baris/s"
+              f"{self.results[-1]['peak_rss_mb']:>10,.0f} MB", flush=True)
+        return value
+
+    def skip(self, stage: str, reason: str):
+        self.results.append({"packets": self.packets, "stage": stage, "skipped": reason})
+        print(f"  {stage:<34}dilewati: {reason}", flush=True)
+
+
+def render_pages(handle, pages: tuple[str, ...] = DASHBOARD_PAGES):
+    """
+    Jalankan halaman dashboard lewat AppTest seperti saat analis membuka tiap halaman.
+    """
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    # cache detektor/flow/PCA dikosongkan: yang diukur render pertama, bukan cache hit
+    st.cache_resource.clear()
+    st.cache_data.clear()
+    for page in pages:
+        app = AppTest.from_file(APP_PATH, default_timeout=PAGE_TIMEOUT)
+        app.session_state["dataset"] = handle
+        app.run()
+        app.sidebar.radio[0].set_value(page).run()
+        if app.exception:
+            raise RuntimeError(f"Halaman {page} gagal: {app.exception[0].value}")
+
+
+def bench_size(n_packets: int, workdir: str, formats: tuple[str, ...] = ("pcap", "pcapng", "csv"),
+               repeat: int = DEFAULT_REPEAT) -> list[dict]:
+    """
+    Semua tahap untuk satu ukuran capture (dijalankan di proses sendiri agar peak RSS bersih).
+    """
+    from parsers.parse_pcap_native import parse_pcap_file
+    from core.auto_parser import parse_pcap_auto
+    from core.preprocessor import preprocess_packets
+    from core.aggregates import build_summary_cube
+    from core.downsample import traffic_series, downsample
+    from core.sketches import build_sketches
+    from core.flows import build_flows
+    from core.pca import fit_packet_pca
+    from core.detectors import DETECTORS, run_detector
+    from core.indexes import sort_by_time, build_packet_index
+    from core.datasets import get_dataset_registry
+    from core.analysis import analyze_capture, analyze_batch
+
+    timer = StageTimer(n_packets, repeat)
+    paths = {fmt: os.path.join(workdir, f"bench-{n_packets}.{fmt}") for fmt in formats}
+    for fmt, path in paths.items():
+        timer.run(f"generate_{fmt}", generate_capture, path, n_packets, fmt=fmt,
+                  n_hosts=max(256, n_packets // 1_000), patterns=DEFAULT_PATTERNS)
+
+    # === Parsing ===
+    raw = None
+    for fmt in ("pcap", "pcapng"):
+        if fmt in paths:
+            raw = timer.run(f"parse_native_{fmt}", parse_pcap_file, paths[fmt])
+    cpus = os.cpu_count() or 1
+    if "pcap" in paths and cpus > 1:
+        timer.run(f"parse_native_parallel_x{cpus}", parse_pcap_file, paths["pcap"], jobs=cpus)
+    if "pcap" in paths:
+        mixed = os.path.join(workdir, f"bench-{n_packets}-mixed.pcap")
+        generate_capture(mixed, n_packets, n_hosts=max(256, n_packets // 1_000),
+                         ipv6_ratio=MIXED_IPV6_RATIO, stack_mix=DEFAULT_STACK_MIX)
+        timer.run("parse_native_mixed_stack", parse_pcap_file, mixed)
+        os.remove(mixed)
+    if "csv" in paths:
+        timer.run("parse_csv", parse_pcap_auto, paths["csv"])
+    if shutil.which("tshark") and "pcap" in paths:
+        from parsers.parse_pcap import parse_pcap_file as parse_tshark
+        timer.run("parse_tshark", parse_tshark, paths["pcap"])
+    else:
+        timer.skip("parse_tshark", "tshark tidak ditemukan")
+    if raw is None:
+        return timer.results
+    df = timer.run("preprocess_packets", preprocess_packets, raw)
+    del raw
+
+    # === Agregasi halaman ===
+    cube = timer.run("summary_cube", build_summary_cube, df)
+
+    def summary_page():
+        cube.top_talkers(10), cube.top_ports(10), cube.normalized_protocol_counts()
+        cube.unique_sources(), cube.unique_destinations()
+        traffic, _ = traffic_series(df, cube)
+        return downsample(traffic["packets"], method="minmax")
+
+    def analysis_page():
+        traffic, _ = traffic_series(df, cube)
+        smooth = (traffic["bytes"] / traffic["packets"]).rolling(window=10, min_periods=1).mean()
+        return downsample(smooth.dropna())
+
+    timer.run("page_summary", summary_page)
+    timer.run("page_analysis_summary", analysis_page)
+    timer.run("sketches", build_sketches, df)
+    flows = timer.run("flows", build_flows, df)
+
+    # === PCA & deteksi anomali ===
+    model = timer.run("pca_fit", fit_packet_pca, df)
+    timer.run("pca_transform", model.transform, df)
+    for name, detector in DETECTORS.items():
+        data = flows if detector.target == "flows" else df
+        timer.run(f"detector_{name}", run_detector, name, df, flows, rows=len(data))
+
+    # === Dashboard interaktif vs batch headless (tools/analyze_batch.py) ===
+    def packet_index():
+        ordered = sort_by_time(df)
+        return ordered, build_packet_index(ordered)
+
+    ordered, index = timer.run("packet_index", packet_index)
+    try:
+        import streamlit.testing.v1  # noqa: F401
+    except ImportError:
+        timer.skip("interactive_pages", "streamlit tidak terpasang")
+    else:
+        handle = get_dataset_registry().put(f"bench-{n_packets}", ordered, cube, flows, name="bench", index=index)
+        timer.run("interactive_pages", render_pages, handle)
+        handle.release()
+    del ordered, index
+
+    timer.run("batch_analyze_capture", analyze_capture, df)
+    if "pcap" in paths:
+        timer.run("batch_analyze", analyze_batch, paths["pcap"], jobs=1)
+
+    seconds = {r["stage"]: r["seconds"] for r in timer.results if "seconds" in r}
+    if all(stage in seconds for stage in INTERACTIVE_STAGES) and seconds["batch_analyze_capture"] > 0:
+        interactive = sum(seconds[stage] for stage in INTERACTIVE_STAGES)
+        batch = next(r for r in timer.results if r["stage"] == "batch_analyze_capture")
+        batch["interactive_seconds"] = round(interactive, 4)
+        batch["speedup_vs_interactive"] = round(interactive / batch["seconds"], 2)
+        print(f"  {'batch vs interaktif':<34}{batch['speedup_vs_interactive']:>9.2f}x "
+              f"({interactive:.3f}s interaktif)", flush=True)
+    return timer.results
+
+
+def run_benchmarks(sizes: list[int], formats: tuple[str, ...] = ("pcap", "pcapng", "csv"),
+                   workdir: str | None = None, repeat: int = DEFAULT_REPEAT) -> dict:
+    results = []
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        for n in sizes:
+            print(f"📦 {n:,} paket", flush=True)
+            # proses baru per ukuran: peak RSS & cache tidak terbawa ke ukuran berikutnya
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                results += pool.submit(bench_size, n, tmp, formats, repeat).result()
+            for name in os.listdir(tmp):
+                os.remove(os.path.join(tmp, name))
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "patterns": DEFAULT_PATTERNS,
+            "stack_mix": DEFAULT_STACK_MIX,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(results: dict, baseline: dict, time_tolerance: float = TIME_TOLERANCE,
+            rss_tolerance: float = RSS_TOLERANCE) -> list[str]:
+    """
+    Daftar regresi (kosong = lolos) terhadap baseline untuk tahap & ukuran yang sama,
+    ditambah tahap batch yang tidak mencapai `BATCH_SPEEDUP_TARGET` kali jalur interaktif.
+    """
+    base = {(r["packets"], r["stage"]): r for r in baseline.get("results", []) if "seconds" in r}
+    regressions = []
+    for r in results.get("results", []):
+        if r.get("speedup_vs_interactive", BATCH_SPEEDUP_TARGET) < BATCH_SPEEDUP_TARGET:
+            regressions.append(f"{r['stage']} @ {r['packets']:,}: hanya {r['speedup_vs_interactive']:.1f}x "
+                               f"lebih cepat dari interaktif (target {BATCH_SPEEDUP_TARGET:.0f}x)")
+        b = base.get((r["packets"], r["stage"]))
+        if b is None or "seconds" not in r:
+            continue
+        label = f"{r['stage']} @ {r['packets']:,}"
+        if r["seconds"] > b["seconds"] * (1 + time_tolerance) and r["seconds"] - b["seconds"] > MIN_SECONDS_DELTA:
+            regressions.append(f"{label}: {r['seconds']:.3f}s vs baseline {b['seconds']:.3f}s")
+        if (r["peak_rss_mb"] > b["peak_rss_mb"] * (1 + rss_tolerance)
+                and r["peak_rss_mb"] - b["peak_rss_mb"] > MIN_RSS_DELTA_MB):
+            regressions.append(f"{label}: peak RSS {r['peak_rss_mb']:.0f} MB vs baseline {b['peak_rss_mb']:.0f} MB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark semua tahap pipeline pada capture sintetis.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Jumlah paket, mis. 10k,1m,10m")
+    parser.add_argument("--formats", default="pcap,pcapng,csv")
+    parser.add_argument("-o", "--output", help="Tulis hasil ke file JSON")
+    parser.add_argument("--baseline", help="Bandingkan dengan baseline JSON; exit 1 bila ada regresi")
+    parser.add_argument("--update-baseline", help="Simpan hasil sebagai baseline baru")
+    parser.add_argument("--time-tolerance", type=float, default=TIME_TOLERANCE)
+    parser.add_argument("--rss-tolerance", type=float, default=RSS_TOLERANCE)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Ulangan per tahap (waktu terbaik)")
+    parser.add_argument("--workdir", help="Direktori sementara untuk capture (default: tmp sistem)")
+    args = parser.parse_args()
+
+    results = run_benchmarks([parse_size(s) for s in args.sizes.split(",")],
+                             tuple(f.strip() for f in args.formats.split(",")), args.workdir, args.repeat)
+    for path in filter(None, (args.output, args.update_baseline)):
+        with open(path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Ditulis: {path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("cpu_count") != results["meta"]["cpu_count"]:
+            print("⚠️ Baseline dibuat di mesin dengan jumlah CPU berbeda; perbandingan bisa bias.")
+        regressions = compare(results, baseline, args.time_tolerance, args.rss_tolerance)
+        if regressions:
+            print("❌ Regresi terhadap baseline:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print("✅ Tidak ada regresi terhadap baseline.")
+
+
+if __name__ == "__main__":
+    main()
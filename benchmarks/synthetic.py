@@ -0,0 +1,407 @@
+# benchmarks/synthetic.py
+
+import struct
+import numpy as np
+
+# Ukuran header per jenis paket (tanpa payload, caplen = header saja)
+_ETH_LEN = 14
+_IPV4_LEN = 20
+_IPV6_LEN = 40
+_L4_LEN = {"tcp": 20, "udp": 8, "icmp": 8}
+_IP_PROTO = {"tcp": 6, "udp": 17, "icmp": 1}
+_IP6_PROTO = {"tcp": 6, "udp": 17, "icmp": 58}
+
+# Enkapsulasi per paket (`stack_mix`): kode, nomor protokol IP luar, panjang header luar setelah Ethernet
+ENCAPSULATIONS = ("none", "arp", "ipip", "6in4", "gre", "vxlan")
+_ENCAP_CODE = {name: code for code, name in enumerate(ENCAPSULATIONS)}
+_OUTER_PROTO = {"ipip": 4, "6in4": 41, "gre": 47, "vxlan": 17}
+# IPv4 luar (+ GRE 4 byte / UDP 8 + VXLAN 8 + Ethernet dalam 14)
+_OUTER_LEN = {"ipip": 20, "6in4": 20, "gre": 24, "vxlan": 50}
+_ARP_LEN = 28
+VXLAN_PORT = 4789
+# Indeks host endpoint tunnel (10.255.255.241 -> 10.255.255.242)
+TUNNEL_HOSTS = (0xFFFFF0, 0xFFFFF1)
+
+
+def write_pcap(path: str, frames: list[bytes], timestamps: list[float], orig_lengths: list[int] | None = None,
+               linktype: int = 1, nanosecond: bool = False):
+    """
+    Tulis daftar frame mentah ke file libpcap klasik.
+    """
+    magic = 0xA1B23C4D if nanosecond else 0xA1B2C3D4
+    scale = 1_000_000_000 if nanosecond else 1_000_000
+    with open(path, "wb") as f:
+        f.write(struct.pack("<IHHiIII", magic, 2, 4, 0, 0, 65535, linktype))
+        for i, frame in enumerate(frames):
+            ts = timestamps[i]
+            sec = int(ts)
+            frac = int(round((ts - sec) * scale))
+            orig = orig_lengths[i] if orig_lengths is not None else len(frame)
+            f.write(struct.pack("<IIII", sec, frac, len(frame), orig))
+            f.write(frame)
+
+
+def write_pcapng(path: str, frames: list[bytes], timestamps: list[float], orig_lengths: list[int] | None = None,
+                 linktype: int = 1):
+    """
+    Tulis daftar frame mentah ke file pcapng (SHB + satu IDB + EPB, resolusi mikrodetik).
+    """
+    with open(path, "wb") as f:
+        f.write(_pcapng_header(linktype))
+        for i, frame in enumerate(frames):
+            ts = int(round(timestamps[i] * 1_000_000))
+            orig = orig_lengths[i] if orig_lengths is not None else len(frame)
+            pad = (-len(frame)) % 4
+            total = 32 + len(frame) + pad
+            f.write(struct.pack("<IIIIIII", 6, total, 0, ts >> 32, ts & 0xFFFFFFFF, len(frame), orig))
+            f.write(frame + b"\x00" * pad)
+            f.write(struct.pack("<I", total))
+
+
+def _pcapng_header(linktype: int) -> bytes:
+    shb = struct.pack("<IIIHHqI", 0x0A0D0D0A, 28, 0x1A2B3C4D, 1, 0, -1, 28)
+    idb = struct.pack("<IIHHII", 1, 20, linktype, 0, 65535, 20)
+    return shb + idb
+
+
+def generate_capture(path: str, n_packets: int, fmt: str = "pcap", ipv6_ratio: float = 0.1,
+                     n_hosts: int = 256, protocol_mix: dict | None = None, start_time: float = 1_700_000_000.0,
+                     duration: float = 3600.0, seed: int = 0, patterns: dict | None = None,
+                     stack_mix: dict | None = None) -> dict:
+    """
+    Buat capture sintetis (Ethernet + IPv4/IPv6 + TCP/UDP/ICMP) secara vektor dengan numpy.
+
+    Setiap record hanya menyimpan header (caplen kecil), panjang asli paket diacak
+    sehingga file jutaan paket tetap cepat dibuat. `fmt` = pcap, pcapng atau csv.
+    `patterns` menyisipkan serangan sebagai fraksi paket, mis. {"scan": 0.02, "ddos": 0.1}.
+    `stack_mix` membungkus fraksi paket dalam ARP/tunnel, mis. {"arp": 0.05, "gre": 0.1}
+    (lihat `ENCAPSULATIONS`). Mengembalikan ringkasan ground truth.
+    """
+    rng = np.random.default_rng(seed)
+    protocol_mix = protocol_mix or {"tcp": 0.7, "udp": 0.25, "icmp": 0.05}
+    names = list(protocol_mix)
+    probs = np.array([protocol_mix[k] for k in names], dtype=float)
+    proto_idx = rng.choice(len(names), size=n_packets, p=probs / probs.sum())
+    is_v6 = rng.random(n_packets) < ipv6_ratio
+
+    times = start_time + np.sort(rng.random(n_packets)) * duration
+    src_host = rng.integers(0, n_hosts, n_packets)
+    dst_host = rng.integers(0, n_hosts, n_packets)
+    sport = rng.integers(1024, 65535, n_packets).astype(np.uint16)
+    dport = rng.choice(np.array([53, 80, 443, 22, 123, 8080], dtype=np.uint16), size=n_packets)
+    orig_len = rng.integers(60, 1515, n_packets).astype(np.uint32)
+
+    proto = np.array(names)[proto_idx]
+    tcp_flags = np.full(n_packets, 0x18, dtype=np.uint8)
+
+    truth = {}
+    pattern_rows = _pattern_rows(rng, n_packets, patterns or {})
+    if "scan" in pattern_rows:
+        # satu penyerang (host di luar populasi normal) mengirim SYN ke port berurutan milik host 0
+        rows = pattern_rows["scan"]
+        proto[rows], is_v6[rows], tcp_flags[rows] = "tcp", False, 0x02
+        src_host[rows], dst_host[rows] = n_hosts, 0
+        dport[rows] = (np.arange(len(rows)) % 65535 + 1).astype(np.uint16)
+        orig_len[rows] = 60
+        truth["scan"] = {"packets": len(rows), "attacker": _ipv4_text(n_hosts), "target": _ipv4_text(0)}
+    if "ddos" in pattern_rows:
+        # SYN flood dari sumber acak (spoofed) ke port 80 host 1
+        rows = pattern_rows["ddos"]
+        proto[rows], is_v6[rows], tcp_flags[rows] = "tcp", False, 0x02
+        src_host[rows] = n_hosts + 1 + rng.integers(0, 1 << 20, len(rows))
+        dst_host[rows], dport[rows] = 1, 80
+        orig_len[rows] = 60
+        truth["ddos"] = {"packets": len(rows), "victim": _ipv4_text(1),
+                         "sources": int(len(np.unique(src_host[rows])))}
+
+    encap = _encapsulation(rng, n_packets, stack_mix or {})
+    if encap is not None:
+        # 6in4 selalu membawa IPv6, IP-in-IP & ARP selalu IPv4
+        is_v6[encap == _ENCAP_CODE["6in4"]] = True
+        is_v6[np.isin(encap, (_ENCAP_CODE["ipip"], _ENCAP_CODE["arp"]))] = False
+        truth["encap_counts"] = {name: int((encap == code).sum()) for name, code in _ENCAP_CODE.items()}
+
+    packets = {
+        "time": times,
+        "proto": proto,
+        "is_v6": is_v6,
+        "src_host": src_host,
+        "dst_host": dst_host,
+        "sport": sport,
+        "dport": dport,
+        "length": orig_len,
+        "tcp_flags": tcp_flags,
+    }
+    if encap is not None:
+        packets["encap"] = encap
+    if fmt == "csv":
+        write_csv(path, packets)
+    else:
+        write_packets(path, packets, fmt=fmt)
+    return {
+        "n_packets": n_packets,
+        "n_ipv6": int(is_v6.sum()),
+        "bytes": int(orig_len.sum()),
+        "proto_counts": {k: int((proto == k).sum()) for k in names},
+        **truth,
+    }
+
+
+def _encapsulation(rng, n_packets: int, stack_mix: dict) -> np.ndarray | None:
+    # Kode enkapsulasi per paket; None bila tidak ada campuran (angka acak lain tidak berubah)
+    unknown = set(stack_mix) - set(ENCAPSULATIONS)
+    if unknown:
+        raise ValueError(f"Enkapsulasi tidak dikenal: {sorted(unknown)}")
+    if not stack_mix:
+        return None
+    probs = np.array([stack_mix.get(name, 0.0) for name in ENCAPSULATIONS], dtype=float)
+    probs[0] = max(0.0, 1.0 - probs[1:].sum())
+    return rng.choice(len(ENCAPSULATIONS), size=n_packets, p=probs / probs.sum()).astype(np.int8)
+
+
+def _pattern_rows(rng, n_packets: int, patterns: dict) -> dict:
+    # Baris berbeda untuk tiap pola serangan (tanpa tumpang tindih)
+    unknown = set(patterns) - {"scan", "ddos"}
+    if unknown:
+        raise ValueError(f"Pola tidak dikenal: {sorted(unknown)}")
+    if not patterns:
+        return {}
+    order = rng.permutation(n_packets)
+    rows, start = {}, 0
+    for name, ratio in patterns.items():
+        count = int(round(n_packets * ratio))
+        rows[name] = np.sort(order[start:start + count])
+        start += count
+    return rows
+
+
+def _ipv4_text(host: int) -> str:
+    value = int(host_ipv4(np.array([host]))[0])
+    return ".".join(str((value >> shift) & 0xFF) for shift in (24, 16, 8, 0))
+
+
+def _wire_fields(packets: dict) -> dict:
+    # Nilai per paket seperti yang terbaca dari kabel: header luar, header dalam tunnel, port, ethertype
+    proto, is_v6 = packets["proto"], packets["is_v6"]
+    n = len(proto)
+    encap = packets.get("encap", np.zeros(n, dtype=np.int8))
+    plain, arp = encap == _ENCAP_CODE["none"], encap == _ENCAP_CODE["arp"]
+    tunnel = ~plain & ~arp
+    vxlan = encap == _ENCAP_CODE["vxlan"]
+
+    ip_proto = np.select([proto == "tcp", proto == "udp"], [6, 17], np.where(is_v6, 58, 1))
+    for name, number in _OUTER_PROTO.items():
+        ip_proto = np.where(encap == _ENCAP_CODE[name], number, ip_proto)
+    is_tcp, is_udp = plain & (proto == "tcp"), (plain & (proto == "udp")) | vxlan
+    return {
+        "src": (np.where(tunnel, TUNNEL_HOSTS[0], packets["src_host"]), is_v6 & plain, np.ones(n, dtype=bool)),
+        "dst": (np.where(tunnel, TUNNEL_HOSTS[1], packets["dst_host"]), is_v6 & plain, np.ones(n, dtype=bool)),
+        "inner_src": (packets["src_host"], is_v6, tunnel),
+        "inner_dst": (packets["dst_host"], is_v6, tunnel),
+        "protocol": (ip_proto, ~arp),
+        "ethertype": np.select([arp, is_v6 & plain], [0x0806, 0x86DD], 0x0800),
+        "is_tcp": is_tcp,
+        "is_udp": is_udp,
+        "dport": np.where(vxlan, VXLAN_PORT, packets["dport"]).astype(np.uint16),
+    }
+
+
+def write_csv(path: str, packets: dict):
+    """
+    Kolom paket ke CSV dengan skema yang sama seperti parser native (time = epoch detik).
+    """
+    import ipaddress
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+
+    wire = _wire_fields(packets)
+    is_tcp, is_udp = wire["is_tcp"], wire["is_udp"]
+
+    def addresses(hosts, v6, present):
+        # format teks hanya untuk host unik, lalu di-take per paket
+        keys = np.where(v6, -1 - hosts.astype(np.int64), hosts.astype(np.int64))
+        uniques, codes = np.unique(keys, return_inverse=True)
+        text = [str(ipaddress.IPv6Address(bytes(host_ipv6_bytes(np.array([-1 - k]))[0]))) if k < 0
+                else str(ipaddress.IPv4Address(int(host_ipv4(np.array([k]))[0]))) for k in uniques]
+        return pa.DictionaryArray.from_arrays(pa.array(codes.astype(np.int32), mask=~present),
+                                              pa.array(text)).cast(pa.string())
+
+    def masked(values, mask, type=pa.uint16()):
+        return pa.array(values, mask=~mask, type=type)
+
+    protocol, has_protocol = wire["protocol"]
+    table = pa.table({
+        "time": packets["time"],
+        **{col: addresses(*wire[col]) for col in ("src", "dst", "inner_src", "inner_dst")},
+        "length": packets["length"],
+        "protocol": masked(protocol, has_protocol, pa.uint8()),
+        "ethertype": pa.array(wire["ethertype"], type=pa.uint16()),
+        "tcp_srcport": masked(packets["sport"], is_tcp),
+        "tcp_dstport": masked(wire["dport"], is_tcp),
+        "udp_srcport": masked(packets["sport"], is_udp),
+        "udp_dstport": masked(wire["dport"], is_udp),
+        "tcp_flags": masked(packets["tcp_flags"], is_tcp, pa.uint8()),
+    })
+    pa_csv.write_csv(table, path)
+
+
+def write_packets(path: str, packets: dict, fmt: str = "pcap"):
+    """
+    Serialisasi kolom paket (lihat `generate_capture`) ke pcap/pcapng tanpa loop per paket.
+    """
+    n = len(packets["time"])
+    proto = packets["proto"]
+    is_v6 = packets["is_v6"]
+    encap = packets.get("encap", np.zeros(n, dtype=np.int8))
+    arp, tunnel = encap == _ENCAP_CODE["arp"], encap > _ENCAP_CODE["arp"]
+    outer_len = np.array([_OUTER_LEN.get(name, 0) for name in ENCAPSULATIONS], dtype=np.int64)[encap]
+    l3_len = np.select([arp, is_v6], [_ARP_LEN, _IPV6_LEN], _IPV4_LEN)
+    l4_len = np.select([arp, proto == "tcp", proto == "udp"], [0, _L4_LEN["tcp"], _L4_LEN["udp"]], _L4_LEN["icmp"])
+    caplen = (_ETH_LEN + outer_len + l3_len + l4_len).astype(np.int64)
+
+    if fmt == "pcapng":
+        rec_hdr = 28
+        pad = (-caplen) % 4
+        rec_len = rec_hdr + caplen + pad + 4
+        file_hdr = _pcapng_header(1)
+    else:
+        rec_hdr = 16
+        rec_len = rec_hdr + caplen
+        file_hdr = struct.pack("<IHHiIII", 0xA1B2C3D4, 2, 4, 0, 0, 65535, 1)
+
+    starts = np.zeros(n, dtype=np.int64)
+    if n:
+        starts[1:] = np.cumsum(rec_len)[:-1]
+    starts += len(file_hdr)
+    total = len(file_hdr) + int(rec_len.sum())
+    buf = np.zeros(total, dtype=np.uint8)
+    buf[:len(file_hdr)] = np.frombuffer(file_hdr, dtype=np.uint8)
+
+    times = packets["time"]
+    if fmt == "pcapng":
+        ts = np.round(times * 1_000_000).astype(np.uint64)
+        _put_u32le(buf, starts, 6)
+        _put_u32le(buf, starts + 4, rec_len)
+        _put_u32le(buf, starts + 8, 0)
+        _put_u32le(buf, starts + 12, ts >> np.uint64(32))
+        _put_u32le(buf, starts + 16, ts & np.uint64(0xFFFFFFFF))
+        _put_u32le(buf, starts + 20, caplen)
+        _put_u32le(buf, starts + 24, packets["length"])
+        _put_u32le(buf, starts + rec_len - 4, rec_len)
+    else:
+        sec = np.floor(times).astype(np.int64)
+        usec = np.round((times - sec) * 1_000_000).astype(np.int64).clip(0, 999_999)
+        _put_u32le(buf, starts, sec)
+        _put_u32le(buf, starts + 4, usec)
+        _put_u32le(buf, starts + 8, caplen)
+        _put_u32le(buf, starts + 12, packets["length"])
+
+    eth = starts + rec_hdr
+    buf[eth[:, None] + np.arange(6)] = np.array([0x00, 0x11, 0x22, 0x33, 0x44, 0x55], dtype=np.uint8)
+    buf[eth[:, None] + 6 + np.arange(6)] = np.array([0x66, 0x77, 0x88, 0x99, 0xAA, 0xBB], dtype=np.uint8)
+    _put_u16be(buf, eth + 12, np.select([arp, tunnel, is_v6], [0x0806, 0x0800, 0x86DD], 0x0800))
+
+    if tunnel.any():
+        _write_tunnels(buf, eth + _ETH_LEN, packets, encap, tunnel)
+
+    l3 = eth + _ETH_LEN + outer_len
+    src_host = packets["src_host"].astype(np.int64)
+    dst_host = packets["dst_host"].astype(np.int64)
+    ip_proto = np.select([proto == "tcp", proto == "udp"], [6, 17], 1)
+    payload_len = packets["length"].astype(np.int64) - _ETH_LEN - outer_len
+
+    rows = np.flatnonzero(arp)
+    p = l3[rows]
+    # ARP request Ethernet/IPv4: htype 1, ptype 0x0800, hlen 6, plen 4, oper 1
+    _put_u16be(buf, p, 1)
+    _put_u16be(buf, p + 2, 0x0800)
+    buf[p + 4], buf[p + 5] = 6, 4
+    _put_u16be(buf, p + 6, 1)
+    _put_u32be(buf, p + 14, host_ipv4(src_host[rows]))
+    _put_u32be(buf, p + 24, host_ipv4(dst_host[rows]))
+
+    v4 = np.flatnonzero(~is_v6 & ~arp)
+    p = l3[v4]
+    buf[p] = 0x45
+    _put_u16be(buf, p + 2, payload_len[v4])
+    buf[p + 8] = 64
+    buf[p + 9] = ip_proto[v4]
+    _put_u32be(buf, p + 12, host_ipv4(src_host[v4]))
+    _put_u32be(buf, p + 16, host_ipv4(dst_host[v4]))
+
+    v6 = np.flatnonzero(is_v6)
+    p = l3[v6]
+    buf[p] = 0x60
+    _put_u16be(buf, p + 4, payload_len[v6] - _IPV6_LEN)
+    buf[p + 6] = np.where(ip_proto[v6] == 1, _IP6_PROTO["icmp"], ip_proto[v6])
+    buf[p + 7] = 64
+    buf[p[:, None] + 8 + np.arange(16)] = host_ipv6_bytes(src_host[v6])
+    buf[p[:, None] + 24 + np.arange(16)] = host_ipv6_bytes(dst_host[v6])
+
+    l4 = l3 + l3_len
+    ports = np.flatnonzero((proto != "icmp") & ~arp)
+    _put_u16be(buf, l4[ports], packets["sport"][ports])
+    _put_u16be(buf, l4[ports] + 2, packets["dport"][ports])
+    tcp = np.flatnonzero((proto == "tcp") & ~arp)
+    buf[l4[tcp] + 12] = 0x50
+    buf[l4[tcp] + 13] = packets["tcp_flags"][tcp] if "tcp_flags" in packets else 0x18
+
+    with open(path, "wb") as f:
+        f.write(buf.tobytes())
+
+
+def _write_tunnels(buf, outer, packets: dict, encap: np.ndarray, tunnel: np.ndarray):
+    # Header IPv4 luar antar endpoint tunnel, plus header GRE / UDP + VXLAN + Ethernet dalam
+    rows = np.flatnonzero(tunnel)
+    p, code = outer[rows], encap[rows]
+    inner_type = np.where(packets["is_v6"][rows], 0x86DD, 0x0800)
+    buf[p] = 0x45
+    _put_u16be(buf, p + 2, packets["length"][rows].astype(np.int64) - _ETH_LEN)
+    buf[p + 8] = 64
+    buf[p + 9] = np.array([_OUTER_PROTO.get(name, 0) for name in ENCAPSULATIONS], dtype=np.uint8)[code]
+    _put_u32be(buf, p + 12, host_ipv4(np.full(len(rows), TUNNEL_HOSTS[0])))
+    _put_u32be(buf, p + 16, host_ipv4(np.full(len(rows), TUNNEL_HOSTS[1])))
+
+    gre = code == _ENCAP_CODE["gre"]
+    _put_u16be(buf, p[gre] + _IPV4_LEN + 2, inner_type[gre])
+
+    vxlan = code == _ENCAP_CODE["vxlan"]
+    udp = p[vxlan] + _IPV4_LEN
+    _put_u16be(buf, udp, packets["sport"][rows][vxlan])
+    _put_u16be(buf, udp + 2, VXLAN_PORT)
+    _put_u16be(buf, udp + 4, packets["length"][rows][vxlan].astype(np.int64) - _ETH_LEN - _IPV4_LEN)
+    buf[udp + 8] = 0x08
+    _put_u16be(buf, udp + 16 + 12, inner_type[vxlan])
+
+
+def host_ipv4(host: np.ndarray) -> np.ndarray:
+    """Indeks host -> alamat IPv4 10.x.y.z (uint32)."""
+    return (0x0A000000 + np.asarray(host, dtype=np.int64) + 1).astype(np.uint32)
+
+
+def host_ipv6_bytes(host: np.ndarray) -> np.ndarray:
+    """Indeks host -> alamat IPv6 2001:db8::/64 sebagai matriks byte (n, 16)."""
+    host = np.asarray(host, dtype=np.int64) + 1
+    out = np.zeros((len(host), 16), dtype=np.uint8)
+    out[:, :4] = [0x20, 0x01, 0x0D, 0xB8]
+    for i in range(8):
+        out[:, 15 - i] = (host >> (8 * i)) & 0xFF
+    return out
+
+
+def _put_u16be(buf, pos, value):
+    value = np.asarray(value, dtype=np.int64)
+    buf[pos] = (value >> 8) & 0xFF
+    buf[pos + 1] = value & 0xFF
+
+
+def _put_u32be(buf, pos, value):
+    value = np.asarray(value, dtype=np.int64)
+    for i in range(4):
+        buf[pos + i] = (value >> (24 - 8 * i)) & 0xFF
+
+
+def _put_u32le(buf, pos, value):
+    value = np.asarray(value).astype(np.int64)
+    for i in range(4):
+        buf[pos + i] = (value >> (8 * i)) & 0xFF
@@ -0,0 +1,281 @@
+# core/aggregates.py
+
+import logging
+import numpy as np
+import pandas as pd
+from typing import Iterable
+
+from core.auto_parser import parse_pcap_iter, DEFAULT_CHUNK_ROWS
+from core.metrics import timed_stage
+from core.protocols import LAYER_COLUMNS, protocol_label
+
+logger = logging.getLogger(__name__)
+
+# Bin histogram panjang paket tetap agar hasil tiap potongan bisa dijumlahkan
+LENGTH_BINS = np.append(np.arange(0, 1601, 50), [9001, np.inf])
+
+# Ambang "paket besar" yang dipakai halaman Anomaly Detection
+LARGE_PACKET_BYTES = 1400
+LARGE_PACKET_SAMPLE = 20
+
+_VALUE_COLUMNS = ["packets", "bytes"]
+
+
+def value_counts(s: pd.Series) -> pd.Series:
+    """
+    `value_counts` tanpa kategori kosong dan dengan index biasa (aman dijumlahkan antar potongan).
+    """
+    counts = s.value_counts(sort=False)
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        counts = counts[counts > 0]
+        counts.index = counts.index.astype(object)
+    return counts
+
+
+def _coalesce_ports(df: pd.DataFrame, tcp_col: str, udp_col: str) -> pd.Series | None:
+    tcp = df[tcp_col] if tcp_col in df.columns else None
+    udp = df[udp_col] if udp_col in df.columns else None
+    if tcp is not None and udp is not None:
+        return tcp.fillna(udp)
+    return tcp if tcp is not None else udp
+
+
+def destination_ports(df: pd.DataFrame) -> pd.Series | None:
+    # Port tujuan TCP atau UDP dalam satu kolom
+    return _coalesce_ports(df, 'tcp_dstport', 'udp_dstport')
+
+
+def source_ports(df: pd.DataFrame) -> pd.Series | None:
+    # Port sumber TCP atau UDP dalam satu kolom
+    return _coalesce_ports(df, 'tcp_srcport', 'udp_srcport')
+
+
+def _plain_index(index: pd.Index) -> pd.Index:
+    if isinstance(index, pd.MultiIndex):
+        return index.set_levels([_plain_index(level) for level in index.levels])
+    return index.astype(object) if isinstance(index.dtype, pd.CategoricalDtype) else index
+
+
+def _group_sum(keys: list[pd.Series], lengths: pd.Series, dropna: bool = True) -> pd.DataFrame:
+    # Jumlah paket & byte per grup. Kunci categorical dikelompokkan lewat kodenya; hanya index
+    # hasil (O(grup)) yang dibuat non-categorical agar bisa digabung antar potongan
+    out = lengths.groupby(keys, dropna=dropna, sort=False, observed=True).agg(['size', 'sum'])
+    out.columns = _VALUE_COLUMNS
+    out.index = _plain_index(out.index)
+    return out.astype('int64')
+
+
+def _merge_groups(total: pd.DataFrame | None, part: pd.DataFrame) -> pd.DataFrame:
+    if total is None or total.empty:
+        return part
+    if part.empty:
+        return total
+    levels = list(range(total.index.nlevels))
+    return pd.concat([total, part]).groupby(level=levels, dropna=False, sort=False).sum()
+
+
+class PacketAggregates:
+    """
+    "Summary cube": agregasi yang dilipat per potongan dan dipakai bersama semua halaman.
+
+    Berisi jumlah paket & byte per (menit, protokol, l3, l4, l7), per IP sumber, per IP tujuan, per port
+    tujuan, histogram panjang dengan bin tetap, dan contoh baris paket besar. Ukurannya
+    sebanding dengan jumlah grup, bukan jumlah paket.
+
+    Dengan `sketches` (`core.sketches.TrafficSketches`) grup per host tidak dibuat: sketch dilipat
+    pada potongan yang sama dan menjawab query host, sehingga memori tidak tumbuh dengan jumlah host.
+    """
+
+    def __init__(self, sketches=None):
+        self.sketches = sketches
+        self.total_packets = 0
+        self.total_bytes = 0
+        self.by_minute_protocol = None
+        self.by_src = None
+        self.by_dst = None
+        self.by_port = None
+        self.length_hist = np.zeros(len(LENGTH_BINS) - 1, dtype=np.int64)
+        self.large_packets = 0
+        self.large_packet_rows = np.zeros(0, dtype=np.int64)
+
+    def update(self, chunk: pd.DataFrame) -> "PacketAggregates":
+        row_offset = self.total_packets
+        self.total_packets += len(chunk)
+        if self.sketches is not None:
+            self.sketches.update(chunk)
+        if 'length' not in chunk.columns:
+            return self
+
+        lengths = chunk['length']
+        values = lengths.to_numpy(dtype=np.float64, na_value=0)
+        self.total_bytes += int(values.sum())
+        self.length_hist += np.histogram(values, bins=LENGTH_BINS)[0]
+
+        large = np.flatnonzero(values > LARGE_PACKET_BYTES)
+        self.large_packets += len(large)
+        if len(self.large_packet_rows) < LARGE_PACKET_SAMPLE:
+            need = LARGE_PACKET_SAMPLE - len(self.large_packet_rows)
+            self.large_packet_rows = np.concatenate([self.large_packet_rows, large[:need] + row_offset])
+
+        if 'minute' in chunk.columns:
+            protocol = chunk['protocol'] if 'protocol' in chunk.columns else pd.Series(None, index=chunk.index)
+            layers = [c for c in LAYER_COLUMNS if c in chunk.columns]
+            part = _group_sum([chunk['minute'], protocol] + [chunk[c] for c in layers], lengths, dropna=False)
+            part.index.names = ['minute', 'protocol'] + layers
+            self.by_minute_protocol = _merge_groups(self.by_minute_protocol, part)
+        if self.sketches is None and 'src' in chunk.columns:
+            self.by_src = _merge_groups(self.by_src, _group_sum([chunk['src']], lengths).rename_axis('src'))
+        if self.sketches is None and 'dst' in chunk.columns:
+            self.by_dst = _merge_groups(self.by_dst, _group_sum([chunk['dst']], lengths).rename_axis('dst'))
+        ports = destination_ports(chunk)
+        if ports is not None:
+            self.by_port = _merge_groups(self.by_port, _group_sum([ports], lengths).rename_axis('port'))
+        return self
+
+    def _merge_counts(self, other: "PacketAggregates"):
+        if len(self.large_packet_rows) < LARGE_PACKET_SAMPLE:
+            need = LARGE_PACKET_SAMPLE - len(self.large_packet_rows)
+            self.large_packet_rows = np.concatenate(
+                [self.large_packet_rows, other.large_packet_rows[:need] + self.total_packets])
+        self.total_packets += other.total_packets
+        self.total_bytes += other.total_bytes
+        self.length_hist += other.length_hist
+        self.large_packets += other.large_packets
+
+    def merge(self, other: "PacketAggregates") -> "PacketAggregates":
+        self._merge_counts(other)
+        self.by_minute_protocol = _merge_groups(self.by_minute_protocol, _or_empty(other.by_minute_protocol))
+        self.by_src = _merge_groups(self.by_src, _or_empty(other.by_src))
+        self.by_dst = _merge_groups(self.by_dst, _or_empty(other.by_dst))
+        self.by_port = _merge_groups(self.by_port, _or_empty(other.by_port))
+        if self.sketches is not None and other.sketches is not None:
+            self.sketches.merge(other.sketches)
+        return self
+
+    # === Query untuk halaman (O(grup)) ===
+
+    @property
+    def src_counts(self) -> pd.Series:
+        return self.by_src['packets'] if self.by_src is not None else pd.Series(dtype='int64')
+
+    @property
+    def dst_counts(self) -> pd.Series:
+        return self.by_dst['packets'] if self.by_dst is not None else pd.Series(dtype='int64')
+
+    @property
+    def minute_counts(self) -> pd.Series:
+        if self.by_minute_protocol is None:
+            return pd.Series(dtype='int64')
+        return self.by_minute_protocol['packets'].groupby(level='minute').sum()
+
+    def unique_sources(self) -> int:
+        if self.sketches is not None:
+            return self.sketches.unique_sources()
+        return len(self.src_counts)
+
+    def unique_destinations(self) -> int:
+        if self.sketches is not None:
+            return self.sketches.unique_destinations()
+        return len(self.dst_counts)
+
+    def protocol_counts(self) -> pd.Series:
+        if self.by_minute_protocol is None:
+            return pd.Series(dtype='int64')
+        return (self.by_minute_protocol['packets']
+                .groupby(level='protocol', dropna=True).sum()
+                .sort_values(ascending=False, kind="stable"))
+
+    def normalized_protocol_counts(self) -> pd.Series:
+        """
+        Paket per label ternormalisasi (L7, lalu L4, lalu L3) sehingga sama untuk semua parser.
+        """
+        if self.by_minute_protocol is None or 'l4' not in self.by_minute_protocol.index.names:
+            return self.protocol_counts()
+        packets = self.by_minute_protocol['packets'].groupby(level=list(LAYER_COLUMNS), dropna=False).sum()
+        labels = [protocol_label(*key) for key in packets.index]
+        return packets.groupby(labels).sum().sort_values(ascending=False, kind="stable")
+
+    def top_talkers(self, n: int = 10) -> pd.Series:
+        if self.sketches is not None:
+            return self.sketches.top_talkers(n)
+        return self.src_counts.sort_values(ascending=False, kind="stable").head(n)
+
+    def top_destinations(self, n: int = 10) -> pd.Series:
+        if self.sketches is not None:
+            return self.sketches.top_destinations(n)
+        return self.dst_counts.sort_values(ascending=False, kind="stable").head(n)
+
+    def top_ports(self, n: int = 10) -> pd.Series:
+        if self.by_port is None:
+            return pd.Series(dtype='int64')
+        return self.by_port['packets'].sort_values(ascending=False, kind="stable").head(n)
+
+    def traffic_per_minute(self) -> pd.Series:
+        return self.minute_counts.sort_index()
+
+    def bytes_per_minute(self) -> pd.Series:
+        if self.by_minute_protocol is None:
+            return pd.Series(dtype='int64')
+        return self.by_minute_protocol['bytes'].groupby(level='minute').sum().sort_index()
+
+    def length_histogram(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            "bin_start": LENGTH_BINS[:-1],
+            "bin_end": LENGTH_BINS[1:],
+            "count": self.length_hist,
+        })
+
+
+def _or_empty(groups: pd.DataFrame | None) -> pd.DataFrame:
+    return groups if groups is not None else pd.DataFrame(columns=_VALUE_COLUMNS)
+
+
+def _merge_all(groups: list[pd.DataFrame | None]) -> pd.DataFrame | None:
+    parts = [g for g in groups if g is not None and not g.empty]
+    if len(parts) <= 1:
+        return parts[0] if parts else None
+    levels = list(range(parts[0].index.nlevels))
+    return pd.concat(parts).groupby(level=levels, dropna=False, sort=False).sum()
+
+
+def merge_aggregates(parts: Iterable[PacketAggregates]) -> PacketAggregates:
+    """
+    Gabungkan banyak agregasi tanpa sketch (mis. bucket menit jendela live) sekaligus: satu concat +
+    groupby per tabel, bukan satu per bagian seperti `merge` berulang. Urutan baris sama dengan `merge`.
+    """
+    parts = list(parts)
+    agg = PacketAggregates()
+    for part in parts:
+        agg._merge_counts(part)
+    agg.by_minute_protocol = _merge_all([p.by_minute_protocol for p in parts])
+    agg.by_src = _merge_all([p.by_src for p in parts])
+    agg.by_dst = _merge_all([p.by_dst for p in parts])
+    agg.by_port = _merge_all([p.by_port for p in parts])
+    return agg
+
+
+def fold_chunks(chunks: Iterable[pd.DataFrame], sketches=None) -> PacketAggregates:
+    agg = PacketAggregates(sketches)
+    for chunk in chunks:
+        agg.update(chunk)
+    return agg
+
+
+@timed_stage("summary_cube")
+def build_summary_cube(df: pd.DataFrame, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                       sketches=None) -> PacketAggregates:
+    """
+    Bangun summary cube sekali saat ingest dari tabel yang sudah ada di memori.
+
+    `sketches` (mode sketch) dilipat pada potongan yang sama menggantikan grup per host.
+    """
+    return fold_chunks((df.iloc[i:i + chunk_rows] for i in range(0, len(df), chunk_rows)), sketches)
+
+
+def aggregate_pcap(filepath: str, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> PacketAggregates:
+    """
+    Hitung agregasi tanpa pernah menyimpan seluruh tabel paket di memori.
+    """
+    agg = fold_chunks(parse_pcap_iter(filepath, chunk_rows=chunk_rows))
+    logger.info(f"✅ Agregasi selesai. Paket: {agg.total_packets:,}")
+    return agg
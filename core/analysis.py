@@ -0,0 +1,263 @@
+# core/analysis.py
+
+import os
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from core.aggregates import PacketAggregates, build_summary_cube, LARGE_PACKET_BYTES
+from core.downsample import traffic_series, downsample
+from core.sketches import TrafficSketches
+
+logger = logging.getLogger(__name__)
+
+# Perhitungan halaman tanpa UI (tanpa Streamlit/plot): dipakai halaman Streamlit dan CLI batch
+
+TOP_N = 10
+PCA_OUTLIER_QUANTILE = 0.95
+# Batch: PCA (opt-in) cukup di-fit pada sampel kecil, outlier dihitung dari sampel yang sama
+BATCH_PCA_SAMPLE_ROWS = 20_000
+JUMBO_BYTES = 1600
+
+
+def summary_metrics(df: pd.DataFrame, cube: PacketAggregates, sketches: TrafficSketches | None = None) -> dict:
+    """
+    Angka ringkasan halaman Summary / Analysis Summary. IP unik dari sketch bila ada (estimasi).
+    """
+    if sketches is None:
+        sketches = cube.sketches
+    counts = sketches if sketches is not None else cube
+    return {
+        "total_packets": int(cube.total_packets),
+        "total_bytes": int(cube.total_bytes),
+        "unique_sources": int(counts.unique_sources()),
+        "unique_destinations": int(counts.unique_destinations()),
+        "unique_protocols": len(cube.normalized_protocol_counts()) if 'protocol' in df.columns else 0,
+        "approximate": sketches is not None,
+    }
+
+
+def top_sources(cube: PacketAggregates, n: int = TOP_N, sketches: TrafficSketches | None = None) -> pd.DataFrame:
+    counts = sketches if sketches is not None else cube
+    top = counts.top_talkers(n).reset_index()
+    top.columns = ['src', 'packets']
+    return top
+
+
+def top_ports(cube: PacketAggregates, n: int = TOP_N, sketches: TrafficSketches | None = None) -> pd.DataFrame:
+    counts = sketches if sketches is not None else cube
+    top = counts.top_ports(n).reset_index()
+    top.columns = ['port', 'packets']
+    top['port'] = top['port'].astype(int)
+    return top
+
+
+def protocol_distribution(cube: PacketAggregates) -> pd.DataFrame:
+    # Label ternormalisasi (TLS, DNS, TCP, ...) bukan nomor IANA mentah
+    protocols = cube.normalized_protocol_counts().reset_index()
+    protocols.columns = ['protocol', 'packets']
+    return protocols
+
+
+def traffic_timeline(df: pd.DataFrame, cube: PacketAggregates) -> tuple[pd.DataFrame, str]:
+    """
+    Paket per bin (resolusi adaptif), dikurangi min/max per bucket agar lonjakan tetap terlihat.
+    """
+    traffic, freq = traffic_series(df, cube)
+    points = downsample(traffic['packets'], method="minmax").rename_axis('minute').reset_index(name='packets')
+    return points, freq
+
+
+def packet_length_timeline(df: pd.DataFrame, cube: PacketAggregates, window: int = 10) -> tuple[pd.DataFrame, str]:
+    """
+    Rata-rata ukuran paket per bin, rolling atas data yang sudah di-bin, lalu LTTB.
+    """
+    binned, freq = traffic_series(df, cube)
+    length_smooth = (binned['bytes'] / binned['packets']).rolling(window=window, min_periods=1).mean()
+    return downsample(length_smooth.dropna()).rename_axis('time').reset_index(name='length_smooth'), freq
+
+
+def large_packet_report(df: pd.DataFrame, cube: PacketAggregates) -> dict:
+    """
+    Paket besar (> LARGE_PACKET_BYTES) dari cube: jumlah, contoh baris, dan histogram panjang.
+    """
+    hist = cube.length_histogram()
+    return {
+        "threshold": LARGE_PACKET_BYTES,
+        "count": int(cube.large_packets),
+        "rows": df.iloc[cube.large_packet_rows] if cube.large_packets else df.iloc[:0],
+        "histogram": hist[hist['bin_end'] <= JUMBO_BYTES],
+        "jumbo": int(hist.loc[hist['bin_end'] > JUMBO_BYTES, 'count'].sum()),
+    }
+
+
+def detector_table(results: list) -> pd.DataFrame:
+    return pd.DataFrame({
+        "Detektor": [r.label for r in results],
+        "Input": [r.target for r in results],
+        "Baris": [r.rows for r in results],
+        "Anomali": [r.anomalies for r in results],
+        "Waktu (s)": [round(r.runtime_s, 3) for r in results],
+        "Baris/detik": [f"{r.rows_per_sec:,.0f}" for r in results],
+    })
+
+
+def pca_outliers(components: np.ndarray, quantile: float = PCA_OUTLIER_QUANTILE) -> dict:
+    """
+    Outlier PC1: jumlah titik di atas persentil `quantile`.
+    """
+    threshold = float(np.quantile(components[:, 0], quantile))
+    return {"pc1_threshold": threshold, "outliers": int((components[:, 0] > threshold).sum()),
+            "points": int(len(components))}
+
+
+@dataclass
+class CaptureAnalysis:
+    """
+    Hasil analisis satu capture tanpa UI (dipakai CLI batch & laporan PDF).
+    """
+    name: str
+    summary: dict
+    tables: dict[str, pd.DataFrame] = field(default_factory=dict)
+    detectors: list[dict] = field(default_factory=list)
+    pca: dict | None = None
+    seconds: float = 0.0
+    error: str | None = None
+
+    def to_dict(self, top_rows: int = TOP_N) -> dict:
+        return {
+            "name": self.name,
+            "summary": self.summary,
+            "detectors": self.detectors,
+            "pca": self.pca,
+            "seconds": round(self.seconds, 3),
+            "error": self.error,
+            "tables": {key: _records(table.head(top_rows)) for key, table in self.tables.items()},
+        }
+
+
+def _records(table: pd.DataFrame) -> list[dict]:
+    # JSON aman: timestamp -> ISO string, NA -> None
+    table = table.copy()
+    for col in table.columns:
+        if pd.api.types.is_datetime64_any_dtype(table[col]):
+            table[col] = table[col].dt.strftime("%Y-%m-%dT%H:%M:%S")
+    return table.astype(object).where(table.notna(), None).to_dict(orient="records")
+
+
+def analyze_capture(df: pd.DataFrame, name: str = "capture", cube: PacketAggregates | None = None,
+                    flows: pd.DataFrame | None = None, detectors: list[str] | None = None,
+                    pca: bool = False, top_n: int = TOP_N,
+                    pca_sample_rows: int = BATCH_PCA_SAMPLE_ROWS) -> CaptureAnalysis:
+    """
+    Perhitungan halaman (Summary, Analysis Summary, Anomaly Detection, PCA) untuk satu capture.
+
+    Default hanya dari cube: detektor (`detectors`, beserta flow) dan PCA (`pca`, sampel
+    `pca_sample_rows` baris) dijalankan bila diminta.
+    """
+    from core.detectors import DETECTORS, run_detector
+    from core.flows import build_flows
+
+    start = time.perf_counter()
+    if cube is None:
+        cube = build_summary_cube(df)
+    tables = {
+        "top_sources": top_sources(cube, top_n),
+        "top_destinations": cube.top_destinations(top_n).rename_axis('dst').reset_index(name='packets'),
+        "top_ports": top_ports(cube, top_n) if cube.by_port is not None else pd.DataFrame(columns=['port', 'packets']),
+        "protocols": protocol_distribution(cube),
+        "traffic": traffic_timeline(df, cube)[0] if 'time' in df.columns else pd.DataFrame(),
+    }
+    large = large_packet_report(df, cube)
+    tables["large_packets"] = large["rows"]
+    summary = summary_metrics(df, cube)
+    summary.update({"large_packets": large["count"], "large_packet_threshold": large["threshold"]})
+    if 'time' in df.columns and len(df):
+        summary.update({"start": str(df['time'].min()), "end": str(df['time'].max())})
+
+    names = list(detectors or [])
+    if flows is None and any(DETECTORS[n].target == "flows" for n in names):
+        flows = build_flows(df)
+    results = []
+    for detector in names:
+        result = run_detector(detector, df, flows)
+        results.append({"name": detector, "label": result.label, "target": result.target, "rows": result.rows,
+                        "anomalies": result.anomalies, "runtime_s": round(result.runtime_s, 3)})
+        if result.anomalies:
+            tables[f"detector_{detector}"] = result.top(top_n)
+
+    pca_result = None
+    if pca and len(df) >= 2:
+        from core.pca import fit_packet_pca
+        model = fit_packet_pca(df, sample_rows=pca_sample_rows)
+        pca_result = {"explained_variance_ratio": [round(float(r), 4) for r in model.explained_variance_ratio],
+                      **pca_outliers(model.transform(df.iloc[model.sample_rows]))}
+
+    analysis = CaptureAnalysis(name, summary, tables, results, pca_result, time.perf_counter() - start)
+    logger.info(f"✅ Analisis {name}: {summary['total_packets']:,} paket dalam {analysis.seconds:.2f}s")
+    return analysis
+
+
+def analyze_file(path: str, detectors: list[str] | None = None, pca: bool = False,
+                 use_cache: bool = False) -> CaptureAnalysis:
+    """
+    Parse + analisis satu file (dipanggil di worker proses CLI). Error dicatat, tidak dilempar.
+    """
+    name = os.path.basename(path)
+    start = time.perf_counter()
+    try:
+        if use_cache:
+            from core.parse_cache import parse_pcap_cached
+            df = parse_pcap_cached(path)
+        else:
+            from core.auto_parser import parse_pcap_auto
+            df = parse_pcap_auto(path)
+        if df is None or df.empty:
+            raise ValueError("Gagal memproses file atau data kosong.")
+        analysis = analyze_capture(df, name, detectors=detectors, pca=pca)
+    except Exception as e:
+        logger.error(f"❌ Analisis {name} gagal: {e}")
+        analysis = CaptureAnalysis(name, {}, error=str(e))
+    analysis.seconds = time.perf_counter() - start
+    return analysis
+
+
+def analyze_batch(spec: str | list[str], jobs: int | None = None, detectors: list[str] | None = None,
+                  pca: bool = False, use_cache: bool = False, progress=None) -> list[CaptureAnalysis]:
+    """
+    Analisis banyak capture paralel (satu proses per file), urut sesuai nama file.
+
+    File yang gagal tetap muncul dengan `error` terisi. `progress(analysis)` dipanggil per file selesai.
+    """
+    from core.batch import expand_inputs
+
+    files = expand_inputs(spec)
+    if not files:
+        raise FileNotFoundError(f"Tidak ada file capture untuk: {spec}")
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(files)))
+    logger.info(f"🗂️ Analisis batch {len(files)} file, jobs={jobs}")
+
+    results: dict[str, CaptureAnalysis] = {}
+
+    def collect(path, analysis):
+        results[path] = analysis
+        if progress is not None:
+            progress(analysis)
+
+    if jobs == 1:
+        for path in files:
+            collect(path, analyze_file(path, detectors, pca, use_cache))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {pool.submit(analyze_file, path, detectors, pca, use_cache): path for path in files}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    collect(path, future.result())
+                except Exception as e:  # worker mati / hasil tidak bisa di-pickle
+                    collect(path, CaptureAnalysis(os.path.basename(path), {}, error=str(e)))
+    return [results[path] for path in files]
@@ -4,44 +4,88 @@ import os
 import logging
 import pandas as pd
 from pathlib import Path
+from typing import Callable, Iterator
 
+from core.metrics import timed_stage, timed_iter
 from core.preprocessor import preprocess_packets
-from parsers.parse_pcap_tshark_ipv6 import parse_pcap_file  # ✅ Aktifkan parser
+from parsers.parse_pcap_native import iter_pcap_chunks, concat_chunks  # ✅ Parser native (tanpa tshark/pyshark)
+from parsers.schema import conform_schema
 
 logger = logging.getLogger(__name__)
 
-def parse_pcap_auto(filepath: str) -> pd.DataFrame:
+DEFAULT_CHUNK_ROWS = 250_000
+
+# Callback progres: (byte file yang sudah dibaca, jumlah baris yang sudah dihasilkan)
+ProgressCallback = Callable[[int, int], None]
+
+
+class ParseCancelled(Exception):
+    """
+    Dilempar dari callback progres untuk menghentikan parsing (mis. job dibatalkan).
+    """
+
+
+def parse_pcap_iter(filepath: str, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                    progress: ProgressCallback | None = None) -> Iterator[pd.DataFrame]:
+    """
+    Baca PCAP/PCAPNG/CSV per potongan `chunk_rows` baris yang sudah dipreproses.
+
+    Memori puncak sebanding dengan satu potongan, bukan dengan ukuran file.
+    """
+    if not os.path.isfile(filepath):
+        raise FileNotFoundError(f"File tidak ditemukan: {filepath}")
+
+    ext = Path(filepath).suffix.lower()
+    # posisi byte terakhir yang sudah dibaca parser (untuk callback progres)
+    position = [0]
+
+    # === Handle PCAP/PCAPNG ===
+    if ext in [".pcap", ".pcapng"]:
+        logger.info(f"🔍 Memproses file PCAP: {filepath}")
+        chunks = timed_iter("parse.native", iter_pcap_chunks(
+            filepath, chunk_rows=chunk_rows, on_offset=lambda offset: position.__setitem__(0, offset)))
+
+    # === Handle CSV ===
+    elif ext == ".csv":
+        logger.info(f"📄 Membaca file CSV: {filepath}")
+        chunks = timed_iter("parse.read_csv", _iter_csv_chunks(filepath, chunk_rows, position))
+
+    else:
+        raise ValueError(f"❌ Format file tidak didukung: {ext}")
+
+    # === Preprocessing per potongan ===
+    rows = 0
+    for chunk in chunks:
+        if progress is not None:
+            rows += len(chunk)
+            progress(position[0], rows)
+        if chunk is not None and not chunk.empty:
+            chunk = preprocess_packets(chunk)
+            if not chunk.empty:
+                yield chunk
+
+
+def _iter_csv_chunks(filepath: str, chunk_rows: int, position: list) -> Iterator[pd.DataFrame]:
+    with open(filepath, "rb") as handle:
+        for chunk in pd.read_csv(handle, chunksize=chunk_rows):
+            position[0] = handle.tell()
+            # skema sama dengan parser pcap; alamat CSV ditulis ulang ke bentuk kanonik
+            yield conform_schema(chunk, normalize_addresses=True)
+
+
+@timed_stage("parse_pcap_auto")
+def parse_pcap_auto(filepath: str, progress: ProgressCallback | None = None) -> pd.DataFrame:
     try:
-        if not os.path.isfile(filepath):
-            raise FileNotFoundError(f"File tidak ditemukan: {filepath}")
-
-        ext = Path(filepath).suffix.lower()
-
-        # === Handle PCAP/PCAPNG ===
-        if ext in [".pcap", ".pcapng"]:
-            logger.info(f"🔍 Memproses file PCAP: {filepath}")
-            try:
-                df = parse_pcap_file(filepath)
-            except Exception as parse_err:
-                logger.warning(f"⚠️ Parsing PCAP gagal (pyshark/tshark mungkin tidak tersedia): {parse_err}")
-                return pd.DataFrame()
-
-        # === Handle CSV ===
-        elif ext == ".csv":
-            logger.info(f"📄 Membaca file CSV: {filepath}")
-            df = pd.read_csv(filepath)
-
-        else:
-            raise ValueError(f"❌ Format file tidak didukung: {ext}")
-
-        # === Preprocessing jika data valid ===
-        if df is not None and not df.empty:
-            df = preprocess_packets(df)
-            logger.info(f"✅ Data selesai diproses & dipreproses. Baris: {len(df)}")
-            return df
+        chunks = list(parse_pcap_iter(filepath, progress=progress))
+        if not chunks:
+            return pd.DataFrame()
 
-        return pd.DataFrame()
+        df = concat_chunks(chunks)
+        logger.info(f"✅ Data selesai diproses & dipreproses. Baris: {len(df)}")
+        return df
 
+    except ParseCancelled:
+        raise
     except Exception as e:
         logger.error(f"❌ Parsing gagal: {e}")
         return pd.DataFrame()
@@ -0,0 +1,167 @@
+# core/batch.py
+
+import os
+import glob
+import time
+import hashlib
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from core.auto_parser import parse_pcap_iter, ProgressCallback
+from core.preprocessor import compact_packets
+from parsers.parse_pcap_native import concat_chunks
+from parsers.pcap_segments import merge_time_ordered
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_EXTENSIONS = (".pcap", ".pcapng", ".csv")
+
+SOURCE_COLUMN = "source_file"
+
+
+def expand_inputs(spec: str | list[str]) -> list[str]:
+    """
+    Direktori, pola glob, atau daftar path -> daftar file capture (urut nama).
+    """
+    specs = [spec] if isinstance(spec, str) else list(spec)
+    files = []
+    for item in specs:
+        if os.path.isdir(item):
+            files += [os.path.join(item, name) for name in os.listdir(item)
+                      if name.lower().endswith(CAPTURE_EXTENSIONS)]
+        elif glob.has_magic(item):
+            files += [p for p in glob.glob(item) if p.lower().endswith(CAPTURE_EXTENSIONS)]
+        else:
+            files.append(item)
+    return sorted(dict.fromkeys(files))
+
+
+def batch_key(paths: list[str]) -> str:
+    """
+    Identitas batch dari path, ukuran & mtime tiap file (tanpa membaca ulang isinya).
+    """
+    hasher = hashlib.blake2b(digest_size=20)
+    for path in paths:
+        stat = os.stat(path) if os.path.exists(path) else None
+        hasher.update(f"{path}|{stat.st_size if stat else 0}|{stat.st_mtime_ns if stat else 0}".encode())
+    return hasher.hexdigest()
+
+
+@dataclass
+class FileReport:
+    path: str
+    packets: int
+    bytes: int
+    seconds: float
+    error: str | None = None
+
+    @property
+    def packets_per_sec(self) -> float:
+        return self.packets / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def mb_per_sec(self) -> float:
+        return self.bytes / 1e6 / self.seconds if self.seconds > 0 else 0.0
+
+
+def parse_one_file(path: str) -> tuple[pd.DataFrame, FileReport]:
+    """
+    Parse satu file untuk batch. Potongan yang sudah terbaca tetap dipakai bila file korup.
+    """
+    start = time.perf_counter()
+    chunks, error = [], None
+    try:
+        for chunk in parse_pcap_iter(path):
+            chunks.append(chunk)
+    except Exception as e:
+        error = str(e)
+        logger.warning(f"⚠️ {path}: {e} ({sum(len(c) for c in chunks):,} paket tetap dipakai)")
+
+    df = concat_chunks(chunks) if chunks else pd.DataFrame()
+    if not df.empty:
+        df = df.copy(deep=False)
+        df[SOURCE_COLUMN] = pd.Categorical.from_codes(np.zeros(len(df), dtype=np.int8),
+                                                      categories=[os.path.basename(path)])
+    size = os.path.getsize(path) if os.path.exists(path) else 0
+    return df, FileReport(path, len(df), size, time.perf_counter() - start, error)
+
+
+@dataclass
+class BatchResult:
+    df: pd.DataFrame
+    files: list[FileReport]
+    seconds: float
+
+    @property
+    def dataset_key(self) -> str:
+        return batch_key([report.path for report in self.files])
+
+    def report(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            "file": [os.path.basename(r.path) for r in self.files],
+            "packets": [r.packets for r in self.files],
+            "MB": [round(r.bytes / 1e6, 2) for r in self.files],
+            "seconds": [round(r.seconds, 3) for r in self.files],
+            "packets/s": [round(r.packets_per_sec) for r in self.files],
+            "MB/s": [round(r.mb_per_sec, 1) for r in self.files],
+            "error": [r.error or "" for r in self.files],
+        })
+
+
+def parse_batch(spec: str | list[str], jobs: int | None = None,
+                progress: ProgressCallback | None = None) -> BatchResult:
+    """
+    Parse banyak file paralel (process pool) lalu gabungkan urut waktu dengan k-way merge.
+
+    Tiap paket membawa kolom `source_file`. File yang gagal dilaporkan di `files` tanpa
+    menggagalkan batch. `progress(bytes, paket)` dipanggil setiap satu file selesai.
+    """
+    files = expand_inputs(spec)
+    if not files:
+        raise FileNotFoundError(f"Tidak ada file capture untuk: {spec}")
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(files)))
+    logger.info(f"🗂️ Batch {len(files)} file, jobs={jobs}")
+
+    start = time.perf_counter()
+    results: dict[str, tuple[pd.DataFrame, FileReport]] = {}
+    done_bytes = done_packets = 0
+
+    def collect(path, result):
+        nonlocal done_bytes, done_packets
+        results[path] = result
+        done_bytes += result[1].bytes
+        done_packets += result[1].packets
+        if progress is not None:
+            progress(done_bytes, done_packets)
+
+    if jobs == 1:
+        for path in files:
+            collect(path, parse_one_file(path))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {pool.submit(parse_one_file, path): path for path in files}
+            try:
+                for future in as_completed(futures):
+                    path = futures[future]
+                    try:
+                        collect(path, future.result())
+                    except Exception as e:  # worker mati / hasil tidak bisa di-pickle
+                        collect(path, (pd.DataFrame(), FileReport(path, 0, 0, 0.0, str(e))))
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    frames = [results[path][0] for path in files]
+    df = merge_time_ordered(frames)
+    if not df.empty:
+        # kamus alamat src/dst kembali dibagi setelah kategori tiap file digabung
+        df = compact_packets(df)
+    result = BatchResult(df, [results[path][1] for path in files], time.perf_counter() - start)
+    failed = sum(1 for r in result.files if r.error)
+    logger.info(f"✅ Batch selesai: {len(df):,} paket dari {len(files)} file ({failed} gagal) dalam {result.seconds:.2f}s")
+    return result
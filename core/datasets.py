@@ -0,0 +1,396 @@
+# core/datasets.py
+
+import os
+import hashlib
+import time
+import shutil
+import logging
+import tempfile
+import threading
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET_BYTES = 2 * 1024 * 1024 * 1024
+DEFAULT_SPILL_DIR = os.path.join(Path.home(), ".cache", "nids", "datasets")
+
+RESIDENT, SPILLED = "memory", "disk"
+
+# Tabel per dataset yang bisa di-spill ke disk (cube selalu di memori: ukurannya O(grup))
+SPILL_TABLES = ("df", "flows")
+
+
+def spill_stem(key: str) -> str:
+    # Key dataset berisi teks bebas; nama file spill memakai hash-nya
+    return hashlib.blake2b(key.encode(), digest_size=20).hexdigest()
+
+
+def frame_bytes(df: pd.DataFrame | None) -> int:
+    if df is None:
+        return 0
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+@dataclass
+class DatasetEntry:
+    key: str
+    name: str
+    df: pd.DataFrame | None
+    cube: object = None
+    flows: pd.DataFrame | None = None
+    # Index paket (core.indexes.PacketIndex), tetap di memori saat df di-spill
+    index: object = None
+    extra: dict = field(default_factory=dict)
+    rows: int = 0
+    nbytes: int = 0
+    refs: int = 0
+    state: str = RESIDENT
+    created_at: float = field(default_factory=time.time)
+    last_access: float = field(default_factory=time.time)
+    spill_paths: dict = field(default_factory=dict)
+
+
+_MASKED_ARRAYS = (pd.arrays.IntegerArray, pd.arrays.FloatingArray, pd.arrays.BooleanArray)
+
+
+def _locked(values: np.ndarray) -> np.ndarray:
+    view = values.view()
+    view.flags.writeable = False
+    return view
+
+
+def _read_only_column(series: pd.Series):
+    values = series.array
+    if isinstance(values, pd.Categorical):
+        return pd.Categorical.from_codes(_locked(values.codes), dtype=values.dtype, validate=False)
+    if isinstance(values, _MASKED_ARRAYS):
+        return type(values)(_locked(values._data), _locked(values._mask))
+    data = series.to_numpy(copy=False)
+    if isinstance(data, np.ndarray):
+        return _locked(data)
+    # Arrow-backed: buffer memang immutable
+    return values
+
+
+def read_only_frame(df: pd.DataFrame | None) -> pd.DataFrame | None:
+    """
+    DataFrame baru di atas buffer yang sama (tanpa salinan) dengan semua array writeable=False,
+    termasuk codes kategori dan data/mask kolom nullable.
+    """
+    if df is None:
+        return None
+    columns = {col: _read_only_column(df[col]) for col in df.columns}
+    return pd.DataFrame(columns, index=df.index, columns=df.columns, copy=False)
+
+
+def _index_bytes(entry: DatasetEntry) -> int:
+    return getattr(entry.index, "nbytes", 0)
+
+
+class DatasetHandle:
+    """
+    Referensi ringan ke dataset bersama. Disimpan di sesi sebagai pengganti DataFrame.
+
+    Referensi dilepas saat `release()` dipanggil atau saat handle dibuang (sesi berakhir).
+
+    Kontrak akses: `df`/`flows` adalah view dangkal baru di tiap akses di atas buffer yang dibagi
+    antar sesi. Semua array-nya read-only, jadi penulisan in-place (`df.loc[...] = ...`) gagal
+    dengan ValueError. Menambah/mengganti kolom (`df["x"] = ...`) hanya mengubah view milik
+    pemanggil; salin dulu (`df.copy()`) bila butuh data yang bisa ditulis.
+    """
+
+    def __init__(self, registry: "DatasetRegistry", key: str):
+        self.key = key
+        self._registry = registry
+        self._finalizer = weakref.finalize(self, registry._pending.append, key)
+
+    @property
+    def df(self) -> pd.DataFrame:
+        return self._view("df")
+
+    @property
+    def flows(self) -> pd.DataFrame | None:
+        return self._view("flows")
+
+    def _view(self, table: str) -> pd.DataFrame | None:
+        frame = self._registry.frame(self.key, table)
+        return None if frame is None else frame.copy(deep=False)
+
+    @property
+    def cube(self):
+        return self._registry.entry(self.key).cube
+
+    @property
+    def index(self):
+        return self._registry.entry(self.key).index
+
+    @property
+    def name(self) -> str:
+        return self._registry.entry(self.key).name
+
+    @property
+    def rows(self) -> int:
+        return self._registry.entry(self.key).rows
+
+    @property
+    def extra(self) -> dict:
+        return self._registry.entry(self.key).extra
+
+    def release(self):
+        self._finalizer()
+
+
+class DatasetRegistry:
+    """
+    Dataset bersama satu proses, dikunci dengan hash isi file dan dihitung referensinya.
+
+    Beberapa sesi yang membuka capture yang sama memakai satu salinan. Bila total memori melewati
+    `budget_bytes`, dataset yang paling lama tidak diakses di-spill ke Arrow IPC di disk (yang tidak
+    punya referensi langsung dilepas) dan dimuat ulang lewat memory map saat dibutuhkan.
+    """
+
+    def __init__(self, budget_bytes: int | None = None, spill_dir: str | None = None):
+        if budget_bytes is None:
+            budget_mb = os.environ.get("NIDS_DATASET_BUDGET_MB")
+            budget_bytes = int(budget_mb) * 1024 * 1024 if budget_mb else DEFAULT_BUDGET_BYTES
+        self.budget_bytes = budget_bytes
+        base = Path(spill_dir or os.environ.get("NIDS_SPILL_DIR", DEFAULT_SPILL_DIR))
+        base.mkdir(parents=True, exist_ok=True)
+        # Direktori spill per proses, dihapus saat registry/proses selesai
+        self.spill_dir = Path(tempfile.mkdtemp(prefix="spill-", dir=base))
+        weakref.finalize(self, shutil.rmtree, str(self.spill_dir), True)
+
+        self._entries: dict[str, DatasetEntry] = {}
+        self._loading: dict[str, threading.Event] = {}
+        # Pelepasan dari finalizer handle diantrekan lalu diproses saat lock dipegang
+        self._pending: deque[str] = deque()
+        self._lock = threading.RLock()
+        self.shares = self.spills = self.reloads = self.drops = 0
+
+    # === Referensi ===
+
+    def _handle(self, key: str) -> DatasetHandle:
+        self._entries[key].refs += 1
+        return DatasetHandle(self, key)
+
+    def _drain(self):
+        while self._pending:
+            key = self._pending.popleft()
+            entry = self._entries.get(key)
+            if entry is None:
+                continue
+            entry.refs -= 1
+            if entry.refs <= 0 and entry.state == SPILLED:
+                self._drop(entry)
+
+    def put(self, key: str, df: pd.DataFrame, cube=None, flows: pd.DataFrame | None = None,
+            name: str | None = None, index=None, **extra) -> DatasetHandle:
+        """
+        Daftarkan dataset (atau pakai yang sudah ada dengan kunci sama) dan kembalikan handle.
+        """
+        with self._lock:
+            self._drain()
+            if key in self._entries:
+                self.shares += 1
+                return self._handle(key)
+            # Registry hanya menyimpan versi read-only; buffer-nya tetap milik frame asal (tanpa salinan)
+            df, flows = read_only_frame(df), read_only_frame(flows)
+            entry = DatasetEntry(key, name or key[:12], df, cube, flows, index, extra, rows=len(df),
+                                 nbytes=frame_bytes(df) + frame_bytes(flows))
+            self._entries[key] = entry
+            logger.info(f"📦 Dataset {entry.name}: {entry.rows:,} baris, {entry.nbytes / 1e6:,.1f} MB")
+            handle = self._handle(key)
+            self._enforce_budget(keep=key)
+            return handle
+
+    def open(self, key: str | None) -> DatasetHandle | None:
+        """
+        Handle baru ke dataset yang sudah terdaftar (None bila belum ada).
+        """
+        with self._lock:
+            self._drain()
+            if key not in self._entries:
+                return None
+            self.shares += 1
+            return self._handle(key)
+
+    def get_or_load(self, key: str, loader: Callable[[], dict],
+                    should_stop: Callable[[], bool] | None = None) -> DatasetHandle | None:
+        """
+        Handle ke dataset `key`; bila belum ada, `loader()` (mengembalikan argumen `put`) dijalankan.
+
+        Hanya satu loader per kunci yang berjalan: pemanggil lain menunggu hasilnya, bukan
+        mem-parse file yang sama lagi. Mengembalikan None bila `should_stop()` bernilai True saat menunggu.
+        """
+        while True:
+            with self._lock:
+                self._drain()
+                if key in self._entries:
+                    self.shares += 1
+                    return self._handle(key)
+                event = self._loading.get(key)
+                if event is None:
+                    self._loading[key] = threading.Event()
+                    break
+            while not event.wait(0.2):
+                if should_stop is not None and should_stop():
+                    return None
+            # loader lain selesai (atau gagal): cek ulang
+
+        try:
+            return self.put(key, **loader())
+        finally:
+            with self._lock:
+                self._loading.pop(key).set()
+
+    # === Akses tabel ===
+
+    def entry(self, key: str) -> DatasetEntry:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                raise KeyError(f"Dataset tidak terdaftar: {key}")
+            entry.last_access = time.time()
+            return entry
+
+    def frame(self, key: str, table: str = "df") -> pd.DataFrame | None:
+        with self._lock:
+            self._drain()
+            entry = self.entry(key)
+            if entry.state == SPILLED:
+                self._reload(entry)
+                self._enforce_budget(keep=key)
+            return getattr(entry, table)
+
+    # === Anggaran memori ===
+
+    @property
+    def resident_bytes(self) -> int:
+        return sum((e.nbytes if e.state == RESIDENT else 0) + _index_bytes(e) for e in self._entries.values())
+
+    def _enforce_budget(self, keep: str | None = None):
+        while self.resident_bytes > self.budget_bytes:
+            # yang tidak dipakai sesi mana pun lebih dulu, lalu LRU
+            candidates = sorted((e for e in self._entries.values() if e.state == RESIDENT and e.key != keep),
+                                key=lambda e: (e.refs > 0, e.last_access))
+            if not candidates:
+                break
+            victim = candidates[0]
+            if victim.refs <= 0:
+                self._drop(victim)
+                continue
+            try:
+                self._spill(victim)
+            except (OSError, pa.ArrowException) as e:
+                # dataset tetap utuh di memori; budget terlampaui lebih baik daripada data hilang
+                logger.error(f"❌ Gagal spill dataset {victim.name} ke disk: {e}")
+                break
+
+    def _spill(self, entry: DatasetEntry):
+        start = time.perf_counter()
+        # Nama file dari hash key (key bisa berisi '/' atau lebih panjang dari NAME_MAX); tiap tabel
+        # ditulis ke file sementara lalu di-rename, dan tabel baru dilepas setelah semua tulisan berhasil
+        stem = spill_stem(entry.key)
+        paths = {}
+        try:
+            for table in SPILL_TABLES:
+                frame = getattr(entry, table)
+                if frame is None:
+                    continue
+                path = self.spill_dir / f"{stem}.{table}.arrow"
+                tmp = path.with_name(path.name + ".tmp")
+                arrow = pa.Table.from_pandas(frame)
+                try:
+                    with pa.OSFile(str(tmp), "wb") as sink:
+                        with pa.ipc.new_file(sink, arrow.schema) as writer:
+                            writer.write_table(arrow)
+                    os.replace(tmp, path)
+                finally:
+                    tmp.unlink(missing_ok=True)
+                paths[table] = path
+        except BaseException:
+            for path in paths.values():
+                path.unlink(missing_ok=True)
+            raise
+        for table in paths:
+            setattr(entry, table, None)
+        entry.spill_paths = paths
+        entry.state = SPILLED
+        self.spills += 1
+        logger.info(f"💾 Dataset {entry.name} di-spill ke disk ({entry.nbytes / 1e6:,.1f} MB, "
+                    f"{time.perf_counter() - start:.2f}s)")
+
+    def _reload(self, entry: DatasetEntry):
+        start = time.perf_counter()
+        for table, path in entry.spill_paths.items():
+            # Memory map + split_blocks: kolom lebar tetap langsung di atas halaman file (tanpa salinan)
+            source = pa.memory_map(str(path), "r")
+            frame = pa.ipc.open_file(source).read_all().to_pandas(split_blocks=True)
+            setattr(entry, table, read_only_frame(frame))
+            # file yang di-unlink tetap bisa dibaca lewat map selama masih dipakai
+            path.unlink(missing_ok=True)
+        entry.spill_paths = {}
+        entry.state = RESIDENT
+        self.reloads += 1
+        logger.info(f"📂 Dataset {entry.name} dimuat ulang dari disk ({time.perf_counter() - start:.2f}s)")
+
+    def _drop(self, entry: DatasetEntry):
+        for path in entry.spill_paths.values():
+            path.unlink(missing_ok=True)
+        del self._entries[entry.key]
+        self.drops += 1
+        logger.info(f"🧹 Dataset {entry.name} dilepas dari registry")
+
+    # === Laporan untuk UI ===
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._drain()
+            return {
+                "datasets": len(self._entries),
+                "resident_bytes": self.resident_bytes,
+                "spilled_bytes": sum(e.nbytes for e in self._entries.values() if e.state == SPILLED),
+                "budget_bytes": self.budget_bytes,
+                "shares": self.shares,
+                "spills": self.spills,
+                "reloads": self.reloads,
+                "drops": self.drops,
+            }
+
+    def report(self) -> pd.DataFrame:
+        with self._lock:
+            self._drain()
+            entries = sorted(self._entries.values(), key=lambda e: e.last_access, reverse=True)
+        now = time.time()
+        return pd.DataFrame({
+            "dataset": [e.name for e in entries],
+            "key": [e.key[:12] for e in entries],
+            "baris": [e.rows for e in entries],
+            "MB": [round(e.nbytes / 1e6, 1) for e in entries],
+            "sesi": [e.refs for e in entries],
+            "lokasi": [e.state for e in entries],
+            "idle (s)": [round(now - e.last_access) for e in entries],
+        })
+
+
+_registry: DatasetRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_dataset_registry() -> DatasetRegistry:
+    """
+    Registry dataset bersama satu proses (semua sesi Streamlit & job ingest).
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = DatasetRegistry()
+        return _registry
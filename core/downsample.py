@@ -0,0 +1,160 @@
+# core/downsample.py
+
+import logging
+import numpy as np
+import pandas as pd
+
+from core.aggregates import PacketAggregates
+
+logger = logging.getLogger(__name__)
+
+# Titik maksimum per garis yang dikirim ke browser
+DEFAULT_TARGET_POINTS = 1_500
+
+# Bin sebelum downsampling: resolusi terkecil yang menghasilkan <= MAX_BINS bin dipilih
+MAX_BINS = 20_000
+
+# '"2024-01-01T00:00:00", ' di JSON Plotly
+_ISO_VALUE_BYTES = 23
+
+RESOLUTIONS = {"s": pd.Timedelta(seconds=1), "min": pd.Timedelta(minutes=1), "h": pd.Timedelta(hours=1)}
+
+
+def choose_resolution(start, end, max_bins: int = MAX_BINS) -> str:
+    """
+    Resolusi adaptif (detik/menit/jam) dari rentang waktu capture.
+    """
+    span = pd.Timestamp(end) - pd.Timestamp(start)
+    for freq, step in RESOLUTIONS.items():
+        if span / step <= max_bins:
+            return freq
+    return "h"
+
+
+def bin_times(times: pd.Series, freq: str, weights: pd.Series | None = None) -> pd.Series:
+    """
+    Jumlah (atau jumlah bobot) per bin waktu tetap, termasuk bin kosong (bincount, tanpa groupby).
+    """
+    values = times.to_numpy(dtype="datetime64[ns]")
+    valid = ~np.isnat(values)
+    if not valid.any():
+        return pd.Series(dtype="float64")
+    values = values[valid].view(np.int64)
+    step = RESOLUTIONS[freq].value
+    origin = pd.Timestamp(values.min()).floor(freq).value
+    w = None if weights is None else weights.to_numpy(dtype=np.float64, na_value=0)[valid]
+    counts = np.bincount((values - origin) // step, weights=w)
+    return pd.Series(counts, index=pd.date_range(pd.Timestamp(origin), periods=len(counts), freq=freq))
+
+
+def rebin(series: pd.Series, freq: str) -> pd.Series:
+    """
+    Gabungkan series yang sudah di-bin (mis. per menit dari cube) ke bin yang lebih kasar.
+    """
+    if series.empty:
+        return series
+    return series.groupby(series.index.floor(freq)).sum()
+
+
+def traffic_series(df: pd.DataFrame, cube: PacketAggregates, max_bins: int = MAX_BINS) -> tuple[pd.DataFrame, str]:
+    """
+    Paket & byte per bin dengan resolusi adaptif.
+
+    Rentang pendek dibin per detik langsung dari kolom `time`; selebihnya diambil dari cube
+    per menit (dan digabung per jam bila perlu), sehingga biaya sebanding jumlah bin.
+    """
+    packets, volume = cube.traffic_per_minute(), cube.bytes_per_minute()
+    if packets.empty:
+        return pd.DataFrame(columns=["packets", "bytes"]), "min"
+    freq = choose_resolution(packets.index.min(), packets.index.max() + RESOLUTIONS["min"], max_bins)
+    if freq == "s" and 'time' in df.columns:
+        lengths = df['length'] if 'length' in df.columns else None
+        packets = bin_times(df['time'], "s")
+        volume = bin_times(df['time'], "s", lengths) if lengths is not None else packets * 0
+    elif freq == "h":
+        packets, volume = rebin(packets, "h"), rebin(volume, "h")
+    elif freq == "s":
+        freq = "min"
+    out = pd.DataFrame({"packets": packets, "bytes": volume})
+    return out.rename_axis("time"), freq
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indeks titik yang mempertahankan bentuk garis.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # rata-rata bucket berikutnya sebagai titik ketiga segitiga
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x[end:next_end].mean() if next_end > end else x[-1]
+        next_y = y[end:next_end].mean() if next_end > end else y[-1]
+        area = np.abs((x[previous] - next_x) * (y[start:end] - y[previous])
+                      - (x[previous] - x[start:end]) * (next_y - y[previous]))
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+    return selected
+
+
+def minmax(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Min & max per bucket (piksel): lonjakan tidak pernah hilang. Sepenuhnya tervektorisasi.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 2:
+        return np.arange(n)
+    y = np.asarray(y, dtype=np.float64)
+    buckets = n_out // 2
+    bucket = np.arange(n) * buckets // n
+    order = np.lexsort((y, bucket))
+    starts = np.searchsorted(bucket[order], np.arange(buckets))
+    ends = np.append(starts[1:], n) - 1
+    return np.unique(np.concatenate([order[starts], order[ends]]))
+
+
+def downsample(series: pd.Series, target_points: int = DEFAULT_TARGET_POINTS, method: str = "lttb") -> pd.Series:
+    """
+    Kurangi series waktu ke <= `target_points` titik sebelum dikirim ke grafik.
+    """
+    if len(series) <= target_points:
+        return series
+    if method == "minmax":
+        index = minmax(series.to_numpy(dtype=np.float64, na_value=np.nan), target_points)
+    else:
+        x = series.index.to_numpy(dtype="datetime64[ns]").view(np.int64) if isinstance(series.index, pd.DatetimeIndex) else np.arange(len(series))
+        index = lttb(x, series.to_numpy(dtype=np.float64, na_value=0), target_points)
+    return series.iloc[index]
+
+
+def payload_estimate(points: pd.DataFrame) -> dict:
+    """
+    Perkiraan titik & byte data grafik dari tabel yang sudah di-downsample, tanpa serialisasi figure.
+
+    Plotly mengirim kolom numerik sebagai base64 (4 byte per 3 byte nilai) dan waktu sebagai string ISO;
+    layout & template tidak dihitung.
+    """
+    n = len(points)
+    size = 0
+    for _, values in points.items():
+        if pd.api.types.is_datetime64_any_dtype(values):
+            size += n * _ISO_VALUE_BYTES
+        elif pd.api.types.is_numeric_dtype(values):
+            size += -(-n * values.dtype.itemsize // 3) * 4
+        else:
+            size += int(values.astype(str).str.len().sum()) + n * 4  # kutip, koma, spasi
+    return {"bytes": size, "points": n}
+
+
+def payload_caption(stats: dict, freq: str | None = None) -> str:
+    resolution = {"s": "detik", "min": "menit", "h": "jam"}.get(freq, freq)
+    prefix = f"Resolusi {resolution}, " if resolution else ""
+    return f"📉 {prefix}{stats['points']:,} titik, payload data ±{stats['bytes'] / 1024:,.1f} KB"
@@ -6,25 +6,102 @@ import pandas as pd
 import tempfile
 from pathlib import Path
 import logging
-from core.auto_parser import parse_pcap_auto
+from core.parse_cache import parse_pcap_cached, new_hasher, HASH_CHUNK_BYTES
 
 logger = logging.getLogger(__name__)
 
-def process_uploaded_file(uploaded_file) -> tuple[pd.DataFrame, str]:
-    try:
-        if uploaded_file.size > 200 * 1024 * 1024:
-            return pd.DataFrame(), "❌ File terlalu besar. Maksimal 200MB."
+# Batas upload (MB) bisa diatur lewat env; aman dinaikkan karena upload disalin per potongan
+DEFAULT_MAX_UPLOAD_MB = 2048
+
+
+def max_upload_bytes() -> int:
+    return int(float(os.environ.get("NIDS_MAX_UPLOAD_MB", DEFAULT_MAX_UPLOAD_MB)) * 1024 * 1024)
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+class SpooledUpload:
+    """
+    File upload yang sudah disalin ke disk beserta hash isinya.
+
+    Dipakai sebagai context manager: file dihapus saat keluar blok, kecuali
+    kepemilikannya sudah diserahkan lewat `detach()` (mis. ke job ingest).
+    """
+
+    def __init__(self, path: str, digest: str, size: int):
+        self.path = path
+        self.digest = digest
+        self.size = size
+        self._owned = True
+
+    def detach(self) -> str:
+        self._owned = False
+        return self.path
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(uploaded_file.name).suffix) as tmp_file:
-            tmp_file.write(uploaded_file.read())
-            tmp_path = tmp_file.name
+    def cleanup(self):
+        if self._owned:
+            self._owned = False
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not delete temporary file: {e}")
 
-        df = parse_pcap_auto(tmp_path)
+    def __enter__(self) -> "SpooledUpload":
+        return self
 
+    def __exit__(self, *exc):
+        self.cleanup()
+
+
+def spool_upload(uploaded_file, max_bytes: int | None = None,
+                 chunk_size: int = HASH_CHUNK_BYTES) -> SpooledUpload:
+    """
+    Salin upload ke file sementara per `chunk_size` byte sambil menghitung hash isinya.
+
+    Memori tambahan hanya satu potongan; file dihapus bila penyalinan gagal atau melebihi batas.
+    """
+    max_bytes = max_upload_bytes() if max_bytes is None else max_bytes
+    size = getattr(uploaded_file, "size", None)
+    if size is not None and size > max_bytes:
+        raise UploadTooLarge(f"❌ File terlalu besar. Maksimal {max_bytes // (1024 * 1024)}MB.")
+    if hasattr(uploaded_file, "seek"):
+        uploaded_file.seek(0)
+
+    hasher = new_hasher()
+    written = 0
+    spool_dir = os.environ.get("NIDS_SPOOL_DIR") or None
+    tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=Path(uploaded_file.name).suffix, dir=spool_dir)
+    try:
+        with tmp_file:
+            while True:
+                block = uploaded_file.read(chunk_size)
+                if not block:
+                    break
+                written += len(block)
+                if written > max_bytes:
+                    raise UploadTooLarge(f"❌ File terlalu besar. Maksimal {max_bytes // (1024 * 1024)}MB.")
+                hasher.update(block)
+                tmp_file.write(block)
+    except BaseException:
+        os.unlink(tmp_file.name)
+        raise
+    return SpooledUpload(tmp_file.name, hasher.hexdigest(), written)
+
+
+def process_uploaded_file(uploaded_file) -> tuple[pd.DataFrame, str]:
+    try:
         try:
-            os.unlink(tmp_path)
-        except Exception as e:
-            logger.warning(f"Could not delete temporary file: {e}")
+            spooled = spool_upload(uploaded_file)
+        except UploadTooLarge as e:
+            return pd.DataFrame(), str(e)
+
+        # Digest dari proses spool dipakai ulang: file tidak dibaca lagi untuk hashing
+        with spooled:
+            df = parse_pcap_cached(spooled.path, digest=spooled.digest)
 
         if df is not None and not df.empty:
             return df, f"✅ File berhasil diproses! Jumlah baris: {len(df):,}"
@@ -0,0 +1,276 @@
+# core/indexes.py
+
+import logging
+import ipaddress
+from dataclasses import dataclass, field
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from core.metrics import timed_stage
+from core.protocols import LAYER_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+N_PORTS = 65536
+
+# Bila daftar posting yang cocok mencakup > 1/4 baris di jendela waktu, lookup kode per baris lebih murah
+DENSE_FRACTION = 0.25
+
+
+def sort_by_time(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Frame urut waktu (stabil) dengan index 0..n-1; tanpa salinan bila sudah urut.
+    """
+    if 'time' not in df.columns or df['time'].is_monotonic_increasing:
+        return df
+    return df.sort_values('time', kind='stable', ignore_index=True)
+
+
+@dataclass
+class Postings:
+    """
+    Daftar posting per kunci (format CSR): baris kunci k = `rows[offsets[k]:offsets[k + 1]]`, urut naik.
+    """
+    rows: np.ndarray
+    offsets: np.ndarray
+
+    @classmethod
+    def build(cls, codes: np.ndarray, n_keys: int) -> "Postings":
+        valid = np.flatnonzero(codes >= 0)
+        keys = codes[valid]
+        # argsort stabil (radix untuk kunci <= 16 bit): dalam satu kunci baris tetap urut (= urut waktu)
+        key_dtype = np.uint8 if n_keys <= 2**8 else np.uint16 if n_keys <= 2**16 else np.int64
+        order = valid[np.argsort(keys.astype(key_dtype, copy=False), kind='stable')]
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(keys, minlength=n_keys))])
+        return cls(order.astype(np.int32 if len(codes) < 2**31 else np.int64), offsets)
+
+    def count(self, keys: np.ndarray) -> int:
+        return int((self.offsets[keys + 1] - self.offsets[keys]).sum())
+
+    def lookup(self, keys: np.ndarray, lo: int, hi: int) -> np.ndarray:
+        # Gabungan daftar posting `keys` yang jatuh di baris [lo, hi), urut naik
+        parts = []
+        for k in keys:
+            part = self.rows[self.offsets[k]:self.offsets[k + 1]]
+            parts.append(part[np.searchsorted(part, lo):np.searchsorted(part, hi)])
+        return np.sort(np.concatenate(parts)) if parts else np.zeros(0, dtype=np.int64)
+
+    @property
+    def nbytes(self) -> int:
+        return self.rows.nbytes + self.offsets.nbytes
+
+
+def _port_codes(df: pd.DataFrame, tcp_col: str, udp_col: str, positions=slice(None)) -> np.ndarray | None:
+    # Port TCP atau UDP (seperti `_coalesce_ports`) hanya untuk baris `positions`; NA -> -1
+    codes = None
+    for col in (tcp_col, udp_col):
+        if col not in df.columns:
+            continue
+        values = df[col].iloc[positions].to_numpy(dtype=np.int32, na_value=-1)
+        codes = values if codes is None else np.where(codes >= 0, codes, values)
+    if codes is not None:
+        codes[codes >= N_PORTS] = -1
+    return codes
+
+
+def _lut(keys, size: int) -> np.ndarray:
+    # Satu slot ekstra (False) di akhir: kode -1 langsung terpetakan ke "tidak cocok"
+    lut = np.zeros(size + 1, dtype=bool)
+    lut[keys] = True
+    return lut
+
+
+@dataclass
+class _Predicate:
+    # `estimate`: perkiraan jumlah baris; `rows(lo, hi)`: baris cocok urut naik; `test(pos)`: mask untuk posisi
+    estimate: int
+    rows: Callable[[int, int], np.ndarray]
+    test: Callable[[object], np.ndarray]
+
+
+def _dense_rows(test, lo: int, hi: int) -> np.ndarray:
+    return np.flatnonzero(test(slice(lo, hi))) + lo
+
+
+@dataclass
+class PacketFilter:
+    """
+    Filter global sidebar. Nilai kosong = tidak memfilter.
+    """
+    start: pd.Timestamp | None = None
+    end: pd.Timestamp | None = None
+    src_cidr: str | None = None
+    dst_cidr: str | None = None
+    ports: tuple[int, ...] = ()
+    protocols: tuple[str, ...] = ()
+
+    @property
+    def active(self) -> bool:
+        return any(v not in (None, "", ()) for v in (self.start, self.end, self.src_cidr, self.dst_cidr,
+                                                      self.ports, self.protocols))
+
+    @property
+    def key(self) -> str:
+        return f"{self.start}|{self.end}|{self.src_cidr}|{self.dst_cidr}|{self.ports}|{self.protocols}"
+
+
+@dataclass
+class PacketIndex:
+    """
+    Index yang dibangun sekali saat ingest untuk frame urut waktu.
+
+    Waktu: binary search pada kolom `time`. Host & port: daftar posting offset baris.
+    Protokol: tabel lookup pada kode kategori `l3`/`l4`/`l7`.
+    """
+    times: np.ndarray
+    postings: dict[str, Postings] = field(default_factory=dict)
+    addresses: dict[str, pd.Index] = field(default_factory=dict)
+    _cidr_cache: dict = field(default_factory=dict, repr=False)
+
+    @property
+    def rows(self) -> int:
+        return len(self.times)
+
+    @property
+    def nbytes(self) -> int:
+        return self.times.nbytes + sum(p.nbytes for p in self.postings.values())
+
+    def time_bounds(self) -> tuple[pd.Timestamp, pd.Timestamp] | None:
+        if not len(self.times):
+            return None
+        return pd.Timestamp(self.times[0]), pd.Timestamp(self.times[-1])
+
+    def time_slice(self, start=None, end=None) -> tuple[int, int]:
+        """
+        Baris [lo, hi) dengan `start <= time <= end` lewat binary search.
+        """
+        lo = 0 if start is None else int(np.searchsorted(self.times, pd.Timestamp(start).to_datetime64(), 'left'))
+        hi = self.rows if end is None else int(np.searchsorted(self.times, pd.Timestamp(end).to_datetime64(), 'right'))
+        return lo, max(lo, hi)
+
+    def host_codes(self, side: str, cidr: str) -> np.ndarray:
+        """
+        Kode alamat kolom `side` (src/dst) di dalam CIDR; dicek sekali per alamat unik per CIDR.
+        """
+        if (side, cidr) not in self._cidr_cache:
+            network = ipaddress.ip_network(cidr.strip(), strict=False)
+            addresses = self.addresses.get(side, [])
+            codes = [code for code, address in enumerate(addresses) if _in_network(address, network)]
+            self._cidr_cache[(side, cidr)] = np.asarray(codes, dtype=np.int64)
+        return self._cidr_cache[(side, cidr)]
+
+    def _host_predicate(self, df: pd.DataFrame, side: str, cidr: str) -> _Predicate:
+        keys = self.host_codes(side, cidr)
+        postings = self.postings[side]
+        lut = _lut(keys, len(postings.offsets) - 1)
+        codes = df[side].cat.codes.to_numpy()
+
+        def test(positions):
+            return lut[codes[positions]]
+
+        def rows(lo, hi):
+            if postings.count(keys) > DENSE_FRACTION * (hi - lo):
+                return _dense_rows(test, lo, hi)
+            return postings.lookup(keys, lo, hi)
+        return _Predicate(postings.count(keys), rows, test)
+
+    def _port_predicate(self, df: pd.DataFrame, ports: tuple[int, ...]) -> _Predicate:
+        keys = np.asarray([p for p in ports if 0 <= p < N_PORTS], dtype=np.int64)
+        lut = _lut(keys, N_PORTS)
+        sides = [(self.postings[name], cols) for name, cols in
+                 (("sport", ("tcp_srcport", "udp_srcport")), ("dport", ("tcp_dstport", "udp_dstport")))
+                 if name in self.postings]
+        estimate = sum(postings.count(keys) for postings, _ in sides)
+
+        def test(positions):
+            mask = None
+            for _, cols in sides:
+                side_mask = lut[_port_codes(df, *cols, positions)]
+                mask = side_mask if mask is None else mask | side_mask
+            return mask
+
+        def rows(lo, hi):
+            if estimate > DENSE_FRACTION * (hi - lo):
+                return _dense_rows(test, lo, hi)
+            return np.union1d(*[postings.lookup(keys, lo, hi) for postings, _ in sides]) if len(sides) == 2 \
+                else sides[0][0].lookup(keys, lo, hi)
+        return _Predicate(estimate, rows, test)
+
+    def select_rows(self, df: pd.DataFrame, packet_filter: PacketFilter) -> slice | np.ndarray:
+        """
+        Baris yang lolos filter: `slice` bila hanya waktu (view tanpa salinan), selain itu array posisi urut.
+
+        Predikat dengan perkiraan baris paling sedikit menghasilkan kandidat dari daftar posting;
+        predikat lain hanya dicek pada kandidat tersebut.
+        """
+        lo, hi = self.time_slice(packet_filter.start, packet_filter.end)
+        predicates: list[_Predicate] = []
+        for side, cidr in (("src", packet_filter.src_cidr), ("dst", packet_filter.dst_cidr)):
+            if cidr:
+                if side not in self.postings:
+                    return np.zeros(0, dtype=np.int64)
+                predicates.append(self._host_predicate(df, side, cidr))
+        if packet_filter.ports:
+            predicates.append(self._port_predicate(df, packet_filter.ports))
+        if packet_filter.protocols:
+            predicates.append(_protocol_predicate(df, packet_filter.protocols, hi - lo))
+
+        if not predicates:
+            return slice(lo, hi)
+        predicates.sort(key=lambda p: p.estimate)
+        rows = predicates[0].rows(lo, hi)
+        for predicate in predicates[1:]:
+            rows = rows[predicate.test(rows)]
+        return rows
+
+    @timed_stage("filter_select")
+    def select(self, df: pd.DataFrame, packet_filter: PacketFilter) -> pd.DataFrame:
+        """
+        Frame terfilter: irisan `iloc` (view) untuk rentang waktu, `take` baris terpilih untuk filter lain.
+        """
+        rows = self.select_rows(df, packet_filter)
+        if isinstance(rows, slice):
+            return df.iloc[rows]
+        return df.take(rows)
+
+
+def _in_network(address, network) -> bool:
+    try:
+        return ipaddress.ip_address(address) in network
+    except ValueError:
+        return False
+
+
+def _protocol_predicate(df: pd.DataFrame, labels: tuple[str, ...], estimate: int) -> _Predicate:
+    # Label cocok dengan lapisan mana pun (mis. "UDP" termasuk DNS di atas UDP), lewat LUT per kode
+    layers = [(np.append(df[col].cat.categories.isin(labels), False), df[col].cat.codes.to_numpy())
+              for col in LAYER_COLUMNS if col in df.columns]
+
+    def test(positions):
+        mask = None
+        for lut, codes in layers:
+            layer_mask = lut[codes[positions]]
+            mask = layer_mask if mask is None else mask | layer_mask
+        return mask if mask is not None else np.zeros(len(df), dtype=bool)[positions]
+    return _Predicate(estimate, lambda lo, hi: _dense_rows(test, lo, hi), test)
+
+
+@timed_stage("build_index")
+def build_packet_index(df: pd.DataFrame) -> PacketIndex:
+    """
+    Bangun index untuk frame yang sudah urut waktu (lihat `sort_by_time`).
+    """
+    times = df['time'].to_numpy() if 'time' in df.columns else np.zeros(0, dtype='datetime64[ns]')
+    index = PacketIndex(times=times)
+    for side in ('src', 'dst'):
+        if side in df.columns and isinstance(df[side].dtype, pd.CategoricalDtype):
+            index.addresses[side] = df[side].cat.categories
+            index.postings[side] = Postings.build(df[side].cat.codes.to_numpy(), len(index.addresses[side]))
+    for name, cols in (("sport", ("tcp_srcport", "udp_srcport")), ("dport", ("tcp_dstport", "udp_dstport"))):
+        codes = _port_codes(df, *cols)
+        if codes is not None:
+            index.postings[name] = Postings.build(codes, N_PORTS)
+    logger.info(f"✅ Index paket: {len(df):,} baris, {index.nbytes / 1e6:,.1f} MB")
+    return index
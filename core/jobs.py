@@ -0,0 +1,245 @@
+# core/jobs.py
+
+import os
+import time
+import uuid
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from core.auto_parser import ParseCancelled
+from core.batch import parse_batch, expand_inputs, batch_key
+from core.aggregates import build_summary_cube
+from core.flows import build_flows
+from core.sketches import TrafficSketches, sketch_key
+from core.parse_cache import parse_pcap_cached, file_digest
+from core.datasets import get_dataset_registry
+from core.indexes import sort_by_time, build_packet_index
+
+logger = logging.getLogger(__name__)
+
+# Jumlah ingest paralel; upload lain menunggu di antrean
+DEFAULT_WORKERS = 2
+
+# Job selesai yang masih disimpan (hasilnya dipegang sampai diambil halaman)
+MAX_FINISHED_JOBS = 20
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+
+@dataclass
+class IngestJob:
+    """
+    Satu ingest file di background: parsing -> index -> summary cube -> flow.
+    """
+    job_id: str
+    path: str
+    name: str
+    total_bytes: int
+    delete_after: bool = False
+    digest: str | None = None
+    # batch: daftar file yang diparse bersama (path = spesifikasi direktori/glob)
+    inputs: list[str] | None = None
+    batch_jobs: int | None = None
+    # mode sketch: parameter TrafficSketches, cube dibangun tanpa grup per host
+    sketch_params: dict | None = None
+    status: str = QUEUED
+    stage: str = "antre"
+    bytes_done: int = 0
+    packets_done: int = 0
+    submitted_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    error: str | None = None
+    result: dict | None = None
+    cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    @property
+    def progress(self) -> float:
+        if self.status == DONE:
+            return 1.0
+        if not self.total_bytes:
+            return 0.0
+        # parsing = 90% pekerjaan; cube & flow sisanya
+        return min(self.bytes_done / self.total_bytes, 1.0) * 0.9
+
+    @property
+    def eta_seconds(self) -> float | None:
+        if self.started_at is None or self.progress <= 0 or self.finished:
+            return None
+        elapsed = time.time() - self.started_at
+        return elapsed * (1 - self.progress) / self.progress
+
+    def cancel(self):
+        self.cancel_event.set()
+
+
+class JobManager:
+    """
+    Antrean ingest bersama untuk semua sesi Streamlit dalam satu proses.
+    """
+
+    def __init__(self, max_workers: int | None = None, registry=None):
+        self.registry = registry or get_dataset_registry()
+        if max_workers is None:
+            max_workers = int(os.environ.get("NIDS_INGEST_WORKERS", DEFAULT_WORKERS))
+        self.max_workers = max(1, max_workers)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="nids-ingest")
+        self._jobs: dict[str, IngestJob] = {}
+        self._lock = threading.RLock()
+
+    def submit(self, path: str, name: str | None = None, delete_after: bool = False,
+               digest: str | None = None, sketch_params: dict | None = None) -> str:
+        """
+        Masukkan file ke antrean. `digest` (bila sudah dihitung saat spool upload) melewati tahap hashing.
+        """
+        job = IngestJob(job_id=uuid.uuid4().hex[:12], path=path, name=name or os.path.basename(path),
+                        total_bytes=os.path.getsize(path), delete_after=delete_after, digest=digest,
+                        sketch_params=sketch_params)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._prune()
+        self._pool.submit(self._run, job)
+        logger.info(f"📥 Job {job.job_id} masuk antrean: {job.name}")
+        return job.job_id
+
+    def submit_batch(self, spec: str, batch_jobs: int | None = None, sketch_params: dict | None = None) -> str:
+        """
+        Masukkan direktori/glob capture sebagai satu job batch (parse paralel + k-way merge).
+        """
+        inputs = expand_inputs(spec)
+        if not inputs:
+            raise FileNotFoundError(f"Tidak ada file capture untuk: {spec}")
+        job = IngestJob(job_id=uuid.uuid4().hex[:12], path=spec, name=f"{spec} ({len(inputs)} file)",
+                        total_bytes=sum(os.path.getsize(p) for p in inputs), inputs=inputs,
+                        batch_jobs=batch_jobs, sketch_params=sketch_params)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._prune()
+        self._pool.submit(self._run, job)
+        logger.info(f"📥 Job batch {job.job_id} masuk antrean: {job.name}")
+        return job.job_id
+
+    def get(self, job_id: str | None) -> IngestJob | None:
+        return self._jobs.get(job_id) if job_id else None
+
+    def cancel(self, job_id: str):
+        job = self.get(job_id)
+        if job is not None:
+            job.cancel()
+
+    def jobs(self) -> list[IngestJob]:
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda j: j.submitted_at)
+
+    def queue_position(self, job_id: str) -> int:
+        queued = [j.job_id for j in self.jobs() if j.status == QUEUED]
+        return queued.index(job_id) + 1 if job_id in queued else 0
+
+    def _prune(self):
+        finished = [j for j in self.jobs() if j.finished]
+        for job in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job.job_id]
+
+    def _run(self, job: IngestJob):
+        try:
+            if job.cancel_event.is_set():
+                raise ParseCancelled()
+            job.status, job.started_at = RUNNING, time.time()
+
+            def progress(bytes_done: int, packets_done: int):
+                job.bytes_done, job.packets_done = bytes_done, packets_done
+                if job.cancel_event.is_set():
+                    raise ParseCancelled()
+
+            def load() -> dict:
+                extra = {}
+                if job.inputs is not None:
+                    job.stage = "parsing batch"
+                    batch = parse_batch(job.inputs, jobs=job.batch_jobs, progress=progress)
+                    df = batch.df
+                    extra["batch_report"] = batch.report()
+                else:
+                    job.stage = "parsing"
+                    df = parse_pcap_cached(job.path, digest=digest, progress=progress)
+                if df is None or df.empty:
+                    raise ValueError("Gagal memproses file atau data kosong.")
+                job.bytes_done, job.packets_done = job.total_bytes, len(df)
+
+                job.stage = "index"
+                df = sort_by_time(df)
+                index = build_packet_index(df)
+                job.stage = "summary"
+                sketches = TrafficSketches(**job.sketch_params) if job.sketch_params else None
+                cube = build_summary_cube(df, sketches=sketches)
+                if job.cancel_event.is_set():
+                    raise ParseCancelled()
+                job.stage = "flow"
+                flows = build_flows(df)
+                return {"df": df, "cube": cube, "flows": flows, "name": job.name, "index": index, **extra}
+
+            if job.inputs is not None:
+                digest = batch_key(job.inputs)
+            else:
+                digest = job.digest
+                if digest is None:
+                    job.stage = "hashing"
+                    digest = file_digest(job.path)
+            # Capture yang sama (hash isi) hanya diparse sekali untuk semua sesi; cache parse memakai
+            # hash isi saja, mode cube hanya membedakan dataset di registry
+            registry_key = digest + sketch_key(job.sketch_params)
+            handle = self.registry.get_or_load(registry_key, load, should_stop=job.cancel_event.is_set)
+            if handle is None:
+                raise ParseCancelled()
+            job.bytes_done, job.packets_done = job.total_bytes, handle.rows
+
+            job.result = {"dataset": handle, "dataset_key": registry_key}
+            job.status, job.stage = DONE, "selesai"
+            logger.info(f"✅ Job {job.job_id} selesai: {job.packets_done:,} paket")
+        except ParseCancelled:
+            job.status, job.stage = CANCELLED, "dibatalkan"
+            logger.info(f"⏹️ Job {job.job_id} dibatalkan")
+        except Exception as e:
+            job.status, job.stage, job.error = FAILED, "gagal", str(e)
+            logger.error(f"❌ Job {job.job_id} gagal: {e}")
+        finally:
+            job.finished_at = time.time()
+            if job.delete_after:
+                try:
+                    os.remove(job.path)
+                except OSError:
+                    pass
+
+    def shutdown(self, wait: bool = True):
+        for job in self.jobs():
+            job.cancel()
+        self._pool.shutdown(wait=wait)
+
+
+_manager: JobManager | None = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """
+    JobManager bersama satu proses (dipakai semua sesi/analis).
+    """
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager()
+        return _manager
+
+
+def take_result(job: IngestJob) -> dict | None:
+    """
+    Ambil hasil job yang selesai dan lepaskan referensinya dari manager.
+    """
+    result, job.result = job.result, None
+    return result
+
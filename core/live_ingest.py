@@ -0,0 +1,314 @@
+# core/live_ingest.py
+
+import os
+import glob
+import hashlib
+import mmap
+import time
+import logging
+from collections import OrderedDict
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from core.aggregates import PacketAggregates, merge_aggregates
+from core.flows import FLOW_COLUMNS, build_flows, flow_keys, flow_key_hashes
+from core.preprocessor import preprocess_packets
+from parsers.parse_pcap_native import (
+    CaptureLayout, read_layout, scan_records, batch_to_frame, concat_chunks, DEFAULT_CHUNK_ROWS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Jendela geser (menit) yang dipakai dashboard live
+WINDOWS_MINUTES = (5, 15, 60)
+
+# Pola file hasil `tcpdump -w dump-%Y%m%d%H%M%S.pcap -G 60`
+DEFAULT_PATTERN = "*.pcap*"
+
+# Header pcap klasik 24 byte; pcapng butuh minimal header SHB
+_MIN_HEADER_BYTES = 24
+
+
+class CaptureTail:
+    """
+    Ikuti satu file pcap/pcapng yang terus bertambah.
+
+    `offset` adalah checkpoint: tiap `poll` hanya membaca record setelahnya, dan record
+    terakhir yang belum lengkap ditunda ke poll berikutnya.
+    """
+
+    def __init__(self, path: str, offset: int = 0, layout: CaptureLayout | None = None):
+        self.path = path
+        self.offset = offset
+        self.layout = layout
+        self.inode = None
+        self.packets = 0
+
+    def _reset(self):
+        self.offset = 0
+        self.layout = None
+        self.packets = 0
+
+    def poll(self, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        # File diganti (inode baru) atau dipotong: mulai lagi dari awal
+        if (self.inode is not None and stat.st_ino != self.inode) or stat.st_size < self.offset:
+            logger.info(f"🔄 File capture berganti/terpotong, baca ulang: {self.path}")
+            self._reset()
+        self.inode = stat.st_ino
+        if stat.st_size < _MIN_HEADER_BYTES or stat.st_size == self.offset:
+            return
+
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if self.layout is None:
+                self.layout, self.offset = read_layout(mm)
+            with memoryview(mm) as buf:
+                arr = np.frombuffer(buf, dtype=np.uint8)
+                try:
+                    while True:
+                        batch, offset = scan_records(buf, self.layout, self.offset, chunk_rows)
+                        self.offset = offset
+                        if len(batch) == 0:
+                            break
+                        self.packets += len(batch)
+                        yield preprocess_packets(batch_to_frame(arr, batch))
+                finally:
+                    del arr
+
+    def checkpoint(self) -> dict:
+        return {self.path: self.offset}
+
+
+class DirectoryTail:
+    """
+    Ikuti direktori capture yang dirotasi: file lama dihabiskan dulu, lalu file yang lebih baru.
+    """
+
+    def __init__(self, directory: str, pattern: str = DEFAULT_PATTERN):
+        self.directory = directory
+        self.pattern = pattern
+        self.tails: dict[str, CaptureTail] = {}
+
+    def _files(self) -> list[str]:
+        paths = glob.glob(os.path.join(self.directory, self.pattern))
+        stamped = []
+        for path in paths:
+            try:
+                stamped.append((os.path.getmtime(path), path))
+            except FileNotFoundError:
+                continue
+        return [path for _, path in sorted(stamped)]
+
+    def poll(self, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+        files = self._files()
+        # file yang sudah dihapus rotasi (`-W`) tidak perlu dilacak lagi
+        for gone in set(self.tails) - set(files):
+            del self.tails[gone]
+        for path in files:
+            tail = self.tails.setdefault(path, CaptureTail(path))
+            yield from tail.poll(chunk_rows)
+
+    def checkpoint(self) -> dict:
+        return {path: tail.offset for path, tail in self.tails.items()}
+
+
+def open_live_source(path: str, pattern: str = DEFAULT_PATTERN) -> CaptureTail | DirectoryTail:
+    if os.path.isdir(path):
+        return DirectoryTail(path, pattern)
+    return CaptureTail(path)
+
+
+class _Window:
+    """
+    Frame, cube, dan flow satu jendela pada `version` tertentu.
+
+    Menit yang keluar jendela dipotong dari depan frame dan paket baru di ujung jendela (urutan menit)
+    dilipat ke cube & flow yang ada. Hanya paket terlambat yang masuk ke tengah jendela memaksa
+    semuanya dirakit ulang.
+    """
+
+    def __init__(self):
+        self.version = -1
+        self.seq = 0
+        self.minutes: list[pd.Timestamp] = []
+        self.rows: list[int] = []
+        self.frame = pd.DataFrame()
+        self.cube = PacketAggregates()
+        self._flows: pd.DataFrame | None = None
+        self._flow_hashes = np.zeros(0, dtype=np.uint64)
+        self._row_hashes = np.zeros(0, dtype=np.uint64)
+        self._stale: list[np.ndarray] = []
+
+    def rebuild(self, parts: list[pd.DataFrame], cube: PacketAggregates):
+        self.frame = concat_chunks(parts) if parts else pd.DataFrame()
+        self.cube = cube
+        self._flows = None
+
+    def advance(self, dropped: int, parts: list[pd.DataFrame], cube: PacketAggregates | None = None):
+        """
+        Buang `dropped` baris terdepan (menit yang keluar jendela) lalu tambahkan `parts` di ujung.
+        Tanpa `cube` baru, `parts` dilipat ke cube yang ada.
+        """
+        if cube is None:
+            for part in parts:
+                self.cube.update(part)
+        else:
+            self.cube = cube
+        if self._flows is not None and dropped:
+            if dropped > len(self._row_hashes):
+                self._flows = None
+            else:
+                # kunci paket yang dibuang ikut dirakit ulang di `flows`
+                self._stale.append(self._row_hashes[:dropped])
+                self._row_hashes = self._row_hashes[dropped:]
+        frames = ([self.frame.iloc[dropped:]] if dropped < len(self.frame) else []) + parts
+        self.frame = concat_chunks(frames) if frames else pd.DataFrame()
+
+    def flows(self) -> pd.DataFrame:
+        if self.frame.empty:
+            return pd.DataFrame(columns=FLOW_COLUMNS)
+        if self._flows is None:
+            self._flows = build_flows(self.frame)
+            self._row_hashes = flow_key_hashes(flow_keys(self.frame))
+            self._flow_hashes = flow_key_hashes(self._flows)
+            self._stale = []
+            return self._flows
+        if len(self._row_hashes) < len(self.frame):
+            new = flow_key_hashes(flow_keys(self.frame.iloc[len(self._row_hashes):]))
+            self._row_hashes = np.concatenate([self._row_hashes, new])
+            self._stale.append(new)
+        if self._stale:
+            # Flow per 5-tuple saling bebas: hanya kunci yang paketnya bertambah/terbuang yang dirakit ulang
+            touched = np.unique(np.concatenate(self._stale))
+            rebuilt = build_flows(self.frame[np.isin(self._row_hashes, touched)])
+            keep = ~np.isin(self._flow_hashes, touched)
+            self._flows = concat_chunks([self._flows[keep], rebuilt])
+            self._flow_hashes = np.concatenate([self._flow_hashes[keep], flow_key_hashes(rebuilt)])
+            self._stale = []
+        return self._flows
+
+
+class SlidingWindows:
+    """
+    Ring buffer per menit untuk jendela 5/15/60 menit terakhir.
+
+    Tiap menit menyimpan `PacketAggregates` dan potongan paketnya sendiri. Paket baru hanya
+    memperbarui bucket menitnya; bucket di luar horizon dibuang. Frame, cube, dan flow tiap jendela
+    disimpan per `version` dan paket baru di ujung jendela dilipat ke dalamnya (lihat `_Window`).
+    """
+
+    def __init__(self, windows: tuple[int, ...] = WINDOWS_MINUTES):
+        self.windows = tuple(windows)
+        self.horizon = pd.Timedelta(minutes=max(self.windows))
+        self.buckets: OrderedDict[pd.Timestamp, PacketAggregates] = OrderedDict()
+        # potongan per menit beserta nomor urut kedatangannya
+        self.frames: dict[pd.Timestamp, list[tuple[int, pd.DataFrame]]] = {}
+        self.latest: pd.Timestamp | None = None
+        self.version = 0
+        self._seq = 0
+        self._windows: dict[int, _Window] = {}
+
+    def update(self, chunk: pd.DataFrame):
+        if chunk.empty or 'minute' not in chunk.columns:
+            return
+        for minute, part in chunk.groupby('minute', sort=True):
+            if self.latest is not None and minute <= self.latest - self.horizon:
+                continue  # terlambat, di luar horizon
+            if minute not in self.buckets:
+                self.buckets[minute] = PacketAggregates()
+                self.frames[minute] = []
+            self.buckets[minute].update(part)
+            self._seq += 1
+            self.frames[minute].append((self._seq, part))
+        newest = chunk['minute'].max()
+        self.latest = newest if self.latest is None else max(self.latest, newest)
+        self._evict()
+        self.version += 1
+
+    def _evict(self):
+        cutoff = self.latest - self.horizon
+        for minute in [m for m in self.buckets if m <= cutoff]:
+            del self.buckets[minute]
+            del self.frames[minute]
+
+    def _minutes(self, minutes: int) -> list[pd.Timestamp]:
+        if self.latest is None:
+            return []
+        cutoff = self.latest - pd.Timedelta(minutes=minutes)
+        return sorted(m for m in self.buckets if m > cutoff)
+
+    def _window(self, minutes: int) -> _Window:
+        window = self._windows.setdefault(minutes, _Window())
+        if window.version == self.version:
+            return window
+        current = self._minutes(minutes)
+        # Urutan baris = urutan menit lalu urutan kedatangan, sama dengan urutan merge cube,
+        # jadi `large_packet_rows` tetap valid
+        new = [(minute, part) for minute in current for seq, part in self.frames[minute] if seq > window.seq]
+        dropped = 0
+        while dropped < len(window.minutes) and (not current or window.minutes[dropped] < current[0]):
+            dropped += 1
+        kept = window.minutes[dropped:]
+        if kept and current[:len(kept)] == kept and all(minute >= kept[-1] for minute, _ in new):
+            cube = merge_aggregates(self.buckets[minute] for minute in current) if dropped else None
+            window.advance(sum(window.rows[:dropped]), [part for _, part in new], cube)
+        else:
+            window.rebuild([part for minute in current for _, part in self.frames[minute]],
+                           merge_aggregates(self.buckets[minute] for minute in current))
+        window.minutes = current
+        window.rows = [sum(len(part) for _, part in self.frames[minute]) for minute in current]
+        window.seq, window.version = self._seq, self.version
+        return window
+
+    def cube(self, minutes: int) -> PacketAggregates:
+        return self._window(minutes).cube
+
+    def frame(self, minutes: int) -> pd.DataFrame:
+        return self._window(minutes).frame
+
+    def flows(self, minutes: int) -> pd.DataFrame:
+        return self._window(minutes).flows()
+
+    def key(self, minutes: int) -> str:
+        """
+        Kunci isi jendela: menit di dalamnya dan jumlah paket tiap menit (bucket hanya bertambah).
+        Tetap sama selama isi jendela sama, walau `version` naik karena paket di luar jendela.
+        """
+        content = [(minute.value, self.buckets[minute].total_packets) for minute in self._minutes(minutes)]
+        return hashlib.blake2b(repr(content).encode(), digest_size=20).hexdigest()
+
+
+class LiveSession:
+    """
+    Sumber live + jendela geser; `refresh()` memproses paket baru saja.
+    """
+
+    def __init__(self, path: str, windows: tuple[int, ...] = WINDOWS_MINUTES, pattern: str = DEFAULT_PATTERN):
+        self.path = path
+        self.source = open_live_source(path, pattern)
+        self.windows = SlidingWindows(windows)
+        self.total_packets = 0
+        self.last_new_packets = 0
+        self.last_refresh_s = 0.0
+
+    def refresh(self, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> int:
+        start = time.perf_counter()
+        new = 0
+        for chunk in self.source.poll(chunk_rows):
+            self.windows.update(chunk)
+            new += len(chunk)
+        self.total_packets += new
+        self.last_new_packets = new
+        self.last_refresh_s = time.perf_counter() - start
+        if new:
+            logger.info(f"📡 Live: {new:,} paket baru ({self.last_refresh_s:.3f}s)")
+        return new
+
+    def dataset_key(self, minutes: int) -> str:
+        # Kunci cache halaman (detektor, flow, sketch) mengikuti isi jendela, bukan versi
+        return f"live:{self.path}:{self.windows.key(minutes)}"
@@ -0,0 +1,274 @@
+# core/metrics.py
+
+import io
+import os
+import json
+import time
+import logging
+import functools
+import threading
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Callable, Iterable, Iterator
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Jumlah record terakhir yang disimpan untuk panel Performance
+MAX_RECORDS = 500
+
+# Ekspor otomatis: JSON lines (append per stage) & file teks Prometheus (ditulis ulang per stage)
+METRICS_LOG_ENV = "NIDS_METRICS_LOG"
+METRICS_PROM_ENV = "NIDS_METRICS_PROM"
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+
+def current_rss() -> int:
+    """
+    RSS proses saat ini dalam byte (0 bila tidak tersedia di platform ini).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _rows(value) -> int | None:
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return len(value)
+    return None
+
+
+@dataclass
+class StageMetric:
+    stage: str
+    wall_s: float
+    cpu_s: float
+    rows_in: int | None
+    rows_out: int | None
+    # selisih RSS seluruh proses (stage lain di thread lain ikut terhitung)
+    mem_delta_bytes: int
+    started_at: float
+    thread: str
+    error: str | None = None
+
+    @property
+    def rows_per_sec(self) -> float | None:
+        rows = self.rows_out if self.rows_out is not None else self.rows_in
+        return rows / self.wall_s if rows is not None and self.wall_s > 0 else None
+
+
+class StageTimer:
+    """
+    Ukur satu stage; bisa dimasuki berulang kali (mis. per potongan) lalu dicatat sekali.
+    """
+
+    def __init__(self, stage: str, rows_in: int | None = None, registry: "MetricsRegistry | None" = None):
+        self.stage = stage
+        self.rows_in = rows_in
+        self.rows_out: int | None = None
+        self.error: str | None = None
+        self.wall = self.cpu = 0.0
+        self.mem_delta = 0
+        self.started_at = time.time()
+        self._registry = registry
+
+    def __enter__(self) -> "StageTimer":
+        self._wall0, self._cpu0, self._rss0 = time.perf_counter(), time.thread_time(), current_rss()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.wall += time.perf_counter() - self._wall0
+        self.cpu += time.thread_time() - self._cpu0
+        self.mem_delta += current_rss() - self._rss0
+        if exc_type is not None and exc_type is not GeneratorExit:
+            self.error = exc_type.__name__
+        return False
+
+    def add_rows(self, rows: int):
+        self.rows_out = (self.rows_out or 0) + rows
+
+    def record(self) -> StageMetric:
+        metric = StageMetric(self.stage, self.wall, self.cpu, self.rows_in, self.rows_out, self.mem_delta,
+                             self.started_at, threading.current_thread().name, self.error)
+        (self._registry or metrics).record(metric)
+        return metric
+
+
+class MetricsRegistry:
+    """
+    Penampung metrik stage untuk satu proses (dibagi semua sesi & thread ingest).
+    """
+
+    def __init__(self, max_records: int = MAX_RECORDS):
+        self._records: deque[StageMetric] = deque(maxlen=max_records)
+        self._totals: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def record(self, metric: StageMetric):
+        with self._lock:
+            self._records.append(metric)
+            total = self._totals.setdefault(metric.stage, {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0,
+                                                           "rows_in": 0, "rows_out": 0, "errors": 0})
+            total["calls"] += 1
+            total["wall_s"] += metric.wall_s
+            total["cpu_s"] += metric.cpu_s
+            total["rows_in"] += metric.rows_in or 0
+            total["rows_out"] += metric.rows_out or 0
+            total["errors"] += metric.error is not None
+        self._export(metric)
+
+    def _export(self, metric: StageMetric):
+        log_path = os.environ.get(METRICS_LOG_ENV)
+        prom_path = os.environ.get(METRICS_PROM_ENV)
+        try:
+            if log_path:
+                with open(log_path, "a") as f:
+                    f.write(json.dumps(asdict(metric)) + "\n")
+            if prom_path:
+                # tulis atomik agar collector textfile tidak membaca file setengah jadi
+                tmp = f"{prom_path}.tmp"
+                with open(tmp, "w") as f:
+                    f.write(self.to_prometheus())
+                os.replace(tmp, prom_path)
+        except OSError as e:
+            logger.warning(f"⚠️ Ekspor metrik gagal: {e}")
+
+    def recent(self, n: int = 50) -> pd.DataFrame:
+        with self._lock:
+            records = list(self._records)[-n:]
+        if not records:
+            return pd.DataFrame()
+        df = pd.DataFrame([asdict(r) for r in reversed(records)])
+        df["started_at"] = pd.to_datetime(df["started_at"], unit="s")
+        df["mem_delta_mb"] = df.pop("mem_delta_bytes") / 1e6
+        return df
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Total per stage sejak proses mulai (atau sejak `reset`).
+        """
+        with self._lock:
+            totals = {stage: dict(t) for stage, t in self._totals.items()}
+        if not totals:
+            return pd.DataFrame()
+        df = pd.DataFrame.from_dict(totals, orient="index").rename_axis("stage").reset_index()
+        df["rows_per_sec"] = (df[["rows_in", "rows_out"]].max(axis=1) / df["wall_s"].where(df["wall_s"] > 0)).round()
+        return df.sort_values("wall_s", ascending=False, ignore_index=True)
+
+    def to_json(self) -> str:
+        with self._lock:
+            records = [asdict(r) for r in self._records]
+        return "\n".join(json.dumps(r) for r in records) + ("\n" if records else "")
+
+    def to_prometheus(self) -> str:
+        with self._lock:
+            totals = {stage: dict(t) for stage, t in self._totals.items()}
+        series = [
+            ("nids_stage_calls_total", "Jumlah eksekusi stage", "calls"),
+            ("nids_stage_wall_seconds_total", "Wall time per stage", "wall_s"),
+            ("nids_stage_cpu_seconds_total", "CPU time (thread) per stage", "cpu_s"),
+            ("nids_stage_rows_in_total", "Baris masuk per stage", "rows_in"),
+            ("nids_stage_rows_out_total", "Baris keluar per stage", "rows_out"),
+            ("nids_stage_errors_total", "Stage yang berakhir dengan exception", "errors"),
+        ]
+        lines = []
+        for name, help_text, key in series:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            lines += [f'{name}{{stage="{stage}"}} {t[key]}' for stage, t in sorted(totals.items())]
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._records.clear()
+            self._totals.clear()
+
+
+metrics = MetricsRegistry()
+
+
+def timed_stage(name: str):
+    """
+    Decorator: catat wall/CPU time, baris masuk (argumen DataFrame pertama) & keluar (hasil).
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            rows_in = next((r for r in map(_rows, args) if r is not None), None)
+            timer = StageTimer(name, rows_in)
+            try:
+                with timer:
+                    result = func(*args, **kwargs)
+                timer.rows_out = _rows(result)
+                return result
+            finally:
+                timer.record()
+        return wrapper
+    return decorator
+
+
+def timed_iter(name: str, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    """
+    Ukur waktu yang dihabiskan di dalam iterator potongan (tanpa waktu konsumen), dicatat sekali.
+    """
+    timer = StageTimer(name)
+    iterator = iter(chunks)
+    try:
+        while True:
+            with timer:
+                chunk = next(iterator, None)
+            if chunk is None:
+                return
+            timer.add_rows(len(chunk))
+            yield chunk
+    finally:
+        timer.record()
+
+
+# === Profiling opt-in per rerun ===
+
+def profilers() -> list[str]:
+    available = ["cProfile"]
+    try:
+        import pyinstrument  # noqa: F401
+        available.append("pyinstrument")
+    except ImportError:
+        pass
+    return available
+
+
+class RequestProfiler:
+    """
+    Profil satu rerun/permintaan dengan cProfile atau pyinstrument (bila terpasang).
+    """
+
+    def __init__(self, tool: str = "cProfile", limit: int = 40):
+        self.tool, self.limit = tool, limit
+        self._profiler = None
+
+    def start(self) -> "RequestProfiler":
+        if self.tool == "pyinstrument":
+            from pyinstrument import Profiler
+            self._profiler = Profiler()
+            self._profiler.start()
+        else:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def stop(self) -> str:
+        if self.tool == "pyinstrument":
+            self._profiler.stop()
+            return self._profiler.output_text(unicode=True)
+        import pstats
+        self._profiler.disable()
+        out = io.StringIO()
+        pstats.Stats(self._profiler, stream=out).sort_stats("cumulative").print_stats(self.limit)
+        return out.getvalue()
@@ -0,0 +1,178 @@
+# core/packet_store.py
+
+import os
+import re
+import uuid
+import shutil
+import logging
+from pathlib import Path
+from typing import Iterable
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pa_fs
+
+from core.preprocessor import compact_packets
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_DIR = os.path.join(Path.home(), ".local", "share", "nids", "packet_store")
+
+# Kolom partisi: satu direktori per jam (hour=YYYYMMDDTHH), urutan string = urutan waktu
+PARTITION_COLUMN = "hour"
+HOUR_FORMAT = "%Y%m%dT%H"
+
+# Row group kecil agar statistik min/max (time, src, dst, protocol) bisa memangkas pembacaan
+ROWS_PER_GROUP = 65_536
+
+# Urutan baris di dalam tiap partisi jam: row group berisi sedikit protocol/src sehingga min/max-nya rapat
+CLUSTER_COLUMNS = ("protocol", "src", "time")
+
+_PARTITIONING = ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.string())]), flavor="hive")
+
+_PANDAS_TYPES = {
+    pa.uint8(): pd.UInt8Dtype(),
+    pa.uint16(): pd.UInt16Dtype(),
+}
+
+
+def _safe_name(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", name).strip("._") or "dataset"
+
+
+def _cluster_key(s: pd.Series) -> pd.Series:
+    # categorical diurutkan menurut nilainya (seperti statistik Parquet), bukan urutan kamus
+    if isinstance(s.dtype, pd.CategoricalDtype) and not s.cat.categories.is_monotonic_increasing:
+        return s.cat.reorder_categories(s.cat.categories.sort_values())
+    return s
+
+
+def _timestamp(value) -> pa.Scalar:
+    return pa.scalar(pd.Timestamp(value).to_datetime64().astype("datetime64[ns]"), type=pa.timestamp("ns"))
+
+
+class PacketStore:
+    """
+    Arsip paket persisten: satu dataset Parquet per capture, dipartisi per jam.
+
+    Baris di tiap jam diurutkan per (protocol, src, time) sehingga statistik row group pada
+    protocol/src rapat (filter waktu dipangkas lewat partisi jam); `query` mendorong predikat
+    ke pembaca Parquet (partisi + row group) dan membaca file lewat memory map.
+    """
+
+    def __init__(self, root: str | None = None):
+        self.root = Path(root or os.environ.get("NIDS_STORE_DIR") or DEFAULT_STORE_DIR)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._fs = pa_fs.LocalFileSystem(use_mmap=True)
+
+    def _path(self, name: str) -> Path:
+        return self.root / _safe_name(name)
+
+    def datasets(self) -> list[str]:
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir())
+
+    def append(self, name: str, df: pd.DataFrame) -> int:
+        """
+        Tambahkan paket ke dataset `name` (file baru per append, data lama tidak ditulis ulang).
+        """
+        if df.empty or 'time' not in df.columns:
+            return 0
+        df = df.drop(columns=[c for c in ('minute',) if c in df.columns])
+        hour = df['time'].dt.floor("h").rename(PARTITION_COLUMN)
+        keys = [c for c in CLUSTER_COLUMNS if c in df.columns]
+        order = pd.concat([hour, df[keys]], axis=1).reset_index(drop=True).sort_values(
+            [PARTITION_COLUMN, *keys], kind="stable", key=_cluster_key).index.to_numpy()
+        df, hour = df.iloc[order], hour.iloc[order]
+        # strftime hanya untuk jam unik, bukan per baris
+        codes, hours = pd.factorize(hour)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.append_column(PARTITION_COLUMN, pa.DictionaryArray.from_arrays(
+            pa.array(codes, type=pa.int32()), pa.array(hours.strftime(HOUR_FORMAT))).cast(pa.string()))
+        ds.write_dataset(
+            table, str(self._path(name)), format="parquet", partitioning=_PARTITIONING,
+            basename_template=f"part-{uuid.uuid4().hex[:12]}-{{i}}.parquet",
+            max_rows_per_group=ROWS_PER_GROUP, min_rows_per_group=min(ROWS_PER_GROUP, len(df)),
+            existing_data_behavior="overwrite_or_ignore",
+        )
+        logger.info(f"💾 Packet store: {len(df):,} paket ditulis ke {name}")
+        return len(df)
+
+    def _dataset(self, name: str) -> ds.Dataset:
+        path = self._path(name)
+        if not path.exists():
+            raise FileNotFoundError(f"Dataset tidak ditemukan di packet store: {name}")
+        return ds.dataset(str(path), format="parquet", partitioning=_PARTITIONING, filesystem=self._fs)
+
+    def query(self, name: str, start=None, end=None, src: Iterable[str] | None = None,
+              dst: Iterable[str] | None = None, protocol=None,
+              columns: list[str] | None = None) -> pd.DataFrame:
+        """
+        Ambil paket dengan `start <= time < end`, `src in`, `dst in`, `protocol ==`.
+
+        Filter jam memangkas direktori partisi; filter lain dievaluasi terhadap statistik
+        row group sehingga row group yang tidak cocok tidak dibaca.
+        """
+        conditions = []
+        if start is not None:
+            conditions.append(ds.field('time') >= _timestamp(start))
+            conditions.append(ds.field(PARTITION_COLUMN) >= pd.Timestamp(start).strftime(HOUR_FORMAT))
+        if end is not None:
+            conditions.append(ds.field('time') < _timestamp(end))
+            conditions.append(ds.field(PARTITION_COLUMN) <= pd.Timestamp(end).strftime(HOUR_FORMAT))
+        if src is not None:
+            conditions.append(ds.field('src').isin(list(src)))
+        if dst is not None:
+            conditions.append(ds.field('dst').isin(list(dst)))
+        if protocol is not None:
+            conditions.append(ds.field('protocol') == protocol)
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+
+        table = self._dataset(name).to_table(filter=expression, columns=columns)
+        df = table.to_pandas(types_mapper=_PANDAS_TYPES.get)
+        if PARTITION_COLUMN in df.columns:
+            df = df.drop(columns=[PARTITION_COLUMN])
+        if 'time' in df.columns and len(df):
+            df = df.sort_values('time', kind="stable", ignore_index=True)
+            df['minute'] = df['time'].dt.floor("min")
+        return compact_packets(df)
+
+    def describe(self, name: str) -> dict:
+        """
+        Ringkasan dataset dari metadata Parquet saja (tanpa membaca data), termasuk `version`.
+        """
+        dataset = self._dataset(name)
+        rows = files = size = modified = 0
+        start = end = None
+        for fragment in dataset.get_fragments():
+            files += 1
+            stat = os.stat(fragment.path)
+            size += stat.st_size
+            modified = max(modified, stat.st_mtime_ns)
+            metadata = fragment.metadata
+            rows += metadata.num_rows
+            time_index = metadata.schema.names.index('time')
+            for i in range(metadata.num_row_groups):
+                stats = metadata.row_group(i).column(time_index).statistics
+                if stats is not None and stats.has_min_max:
+                    start = stats.min if start is None else min(start, stats.min)
+                    end = stats.max if end is None else max(end, stats.max)
+        # versi berubah setiap append (file baru) → dipakai sebagai bagian kunci cache hasil query
+        return {"rows": rows, "files": files, "size_bytes": size, "version": f"{files}-{modified}",
+                "start": pd.Timestamp(start) if start is not None else None,
+                "end": pd.Timestamp(end) if end is not None else None}
+
+    def delete(self, name: str):
+        shutil.rmtree(self._path(name), ignore_errors=True)
+
+
+_default_store: PacketStore | None = None
+
+
+def get_packet_store() -> PacketStore:
+    global _default_store
+    if _default_store is None:
+        _default_store = PacketStore()
+    return _default_store
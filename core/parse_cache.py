@@ -0,0 +1,198 @@
+# core/parse_cache.py
+
+import os
+import hashlib
+import logging
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+from core.auto_parser import parse_pcap_auto, ProgressCallback
+from core.protocols import CLASSIFIER_VERSION
+from parsers.parse_pcap_native import PARSER_VERSION, COLUMNS
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_BYTES = 4 * 1024 * 1024
+DEFAULT_CACHE_DIR = os.path.join(Path.home(), ".cache", "nids", "parse_cache")
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+
+def new_hasher():
+    return hashlib.blake2b(digest_size=20)
+
+
+def file_digest(filepath: str, chunk_size: int = HASH_CHUNK_BYTES) -> str:
+    """
+    Hash isi file secara streaming (tidak pernah memuat seluruh file ke memori).
+    """
+    hasher = new_hasher()
+    with open(filepath, "rb") as f:
+        while True:
+            block = f.read(chunk_size)
+            if not block:
+                break
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def cache_key(content_digest: str, suffix: str) -> str:
+    # Kunci ikut berubah bila versi parser/klasifikasi protokol, daftar kolom, atau jenis file berbeda
+    meta = "|".join([content_digest, suffix.lower(), PARSER_VERSION, CLASSIFIER_VERSION, ",".join(COLUMNS)])
+    return hashlib.blake2b(meta.encode(), digest_size=20).hexdigest()
+
+
+class ParseCache:
+    """
+    Cache tabel hasil parsing di disk (Arrow IPC), dengan eviksi LRU berbasis ukuran total.
+
+    Jumlah & ukuran file dicatat di memori (dipindai ulang dari disk hanya saat eviksi), sehingga
+    `stats()` murah untuk dipanggil setiap rerun.
+    """
+
+    def __init__(self, cache_dir: str | None = None, max_bytes: int | None = None):
+        self.cache_dir = Path(cache_dir or os.environ.get("NIDS_CACHE_DIR", DEFAULT_CACHE_DIR))
+        if max_bytes is None:
+            max_mb = os.environ.get("NIDS_CACHE_MAX_MB")
+            max_bytes = int(max_mb) * 1024 * 1024 if max_mb else DEFAULT_MAX_BYTES
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._sizes = {p.name: size for _, size, p in self._scan()}
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.arrow"
+
+    def _scan(self) -> list[tuple[float, int, Path]]:
+        # (mtime, ukuran, path) file cache; file yang dihapus sesi/proses lain di tengah scan dilewati
+        files = []
+        for p in self.cache_dir.glob("*.arrow"):
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            files.append((st.st_mtime, st.st_size, p))
+        return files
+
+    def get(self, key: str) -> pd.DataFrame | None:
+        """
+        Tabel dari cache. Kolom lebar tetap (waktu, panjang, kode categorical) langsung menunjuk ke
+        file yang di-memory-map (read-only, tanpa salinan); kolom nullable tetap dikonversi.
+        """
+        path = self._path(key)
+        try:
+            with pa.memory_map(str(path), "r") as source:
+                table = pa.ipc.open_file(source).read_all()
+        except (FileNotFoundError, pa.ArrowInvalid):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        # mtime dipakai sebagai waktu akses terakhir untuk LRU; file bisa sudah dieviksi sesi lain
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        source_bytes = int((table.schema.metadata or {}).get(b"nids_source_bytes", b"0"))
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += source_bytes
+        # split_blocks: satu block per kolom sehingga array lebar tetap bisa zero-copy dari mmap
+        return table.to_pandas(split_blocks=True)
+
+    def put(self, key: str, df: pd.DataFrame, source_bytes: int = 0) -> bool:
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            logger.warning(f"⚠️ Tabel tidak bisa disimpan ke cache: {e}")
+            return False
+
+        metadata = dict(table.schema.metadata or {})
+        metadata[b"nids_source_bytes"] = str(source_bytes).encode()
+        table = table.replace_schema_metadata(metadata)
+
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".tmp{os.getpid()}.{threading.get_ident()}")
+        with pa.OSFile(str(tmp_path), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._sizes[path.name] = path.stat().st_size
+            over = sum(self._sizes.values()) > self.max_bytes
+        if over:
+            self.evict()
+        return True
+
+    def entries(self) -> int:
+        with self._lock:
+            return len(self._sizes)
+
+    def size_bytes(self) -> int:
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def evict(self):
+        files = self._scan()
+        total = sum(size for _, size, _ in files)
+        for _, size, p in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                p.unlink()
+                total -= size
+                logger.info(f"🧹 Cache dihapus (LRU): {p.name}")
+            except FileNotFoundError:
+                continue
+        # sinkronkan catatan di memori dengan isi direktori (termasuk tulisan proses lain)
+        sizes = {p.name: size for _, size, p in self._scan()}
+        with self._lock:
+            self._sizes = sizes
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes_saved": self.bytes_saved,
+            "entries": self.entries(),
+            "size_bytes": self.size_bytes(),
+            "max_bytes": self.max_bytes,
+        }
+
+
+_default_cache: ParseCache | None = None
+
+
+def get_parse_cache() -> ParseCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ParseCache()
+    return _default_cache
+
+
+def parse_pcap_cached(filepath: str, digest: str | None = None, cache: ParseCache | None = None,
+                      progress: ProgressCallback | None = None) -> pd.DataFrame:
+    """
+    Sama seperti `parse_pcap_auto`, tetapi hasilnya diambil/disimpan di cache berdasarkan isi file.
+    """
+    cache = cache or get_parse_cache()
+    try:
+        key = cache_key(digest or file_digest(filepath), Path(filepath).suffix)
+    except OSError as e:
+        logger.error(f"❌ Gagal membaca file untuk hashing: {e}")
+        return pd.DataFrame()
+
+    df = cache.get(key)
+    if df is not None:
+        logger.info(f"⚡ Cache hit: {filepath} ({len(df):,} baris)")
+        return df
+
+    df = parse_pcap_auto(filepath, progress=progress)
+    if df is not None and not df.empty:
+        cache.put(key, df, source_bytes=os.path.getsize(filepath))
+    return df
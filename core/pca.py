@@ -0,0 +1,140 @@
+# core/pca.py
+
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from core.aggregates import destination_ports, source_ports
+from core.metrics import timed_stage
+
+logger = logging.getLogger(__name__)
+
+# Fitur numerik eksplisit per paket (bukan "semua kolom int64/float64")
+PCA_FEATURES = ["length", "protocol", "src_port", "dst_port", "tcp_flags"]
+
+# Batas baris untuk fit PCA (randomized) dan titik scatter yang digambar
+FIT_SAMPLE_ROWS = 200_000
+PLOT_SAMPLE_ROWS = 5_000
+TRANSFORM_CHUNK_ROWS = 250_000
+
+
+def _numeric(s: pd.Series) -> np.ndarray:
+    # Categorical -> konversi per kategori lalu ambil lewat kode (tanpa cast per baris)
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        values = pd.to_numeric(pd.Series(s.cat.categories.astype(object)), errors="coerce").to_numpy(dtype=np.float64)
+        codes = s.cat.codes.to_numpy()
+        return np.where(codes >= 0, np.append(values, np.nan)[codes], np.nan)
+    return pd.to_numeric(s, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def packet_features(df: pd.DataFrame) -> np.ndarray:
+    """
+    Matriks fitur (n, len(PCA_FEATURES)) float64; kolom yang tidak ada/NA diisi 0.
+    """
+    columns = {
+        "length": df['length'] if 'length' in df.columns else None,
+        "protocol": df['protocol'] if 'protocol' in df.columns else None,
+        "src_port": source_ports(df),
+        "dst_port": destination_ports(df),
+        "tcp_flags": df['tcp_flags'] if 'tcp_flags' in df.columns else None,
+    }
+    out = np.zeros((len(df), len(PCA_FEATURES)), dtype=np.float64)
+    for i, name in enumerate(PCA_FEATURES):
+        if columns[name] is not None:
+            out[:, i] = np.nan_to_num(_numeric(columns[name]), nan=0.0)
+    return out
+
+
+def stratified_sample(labels: pd.Series, n: int, seed: int = 0) -> np.ndarray:
+    """
+    Posisi baris sampel berukuran <= n, proporsional per kelas tetapi kelas kecil tetap terwakili.
+    """
+    total = len(labels)
+    if total <= n:
+        return np.arange(total)
+    codes = pd.factorize(labels, use_na_sentinel=False)[0]
+    counts = np.bincount(codes)
+    # Jatah minimum per kelas dulu, sisa anggaran dibagi proporsional ke baris yang tersisa
+    base = np.minimum(counts, n // (10 * len(counts)))
+    rest = counts - base
+    budget = n - base.sum()
+    quota = base + np.floor(rest * (budget / max(rest.sum(), 1))).astype(np.int64)
+
+    # Peringkat acak di dalam kelas: urutkan (kelas, kunci acak), lalu posisi relatif ke awal kelas
+    rng = np.random.default_rng(seed)
+    order = np.lexsort((rng.random(total), codes))
+    class_start = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    rank = np.arange(total) - class_start[codes[order]]
+    return np.sort(order[rank < quota[codes[order]]])
+
+
+@dataclass
+class PacketPCA:
+    """
+    Model PCA 2 komponen atas fitur paket yang distandarkan.
+    """
+    model: object
+    mean: np.ndarray
+    scale: np.ndarray
+    sample_rows: np.ndarray
+    method: str
+
+    @property
+    def explained_variance_ratio(self) -> np.ndarray:
+        return self.model.explained_variance_ratio_
+
+    def transform(self, df: pd.DataFrame, chunk_rows: int = TRANSFORM_CHUNK_ROWS) -> np.ndarray:
+        """
+        Proyeksi semua baris per potongan; hasil float32 (n, 2).
+        """
+        out = np.empty((len(df), 2), dtype=np.float32)
+        for start in range(0, len(df), chunk_rows):
+            part = packet_features(df.iloc[start:start + chunk_rows])
+            out[start:start + len(part)] = self.model.transform((part - self.mean) / self.scale)
+        return out
+
+
+@timed_stage("pca_fit")
+def fit_packet_pca(df: pd.DataFrame, method: str = "sample", sample_rows: int = FIT_SAMPLE_ROWS,
+                   chunk_rows: int = TRANSFORM_CHUNK_ROWS, seed: int = 0) -> PacketPCA:
+    """
+    Fit PCA tanpa memproses seluruh capture sekaligus.
+
+    `method="sample"`: PCA randomized pada sampel terstratifikasi per protokol (<= `sample_rows`).
+    `method="incremental"`: `IncrementalPCA.partial_fit` per potongan `chunk_rows` atas semua baris.
+    """
+    from sklearn.decomposition import PCA, IncrementalPCA
+
+    labels = df['protocol'] if 'protocol' in df.columns else pd.Series(0, index=df.index)
+    sample = stratified_sample(labels, sample_rows, seed=seed)
+
+    if method == "incremental":
+        # Statistik standardisasi dari semua baris (satu lintasan per potongan)
+        total = np.zeros(len(PCA_FEATURES))
+        total_sq = np.zeros(len(PCA_FEATURES))
+        for start in range(0, len(df), chunk_rows):
+            part = packet_features(df.iloc[start:start + chunk_rows])
+            total += part.sum(axis=0)
+            total_sq += (part * part).sum(axis=0)
+        mean = total / len(df)
+        scale = np.sqrt(np.clip(total_sq / len(df) - mean ** 2, 0, None))
+        scale[scale == 0] = 1.0
+        model = IncrementalPCA(n_components=2)
+        for start in range(0, len(df), chunk_rows):
+            part = packet_features(df.iloc[start:start + chunk_rows])
+            if len(part) >= 2:
+                model.partial_fit((part - mean) / scale)
+    elif method == "sample":
+        features = packet_features(df.iloc[sample])
+        mean = features.mean(axis=0)
+        scale = features.std(axis=0)
+        scale[scale == 0] = 1.0
+        model = PCA(n_components=2, svd_solver="randomized", random_state=seed)
+        model.fit((features - mean) / scale)
+    else:
+        raise ValueError(f"❌ Metode PCA tidak dikenal: {method}")
+
+    logger.info(f"✅ PCA ({method}) selesai. Sampel: {len(sample):,} dari {len(df):,} baris")
+    return PacketPCA(model=model, mean=mean, scale=scale, sample_rows=sample, method=method)
@@ -1,23 +1,79 @@
 # core/preprocessor.py
 
+import numpy as np
 import pandas as pd
 
+from core.metrics import timed_stage
+from core.protocols import classify_protocols
+from parsers.schema import ADDRESS_COLUMNS
+
+CATEGORY_COLUMNS = ('protocol', 'layers')
+
+def compact_packets(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ubah kolom berulang menjadi categorical (in place pada frame yang diberikan).
+
+    Kolom alamat (src, dst, inner_src, inner_dst) berbagi satu kamus: setiap alamat disimpan sekali sebagai string,
+    per paket hanya kode integer; string tampilan baru dibentuk saat kategori dibaca.
+    """
+    addresses = [c for c in ADDRESS_COLUMNS if c in df.columns]
+    if addresses:
+        columns = {}
+        for col in addresses:
+            s = df[col]
+            if not isinstance(s.dtype, pd.CategoricalDtype):
+                s = s.astype('category')
+            columns[col] = s
+        categories = columns[addresses[0]].cat.categories
+        for col in addresses[1:]:
+            categories = categories.union(columns[col].cat.categories)
+        for col, s in columns.items():
+            if s.isna().all():
+                # kolom kosong (mis. inner_* tanpa tunnel): lebar kode mengikuti kamus bersama
+                s = pd.Series(pd.Categorical.from_codes(np.full(len(s), -1), categories=categories), index=s.index)
+            elif not s.cat.categories.equals(categories):
+                s = s.cat.set_categories(categories)
+            df[col] = s
+
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            s = df[col].astype('category')
+            # kategori dari kolom nullable (mis. UInt8) disimpan sebagai dtype numpy biasa
+            if isinstance(s.cat.categories.dtype, pd.api.extensions.ExtensionDtype):
+                s = s.cat.rename_categories(s.cat.categories.to_numpy(dtype=s.cat.categories.dtype.numpy_dtype))
+            df[col] = s
+    return df
+
+@timed_stage("preprocess_packets")
 def preprocess_packets(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Menyiapkan data hasil parsing: konversi waktu, isi kosong, dan kolom bantu.
+    Menyiapkan data hasil parsing: konversi waktu, isi kosong, kolom bantu, dan klasifikasi
+    protokol ternormalisasi (`l3`, `l4`, `l7`, lihat `core.protocols`).
+
+    Tidak menyalin data kolom: frame hasil adalah shallow copy sehingga frame input
+    tidak berubah, dan baris hanya difilter bila memang ada waktu yang tidak valid.
     """
-    df = df.copy()
+    df = df.copy(deep=False)
 
     # Konversi kolom 'time' ke datetime
     if 'time' in df.columns:
-        df['time'] = pd.to_datetime(df['time'], errors='coerce')
-        df = df[df['time'].notna()]
+        # Parser pcap menghasilkan epoch detik (float); CSV biasanya string tanggal
+        if pd.api.types.is_numeric_dtype(df['time']):
+            df['time'] = pd.to_datetime(df['time'], unit='s', errors='coerce')
+        else:
+            df['time'] = pd.to_datetime(df['time'], errors='coerce')
+        valid = df['time'].notna()
+        if not valid.all():
+            df = df[valid].copy(deep=False)
         df['minute'] = df['time'].dt.floor("min")
 
     # Pastikan kolom 'length' ada dan tidak null
     if 'length' in df.columns:
-        df['length'] = pd.to_numeric(df['length'], errors='coerce').fillna(0)
+        if not pd.api.types.is_numeric_dtype(df['length']):
+            df['length'] = pd.to_numeric(df['length'], errors='coerce')
+        if df['length'].hasnans:
+            df['length'] = df['length'].fillna(0)
     else:
         df['length'] = 0
 
-    return df
+    return classify_protocols(compact_packets(df))
@@ -0,0 +1,212 @@
+# core/protocols.py
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from core.metrics import timed_stage
+
+logger = logging.getLogger(__name__)
+
+# Versi aturan klasifikasi (ikut kunci parse cache: ubah bila tabel di bawah berubah)
+CLASSIFIER_VERSION = "2"
+
+# === Nama ternormalisasi (kategori tetap: potongan bisa digabung tanpa menyatukan kamus) ===
+
+L3_NAMES = ["IPv4", "IPv6", "ARP", "Other"]
+L4_NAMES = ["TCP", "UDP", "ICMP", "ICMPv6", "IGMP", "GRE", "ESP", "SCTP", "Other"]
+L7_NAMES = ["DNS", "HTTP", "TLS", "QUIC", "SSH", "SMTP", "FTP", "NTP", "DHCP", "SNMP"]
+
+LAYER_COLUMNS = ("l3", "l4", "l7")
+
+_L3 = {name: code for code, name in enumerate(L3_NAMES)}
+_L4 = {name: code for code, name in enumerate(L4_NAMES)}
+_L7 = {name: code for code, name in enumerate(L7_NAMES)}
+
+# Token `frame.protocols` / `highest_layer` (huruf kecil) -> nama ternormalisasi
+L3_TOKENS = {"ip": "IPv4", "ipv6": "IPv6", "arp": "ARP"}
+L4_TOKENS = {"tcp": "TCP", "udp": "UDP", "icmp": "ICMP", "icmpv6": "ICMPv6", "igmp": "IGMP",
+             "gre": "GRE", "esp": "ESP", "sctp": "SCTP"}
+L7_TOKENS = {"dns": "DNS", "mdns": "DNS", "llmnr": "DNS", "http": "HTTP", "http2": "HTTP", "tls": "TLS",
+             "ssl": "TLS", "quic": "QUIC", "gquic": "QUIC", "ssh": "SSH", "smtp": "SMTP", "ftp": "FTP",
+             "ntp": "NTP", "dhcp": "DHCP", "bootp": "DHCP", "dhcpv6": "DHCP", "snmp": "SNMP"}
+
+# Nomor protokol IP (IANA) -> L4
+IP_PROTOCOLS = {1: "ICMP", 2: "IGMP", 6: "TCP", 17: "UDP", 47: "GRE", 50: "ESP", 58: "ICMPv6", 132: "SCTP"}
+
+# Port terkenal -> L7, terpisah untuk TCP dan UDP (443/UDP = QUIC)
+TCP_PORTS = {53: "DNS", 80: "HTTP", 8000: "HTTP", 8080: "HTTP", 443: "TLS", 8443: "TLS", 853: "TLS",
+             22: "SSH", 25: "SMTP", 465: "SMTP", 587: "SMTP", 20: "FTP", 21: "FTP"}
+UDP_PORTS = {53: "DNS", 5353: "DNS", 5355: "DNS", 443: "QUIC", 123: "NTP", 67: "DHCP", 68: "DHCP",
+             546: "DHCP", 547: "DHCP", 161: "SNMP", 162: "SNMP"}
+
+# Ethertype (setelah VLAN) -> L3
+ETHERTYPES = {0x0800: "IPv4", 0x86DD: "IPv6", 0x0806: "ARP"}
+
+_NO_PORT = 65536
+
+
+def _port_lut(ports: dict[int, str]) -> np.ndarray:
+    # 65536 port + satu slot sentinel untuk "tidak ada port"
+    lut = np.full(_NO_PORT + 1, -1, dtype=np.int8)
+    for port, name in ports.items():
+        lut[port] = _L7[name]
+    return lut
+
+
+def _proto_lut() -> np.ndarray:
+    # 256 nomor protokol + sentinel NA; nomor tak dikenal -> "Other"
+    lut = np.full(257, _L4["Other"], dtype=np.int8)
+    lut[256] = -1
+    for number, name in IP_PROTOCOLS.items():
+        lut[number] = _L4[name]
+    return lut
+
+
+TCP_APP_LUT = _port_lut(TCP_PORTS)
+UDP_APP_LUT = _port_lut(UDP_PORTS)
+PROTO_LUT = _proto_lut()
+
+
+def classify_stack(stack: str) -> tuple[int, int, int]:
+    """
+    Satu string stack (`eth:ethertype:ip:tcp:tls` atau `TLS`) -> kode (L3, L4, L7), -1 = tidak diketahui.
+
+    Lapisan terluar yang dikenali yang dipakai (header tunnel luar untuk L3/L4).
+    """
+    l3 = l4 = l7 = -1
+    for token in str(stack).lower().split(":"):
+        if l3 < 0 and token in L3_TOKENS:
+            l3 = _L3[L3_TOKENS[token]]
+        elif l4 < 0 and token in L4_TOKENS:
+            l4 = _L4[L4_TOKENS[token]]
+        elif l7 < 0 and token in L7_TOKENS:
+            l7 = _L7[L7_TOKENS[token]]
+    if l4 == _L4["ICMPv6"] and l3 < 0:
+        l3 = _L3["IPv6"]
+    return l3, l4, l7
+
+
+def stack_luts(categories) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parse setiap string stack unik sekali; hasil diindeks dengan kode kategori per paket.
+
+    Elemen terakhir adalah sentinel -1 sehingga kode -1 (NA) langsung terpetakan ke "tidak diketahui".
+    """
+    triples = np.array([classify_stack(c) for c in categories] + [(-1, -1, -1)], dtype=np.int8).reshape(-1, 3)
+    return triples[:, 0], triples[:, 1], triples[:, 2]
+
+
+def _codes(s: pd.Series) -> tuple[np.ndarray, pd.Index]:
+    cat = s if isinstance(s.dtype, pd.CategoricalDtype) else s.astype("category")
+    return cat.cat.codes.to_numpy(), cat.cat.categories
+
+
+def _proto_numbers(categories: pd.Index) -> np.ndarray:
+    # Nomor protokol unik -> kode L4 (NA/di luar 0..255 -> sentinel)
+    numbers = pd.to_numeric(pd.Series(categories), errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    idx = np.where(np.isnan(numbers) | (numbers < 0) | (numbers > 255), 256, numbers).astype(np.int64)
+    return np.append(PROTO_LUT[idx], -1)
+
+
+def _port_index(df: pd.DataFrame, col: str) -> np.ndarray | None:
+    # Port sebagai indeks tabel: NA / di luar rentang -> slot sentinel
+    if col not in df.columns:
+        return None
+    s = df[col]
+    if not pd.api.types.is_numeric_dtype(s):
+        s = pd.to_numeric(s, errors="coerce")
+    idx = s.to_numpy(dtype=np.int32, na_value=_NO_PORT)
+    if not (s.dtype.kind == "u" and s.dtype.itemsize <= 2):  # uint16 selalu dalam rentang
+        idx[(idx < 0) | (idx > _NO_PORT)] = _NO_PORT
+    return idx
+
+
+def _lookup_ports(lut: np.ndarray, dst: np.ndarray | None, src: np.ndarray | None, n: int) -> np.ndarray:
+    # Port tujuan dulu, lalu port sumber (paket balasan dari server)
+    app = np.full(n, -1, dtype=np.int8)
+    for idx in (dst, src):
+        if idx is not None:
+            app = np.where(app < 0, lut[idx], app)
+    return app
+
+
+def infer_app_from_ports(df: pd.DataFrame) -> np.ndarray:
+    """
+    L7 dari port TCP/UDP terkenal lewat tabel 65536 entri (vektor, tanpa loop per paket).
+    """
+    n = len(df)
+    tcp = _lookup_ports(TCP_APP_LUT, _port_index(df, "tcp_dstport"), _port_index(df, "tcp_srcport"), n)
+    udp = _lookup_ports(UDP_APP_LUT, _port_index(df, "udp_dstport"), _port_index(df, "udp_srcport"), n)
+    return np.where(tcp >= 0, tcp, udp)
+
+
+def _l3_from_ethertype(ethertype: pd.Series) -> np.ndarray:
+    values = ethertype.to_numpy(dtype=np.int32, na_value=-1)
+    l3 = np.full(len(values), -1, dtype=np.int8)
+    for number, name in ETHERTYPES.items():
+        l3[values == number] = _L3[name]
+    return l3
+
+
+def _l3_from_addresses(src: pd.Series) -> np.ndarray:
+    # Alamat di kamus berisi ':' -> IPv6; dicek sekali per alamat unik
+    codes, categories = _codes(src)
+    lut = np.append(np.where([":" in str(a) for a in categories], _L3["IPv6"], _L3["IPv4"]), -1).astype(np.int8)
+    return lut[codes]
+
+
+@timed_stage("classify_protocols")
+def classify_protocols(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Tambahkan kolom categorical `l3`, `l4`, `l7` (in place) dengan nama ternormalisasi.
+
+    Sumber berurutan: `layers` (frame.protocols tshark), `protocol` berupa nama (pyshark/CSV)
+    atau nomor IP, `ethertype`, alamat (IPv4/IPv6), lalu port terkenal untuk L7. String hanya di-parse
+    sekali per nilai unik; pemetaan per paket berupa indeks array.
+    """
+    n = len(df)
+    l3 = np.full(n, -1, dtype=np.int8)
+    l4 = np.full(n, -1, dtype=np.int8)
+    l7 = np.full(n, -1, dtype=np.int8)
+
+    def fill(target, values):
+        return np.where(target < 0, values, target)
+
+    if "layers" in df.columns:
+        codes, categories = _codes(df["layers"])
+        s3, s4, s7 = stack_luts(categories)
+        l3, l4, l7 = fill(l3, s3[codes]), fill(l4, s4[codes]), fill(l7, s7[codes])
+
+    if "protocol" in df.columns:
+        codes, categories = _codes(df["protocol"])
+        if pd.api.types.is_numeric_dtype(categories.dtype):
+            l4 = fill(l4, _proto_numbers(categories)[codes])
+        else:
+            s3, s4, s7 = stack_luts(categories)
+            l3, l4, l7 = fill(l3, s3[codes]), fill(l4, s4[codes]), fill(l7, s7[codes])
+
+    if "ethertype" in df.columns and (l3 < 0).any():
+        l3 = fill(l3, _l3_from_ethertype(df["ethertype"]))
+
+    if "src" in df.columns and (l3 < 0).any():
+        l3 = fill(l3, _l3_from_addresses(df["src"]))
+
+    if (l7 < 0).any():
+        l7 = fill(l7, infer_app_from_ports(df))
+
+    df["l3"] = pd.Categorical.from_codes(l3, categories=L3_NAMES)
+    df["l4"] = pd.Categorical.from_codes(l4, categories=L4_NAMES)
+    df["l7"] = pd.Categorical.from_codes(l7, categories=L7_NAMES)
+    return df
+
+
+def protocol_label(l3, l4, l7) -> str:
+    """
+    Label tampilan satu grup: nama L7 bila dikenal, lalu L4, lalu L3.
+    """
+    for name in (l7, l4, l3):
+        if isinstance(name, str):
+            return name
+    return "Unknown"
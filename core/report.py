@@ -0,0 +1,163 @@
+# core/report.py
+
+import os
+import json
+import logging
+
+import numpy as np
+import pandas as pd
+
+from core.analysis import CaptureAnalysis
+
+logger = logging.getLogger(__name__)
+
+# Tabel per capture yang digabung ke satu Parquet (kolom `capture` menandai asal file)
+PARQUET_TABLES = ("top_sources", "top_destinations", "top_ports", "protocols")
+
+# Baris per tabel di laporan PDF
+PDF_TOP_ROWS = 10
+
+
+def summary_table(analyses: list[CaptureAnalysis]) -> pd.DataFrame:
+    """
+    Satu baris per capture: angka ringkasan, anomali per detektor, outlier PCA, waktu, error.
+    """
+    rows = []
+    for a in analyses:
+        row = {"capture": a.name, **{k: v for k, v in a.summary.items() if k != "approximate"}}
+        row.update({f"anomalies_{d['name']}": d["anomalies"] for d in a.detectors})
+        if a.pca is not None:
+            row["pca_outliers"] = a.pca["outliers"]
+        row.update({"seconds": round(a.seconds, 3), "error": a.error or ""})
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def write_json(analyses: list[CaptureAnalysis], out_dir: str) -> list[str]:
+    """
+    `<capture>.json` per capture plus `summary.json` berisi semua capture.
+    """
+    paths = []
+    for a in analyses:
+        path = os.path.join(out_dir, f"{a.name}.json")
+        with open(path, "w") as f:
+            json.dump(a.to_dict(), f, indent=2, default=str)
+        paths.append(path)
+    summary_path = os.path.join(out_dir, "summary.json")
+    with open(summary_path, "w") as f:
+        json.dump([a.to_dict() for a in analyses], f, indent=2, default=str)
+    return paths + [summary_path]
+
+
+def write_parquet(analyses: list[CaptureAnalysis], out_dir: str) -> list[str]:
+    """
+    `summary.parquet` (satu baris per capture) dan satu Parquet per tabel top-N.
+    """
+    paths = [os.path.join(out_dir, "summary.parquet")]
+    summary_table(analyses).to_parquet(paths[0], index=False)
+    for key in PARQUET_TABLES:
+        frames = [a.tables[key].assign(capture=a.name) for a in analyses
+                  if key in a.tables and not a.tables[key].empty]
+        if not frames:
+            continue
+        table = pd.concat(frames, ignore_index=True)
+        # kategori beda per file -> simpan sebagai teks
+        for col in table.columns:
+            if isinstance(table[col].dtype, pd.CategoricalDtype):
+                table[col] = table[col].astype(str)
+        path = os.path.join(out_dir, f"{key}.parquet")
+        table.to_parquet(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def _latin1(text) -> str:
+    # fpdf 1.7 hanya mendukung font inti latin-1 (emoji & karakter lain diganti)
+    return str(text).encode("latin-1", "replace").decode("latin-1")
+
+
+def _pdf_table(pdf, table: pd.DataFrame, widths: list[float]):
+    pdf.set_font("Arial", "B", 9)
+    for col, width in zip(table.columns, widths):
+        pdf.cell(width, 6, _latin1(col), border=1)
+    pdf.ln()
+    pdf.set_font("Arial", "", 9)
+    for row in table.itertuples(index=False):
+        for value, width in zip(row, widths):
+            text = f"{value:,}" if isinstance(value, (int, np.integer)) else value
+            pdf.cell(width, 6, _latin1(text)[:40], border=1)
+        pdf.ln()
+    pdf.ln(3)
+
+
+def write_pdf_report(analyses: list[CaptureAnalysis], path: str, title: str = "Network Intrusion Report") -> str:
+    """
+    Laporan PDF: tabel ringkasan semua capture, lalu satu halaman per capture.
+    """
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.set_auto_page_break(True, margin=15)
+    pdf.add_page()
+    pdf.set_font("Arial", "B", 16)
+    pdf.cell(0, 10, _latin1(title), ln=1)
+    pdf.set_font("Arial", "", 10)
+    pdf.cell(0, 6, f"{len(analyses)} capture, {sum(a.summary.get('total_packets', 0) for a in analyses):,} paket", ln=1)
+    pdf.ln(4)
+    overview = pd.DataFrame({
+        "Capture": [a.name for a in analyses],
+        "Paket": [a.summary.get("total_packets", 0) for a in analyses],
+        "IP sumber": [a.summary.get("unique_sources", 0) for a in analyses],
+        "Paket besar": [a.summary.get("large_packets", 0) for a in analyses],
+        "Anomali": [sum(d["anomalies"] for d in a.detectors) for a in analyses],
+        "Status": [a.error or "OK" for a in analyses],
+    })
+    _pdf_table(pdf, overview, [60, 25, 25, 25, 25, 30])
+
+    for a in analyses:
+        pdf.add_page()
+        pdf.set_font("Arial", "B", 14)
+        pdf.cell(0, 10, _latin1(a.name), ln=1)
+        pdf.set_font("Arial", "", 10)
+        if a.error:
+            pdf.multi_cell(0, 6, _latin1(f"Gagal dianalisis: {a.error}"))
+            continue
+        s = a.summary
+        lines = [
+            f"Total paket: {s['total_packets']:,} ({s['total_bytes'] / 1e6:,.1f} MB)",
+            f"IP sumber unik: {s['unique_sources']:,} | IP tujuan unik: {s['unique_destinations']:,} | "
+            f"Protokol: {s['unique_protocols']}",
+            f"Paket > {s['large_packet_threshold']} byte: {s['large_packets']:,}",
+        ]
+        if "start" in s:
+            lines.append(f"Rentang waktu: {s['start']} - {s['end']}")
+        if a.pca is not None:
+            lines.append(f"PCA: {a.pca['outliers']:,} dari {a.pca['points']:,} paket sampel dengan PC1 > persentil 95%")
+        for line in lines:
+            pdf.cell(0, 6, _latin1(line), ln=1)
+        pdf.ln(3)
+
+        if a.detectors:
+            pdf.set_font("Arial", "B", 11)
+            pdf.cell(0, 7, "Detektor", ln=1)
+            detectors = pd.DataFrame({
+                "Detektor": [d["label"] for d in a.detectors],
+                "Input": [d["target"] for d in a.detectors],
+                "Baris": [d["rows"] for d in a.detectors],
+                "Anomali": [d["anomalies"] for d in a.detectors],
+            })
+            _pdf_table(pdf, detectors, [90, 25, 35, 30])
+
+        for key, heading, widths in (("top_sources", "Top Source IPs", [60, 30]),
+                                     ("top_ports", "Top Destination Ports", [60, 30]),
+                                     ("protocols", "Protocol Distribution", [60, 30])):
+            table = a.tables.get(key)
+            if table is None or table.empty:
+                continue
+            pdf.set_font("Arial", "B", 11)
+            pdf.cell(0, 7, heading, ln=1)
+            _pdf_table(pdf, table.head(PDF_TOP_ROWS).astype({table.columns[0]: str}), widths)
+
+    pdf.output(path, "F")
+    logger.info(f"✅ Laporan PDF: {path}")
+    return path
@@ -0,0 +1,319 @@
+# core/sketches.py
+
+import math
+import logging
+import numpy as np
+import pandas as pd
+from typing import Iterable
+
+from core.aggregates import destination_ports
+from core.auto_parser import parse_pcap_iter, DEFAULT_CHUNK_ROWS
+
+logger = logging.getLogger(__name__)
+
+# Default: ~0.8% galat relatif HLL, 1000 counter Space-Saving, Count-Min eps=1e-4 (peluang gagal 1%)
+DEFAULT_PRECISION = 14
+DEFAULT_CAPACITY = 1_000
+DEFAULT_EPSILON = 1e-4
+DEFAULT_DELTA = 0.01
+
+_LOW32 = np.uint64(0xFFFFFFFF)
+
+
+def hash_values(values) -> np.ndarray:
+    """
+    Hash 64-bit deterministik (sama antar proses & potongan) untuk IP/port.
+    """
+    return pd.util.hash_array(np.asarray(values), categorize=False)
+
+
+def distinct_counts(s: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Nilai unik & jumlahnya dalam satu potongan (O(potongan), bukan O(kamus categorical)).
+    """
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        codes = s.cat.codes.to_numpy()
+        codes = codes[codes >= 0]
+        local, uniques = pd.factorize(codes)
+        return s.cat.categories.to_numpy(dtype=object)[uniques], np.bincount(local)
+    s = s.dropna()
+    local, uniques = pd.factorize(s)
+    return np.asarray(uniques), np.bincount(local, minlength=len(uniques))
+
+
+def _bit_length(w: np.ndarray) -> np.ndarray:
+    # bit_length uint64 yang eksak: frexp pada dua paruh 32-bit (tanpa pembulatan float)
+    hi = np.frexp((w >> np.uint64(32)).astype(np.float64))[1]
+    lo = np.frexp((w & _LOW32).astype(np.float64))[1]
+    return np.where(hi > 0, hi + 32, lo)
+
+
+class HyperLogLog:
+    """
+    Jumlah nilai unik dengan 2^precision register (memori tetap, galat relatif ~1.04/sqrt(m)).
+    """
+
+    def __init__(self, precision: int = DEFAULT_PRECISION):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision HyperLogLog harus 4..18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def update_hashes(self, hashes: np.ndarray) -> "HyperLogLog":
+        if len(hashes) == 0:
+            return self
+        p = np.uint64(self.precision)
+        index = (hashes >> (np.uint64(64) - p)).astype(np.intp)
+        rank = np.minimum(65 - _bit_length(hashes << p), 65 - self.precision).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def update(self, values) -> "HyperLogLog":
+        return self.update_hashes(hash_values(values))
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.precision != self.precision:
+            raise ValueError("HyperLogLog dengan precision berbeda tidak bisa digabung")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.ldexp(1.0, -self.registers.astype(np.int64)).sum()
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # koreksi rentang kecil (linear counting)
+            return int(round(m * math.log(m / zeros)))
+        return int(round(raw))
+
+
+class CountMinSketch:
+    """
+    Frekuensi per nilai: estimasi >= nilai sebenarnya, lebih paling banyak epsilon*N dengan peluang 1-delta.
+    """
+
+    def __init__(self, epsilon: float = DEFAULT_EPSILON, delta: float = DEFAULT_DELTA):
+        self.epsilon, self.delta = epsilon, delta
+        self.width = int(math.ceil(math.e / epsilon))
+        self.depth = int(math.ceil(math.log(1 / delta)))
+        self.table = np.zeros((self.depth, self.width), dtype=np.int64)
+        self.total = 0
+
+    @property
+    def error_bound(self) -> float:
+        return self.epsilon * self.total
+
+    def _columns(self, hashes: np.ndarray):
+        # Kirsch-Mitzenmacher: baris ke-i memakai h1 + i*h2
+        h1 = hashes & _LOW32
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        width = np.uint64(self.width)
+        for i in range(self.depth):
+            yield i, ((h1 + np.uint64(i) * h2) % width).astype(np.intp)
+
+    def update_hashes(self, hashes: np.ndarray, counts: np.ndarray) -> "CountMinSketch":
+        for i, columns in self._columns(hashes):
+            self.table[i] += np.bincount(columns, weights=counts, minlength=self.width).astype(np.int64)
+        self.total += int(np.sum(counts))
+        return self
+
+    def estimate_hashes(self, hashes: np.ndarray) -> np.ndarray:
+        estimate = np.full(len(hashes), np.iinfo(np.int64).max, dtype=np.int64)
+        for i, columns in self._columns(hashes):
+            np.minimum(estimate, self.table[i, columns], out=estimate)
+        return estimate
+
+    def merge(self, other: "CountMinSketch") -> "CountMinSketch":
+        if self.table.shape != other.table.shape:
+            raise ValueError("Count-Min dengan dimensi berbeda tidak bisa digabung")
+        self.table += other.table
+        self.total += other.total
+        return self
+
+
+class SpaceSaving:
+    """
+    Ringkasan heavy hitter dengan maksimal `capacity` counter (mergeable).
+
+    `counts` adalah batas atas, `counts - errors` batas bawah; nilai yang tidak tercatat
+    paling banyak muncul `floor` kali.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype="int64")
+        self.errors = pd.Series(dtype="int64")
+        self.floor = 0
+
+    def _combine(self, counts: pd.Series, errors: pd.Series, floor: int) -> "SpaceSaving":
+        keys = self.counts.index.union(counts.index, sort=False)
+        merged = (self.counts.reindex(keys, fill_value=self.floor)
+                  + counts.reindex(keys, fill_value=floor))
+        merged_errors = (self.errors.reindex(keys, fill_value=self.floor)
+                         + errors.reindex(keys, fill_value=floor))
+        floor = self.floor + floor
+        if len(merged) > self.capacity:
+            merged = merged.sort_values(ascending=False, kind="stable")
+            floor = max(floor, int(merged.iloc[self.capacity]))
+            merged = merged.iloc[:self.capacity]
+            merged_errors = merged_errors.reindex(merged.index)
+        self.counts, self.errors, self.floor = merged, merged_errors, floor
+        return self
+
+    def update(self, keys: np.ndarray, counts: np.ndarray) -> "SpaceSaving":
+        counts = pd.Series(np.asarray(counts, dtype=np.int64), index=pd.Index(keys))
+        return self._combine(counts, pd.Series(0, index=counts.index, dtype="int64"), 0)
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        return self._combine(other.counts, other.errors, other.floor)
+
+
+class HeavyHitters:
+    """
+    Top-K: kandidat dari Space-Saving, batas atas dipersempit dengan Count-Min.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, epsilon: float = DEFAULT_EPSILON,
+                 delta: float = DEFAULT_DELTA):
+        self.summary = SpaceSaving(capacity)
+        self.sketch = CountMinSketch(epsilon, delta)
+
+    def update(self, keys: np.ndarray, counts: np.ndarray) -> "HeavyHitters":
+        if len(keys):
+            self.summary.update(keys, counts)
+            self.sketch.update_hashes(hash_values(keys), counts)
+        return self
+
+    def merge(self, other: "HeavyHitters") -> "HeavyHitters":
+        self.summary.merge(other.summary)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def top(self, n: int = 10) -> pd.DataFrame:
+        """
+        `packets` = estimasi (batas atas), `lower_bound` = jumlah minimum yang dijamin.
+        """
+        summary = self.summary
+        if summary.counts.empty:
+            return pd.DataFrame({"packets": pd.Series(dtype="int64"), "lower_bound": pd.Series(dtype="int64")})
+        upper = np.minimum(summary.counts.to_numpy(), self.sketch.estimate_hashes(hash_values(summary.counts.index)))
+        out = pd.DataFrame({
+            "packets": upper,
+            "lower_bound": np.maximum(summary.counts.to_numpy() - summary.errors.to_numpy(), 0),
+        }, index=summary.counts.index)
+        return out.sort_values("packets", ascending=False, kind="stable").head(n)
+
+
+class TrafficSketches:
+    """
+    Pengganti memori-konstan untuk top-K dan hitungan unik di summary cube.
+
+    Bisa di-update per potongan dan digabung antar file/worker (`merge`); ukurannya tidak
+    bergantung pada jumlah host unik.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, epsilon: float = DEFAULT_EPSILON,
+                 delta: float = DEFAULT_DELTA, precision: int = DEFAULT_PRECISION):
+        self.params = {"capacity": capacity, "epsilon": epsilon, "delta": delta, "precision": precision}
+        self.total_packets = 0
+        self.top_src = HeavyHitters(capacity, epsilon, delta)
+        self.top_dst = HeavyHitters(capacity, epsilon, delta)
+        self.top_port = HeavyHitters(capacity, epsilon, delta)
+        self.distinct_src = HyperLogLog(precision)
+        self.distinct_dst = HyperLogLog(precision)
+
+    def update(self, chunk: pd.DataFrame) -> "TrafficSketches":
+        self.total_packets += len(chunk)
+        for column, heavy, distinct in (('src', self.top_src, self.distinct_src),
+                                        ('dst', self.top_dst, self.distinct_dst)):
+            if column in chunk.columns:
+                keys, counts = distinct_counts(chunk[column])
+                keys = keys.astype(str).astype(object)
+                heavy.update(keys, counts)
+                distinct.update(keys)
+        ports = destination_ports(chunk)
+        if ports is not None:
+            keys, counts = distinct_counts(ports)
+            self.top_port.update(keys.astype(np.int64), counts)
+        return self
+
+    def merge(self, other: "TrafficSketches") -> "TrafficSketches":
+        if other.params != self.params:
+            raise ValueError("Sketch dengan parameter berbeda tidak bisa digabung")
+        self.total_packets += other.total_packets
+        self.top_src.merge(other.top_src)
+        self.top_dst.merge(other.top_dst)
+        self.top_port.merge(other.top_port)
+        self.distinct_src.merge(other.distinct_src)
+        self.distinct_dst.merge(other.distinct_dst)
+        return self
+
+    # === Query dengan API yang sama seperti PacketAggregates ===
+
+    def unique_sources(self) -> int:
+        return self.distinct_src.estimate()
+
+    def unique_destinations(self) -> int:
+        return self.distinct_dst.estimate()
+
+    def top_talkers(self, n: int = 10) -> pd.Series:
+        return self.top_src.top(n)["packets"].rename_axis("src")
+
+    def top_destinations(self, n: int = 10) -> pd.Series:
+        return self.top_dst.top(n)["packets"].rename_axis("dst")
+
+    def top_ports(self, n: int = 10) -> pd.Series:
+        return self.top_port.top(n)["packets"].rename_axis("port")
+
+    def error_bounds(self) -> dict:
+        """
+        Batas galat untuk ditampilkan di UI.
+        """
+        return {
+            "distinct_relative_error": self.distinct_src.relative_error,
+            "count_overestimate": self.top_src.sketch.error_bound,
+            "count_confidence": 1 - self.params["delta"],
+            "src_floor": self.top_src.summary.floor,
+            "port_floor": self.top_port.summary.floor,
+        }
+
+    def memory_bytes(self) -> int:
+        total = self.distinct_src.registers.nbytes + self.distinct_dst.registers.nbytes
+        for heavy in (self.top_src, self.top_dst, self.top_port):
+            total += heavy.sketch.table.nbytes
+            total += int(heavy.summary.counts.memory_usage(deep=True) + heavy.summary.errors.memory_usage(deep=True))
+        return total
+
+
+def sketch_key(params: dict | None) -> str:
+    """
+    Akhiran key dataset untuk mode sketch (cube tanpa grup per host), kosong untuk mode eksak.
+    """
+    if not params:
+        return ""
+    return ":sketch:" + ",".join(f"{k}={v}" for k, v in sorted(params.items()))
+
+
+def fold_sketches(chunks: Iterable[pd.DataFrame], **params) -> TrafficSketches:
+    sketches = TrafficSketches(**params)
+    for chunk in chunks:
+        sketches.update(chunk)
+    return sketches
+
+
+def build_sketches(df: pd.DataFrame, chunk_rows: int = DEFAULT_CHUNK_ROWS, **params) -> TrafficSketches:
+    return fold_sketches((df.iloc[i:i + chunk_rows] for i in range(0, len(df), chunk_rows)), **params)
+
+
+def sketch_pcap(filepath: str, chunk_rows: int = DEFAULT_CHUNK_ROWS, **params) -> TrafficSketches:
+    """
+    Sketch langsung dari file tanpa menyimpan tabel paket di memori.
+    """
+    sketches = fold_sketches(parse_pcap_iter(filepath, chunk_rows=chunk_rows), **params)
+    logger.info(f"✅ Sketch selesai. Paket: {sketches.total_packets:,}")
+    return sketches
@@ -1,34 +1,51 @@
+# ✅ NID_ Milzon-QG-Ramin, Aug 2025
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 
-def show_analysis_summary():
+from core.aggregates import PacketAggregates, build_summary_cube
+from core.sketches import TrafficSketches
+from core.downsample import payload_estimate, payload_caption
+from core.analysis import summary_metrics, top_sources, packet_length_timeline
+from core.metrics import timed_stage
+from pages.Summary import sketch_caption
+
+@timed_stage("page.analysis_summary")
+def show_analysis_summary(df: pd.DataFrame, cube: PacketAggregates | None = None,
+                          sketches: TrafficSketches | None = None):
     st.header("📋 Analysis Summary")
 
-    if 'df' not in st.session_state or st.session_state['df'].empty:
+    if df.empty:
         st.warning("⚠️ Data belum tersedia.")
         st.stop()
 
-    df = st.session_state['df']
+    if cube is None:
+        cube = build_summary_cube(df)
+    # Mode sketch: IP unik & top-K diestimasi dengan memori tetap
+    stats = summary_metrics(df, cube, sketches)
+    approx = "≈" if stats["approximate"] else ""
 
     st.markdown(f"""
     ### 🔍 Ringkasan:
-    - Total paket: **{len(df)}**
-    - IP sumber unik: **{df['src'].nunique()}**
-    - IP tujuan unik: **{df['dst'].nunique()}**
-    - Protokol terdeteksi: **{df['protocol'].nunique() if 'protocol' in df.columns else 0}**
+    - Total paket: **{stats['total_packets']}**
+    - IP sumber unik: **{approx}{stats['unique_sources']}**
+    - IP tujuan unik: **{approx}{stats['unique_destinations']}**
+    - Protokol terdeteksi: **{stats['unique_protocols']}**
     """)
 
     if 'length' in df.columns and 'time' in df.columns:
         st.markdown("### 📦 Distribusi Ukuran Paket (dengan smoothing)")
-        df_sorted = df.sort_values(by='time')
-        df_sorted['length_smooth'] = df_sorted['length'].rolling(window=10, min_periods=1).mean()
-        fig = px.line(df_sorted, x='time', y='length_smooth', title='Smoothed Packet Length Over Time')
+        # Rata-rata ukuran paket per bin (resolusi adaptif), rolling atas data yang sudah di-bin,
+        # lalu LTTB agar titik yang dikirim ke browser terbatas
+        per_bin, freq = packet_length_timeline(df, cube)
+        fig = px.line(per_bin, x='time', y='length_smooth', title='Smoothed Packet Length Over Time')
         st.plotly_chart(fig, use_container_width=True)
+        st.caption(payload_caption(payload_estimate(per_bin[['time', 'length_smooth']]), freq))
 
     st.subheader("📊 Top IP Pengirim")
-    top_src = df['src'].value_counts().head(10).reset_index()
-    top_src.columns = ['IP Sumber', 'Jumlah Paket']
+    if sketches is not None:
+        st.caption(sketch_caption(sketches))
+    top_src = top_sources(cube, 10, sketches).set_axis(['IP Sumber', 'Jumlah Paket'], axis=1)
     fig2 = px.bar(top_src, x='Jumlah Paket', y='IP Sumber', orientation='h', color='Jumlah Paket', color_continuous_scale='Reds')
     st.plotly_chart(fig2, use_container_width=True)
 
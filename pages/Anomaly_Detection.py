@@ -2,40 +2,88 @@ import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 
-def show_anomaly_detection(df: pd.DataFrame):
+from core.aggregates import PacketAggregates, build_summary_cube
+from core.analysis import large_packet_report, detector_table, JUMBO_BYTES
+from core.detectors import DETECTORS, run_detector
+from core.flows import build_flows
+from core.metrics import timed_stage
+
+
+# Skor detektor dihitung sekali per dataset & detektor, bukan setiap pindah halaman
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _cached_detection(dataset_key: str, name: str, _df: pd.DataFrame, _flows: pd.DataFrame | None):
+    return run_detector(name, _df, _flows)
+
+
+# Flow untuk view terfilter / jendela live dibangun sekali per key, bukan setiap rerun
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _cached_flows(dataset_key: str, _df: pd.DataFrame) -> pd.DataFrame:
+    return build_flows(_df)
+
+
+def show_detectors(df: pd.DataFrame, flows: pd.DataFrame | None = None, dataset_key: str | None = None):
+    st.markdown("### 🧪 Detektor Statistik")
+    names = st.multiselect("Detektor:", list(DETECTORS), default=list(DETECTORS),
+                           format_func=lambda n: DETECTORS[n].label)
+    if not names:
+        return
+    dataset_key = dataset_key or f"{id(df)}:{len(df)}"
+    if flows is None and any(DETECTORS[n].target == "flows" for n in names):
+        flows = _cached_flows(dataset_key, df)
+
+    results = []
+    for name in names:
+        with st.spinner(f"Menjalankan {DETECTORS[name].label}..."):
+            results.append(_cached_detection(dataset_key, name, df, flows))
+
+    st.dataframe(detector_table(results), use_container_width=True)
+
+    for r in results:
+        if r.anomalies:
+            with st.expander(f"🔎 {r.label}: {r.anomalies:,} anomali (Top 20)"):
+                st.dataframe(r.top(20), use_container_width=True)
+
+
+@timed_stage("page.anomaly_detection")
+def show_anomaly_detection(df: pd.DataFrame, cube: PacketAggregates | None = None,
+                           flows: pd.DataFrame | None = None, dataset_key: str | None = None):
     st.subheader("🚨 Anomaly Detection")
 
     if df.empty:
         st.warning("Data belum tersedia. Harap upload file PCAP terlebih dahulu.")
         return
 
-    threshold = 1400
-    anomalies = df[df['length'] > threshold]
+    if cube is None:
+        cube = build_summary_cube(df)
+
+    report = large_packet_report(df, cube)
+    threshold = report["threshold"]
 
     st.markdown(f"### 🔏 Threshold: Panjang paket > {threshold} bytes")
-    st.markdown(f"Jumlah paket anomali: **{len(anomalies)}**")
+    st.markdown(f"Jumlah paket anomali: **{report['count']}**")
 
-    if len(anomalies) > 0:
+    if report["count"] > 0:
         st.success("✅ Anomali terdeteksi dalam data ini.")
     else:
         st.info("🔍 Tidak ditemukan anomali berdasarkan panjang paket.")
 
-    # Tampilkan tabel anomali (Top 20)
-    if not anomalies.empty:
+    # Tampilkan tabel anomali (Top 20) dari posisi baris yang dicatat cube saat ingest
+    if report["count"] > 0:
         st.markdown("### 📋 Daftar Paket Anomali (Top 20)")
-        st.dataframe(anomalies.head(20))
+        st.dataframe(report["rows"])
 
-    # Distribusi Panjang Paket (Histogram)
+    # Distribusi Panjang Paket (Histogram, bin tetap dari cube)
     if 'length' in df.columns:
         st.markdown("### 📊 Distribusi Panjang Paket")
         try:
-            length_clean = pd.to_numeric(df['length'], errors='coerce').dropna()
-
-            if length_clean.empty:
+            regular, jumbo = report["histogram"], report["jumbo"]
+            if regular['count'].sum() + jumbo == 0:
                 st.warning("⚠️ Tidak ada data numerik yang valid pada kolom 'length'.")
             else:
+                # bin jumbo (> 1600 byte) ditampilkan sebagai angka, bukan batang selebar 7 KB
                 fig, ax = plt.subplots(figsize=(10, 5))
-                ax.hist(length_clean, bins=50, alpha=0.7, color='skyblue', edgecolor='black')
+                ax.stairs(regular['count'], list(regular['bin_start']) + [regular['bin_end'].iloc[-1]],
+                          fill=True, alpha=0.7, color='skyblue', edgecolor='black')
                 ax.axvline(x=threshold, color='red', linestyle='--', linewidth=2, label=f'Threshold {threshold} bytes')
                 ax.set_title("Distribusi Panjang Paket")
                 ax.set_xlabel("Panjang Paket (bytes)")
@@ -44,10 +92,14 @@ def show_anomaly_detection(df: pd.DataFrame):
                 ax.grid(True, linestyle='--', alpha=0.5)
                 st.pyplot(fig)
                 plt.close(fig)
+                if jumbo:
+                    st.caption(f"Paket > {JUMBO_BYTES} byte (jumbo): {jumbo:,}")
 
         except Exception as e:
             st.error(f"❌ Gagal membuat grafik distribusi panjang paket: {e}")
 
+    show_detectors(df, flows, dataset_key)
+
     # Insight & interpretasi
     st.markdown("### 🧠 Insight:")
     st.markdown("- Panjang paket besar (>1400 byte) dapat mengindikasikan file transfer mencurigakan.")
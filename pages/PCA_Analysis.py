@@ -1,56 +1,85 @@
 # pca_analysis.py
 import streamlit as st
 import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
-from sklearn.decomposition import PCA
-import seaborn as sns
 
-def show_pca_visualization(df: pd.DataFrame):
-    st.subheader("📉 PCA Analysis")
+from core.pca import fit_packet_pca, stratified_sample, PCA_FEATURES, PLOT_SAMPLE_ROWS
+from core.metrics import timed_stage
+from core.analysis import pca_outliers
+
+
+# Model & proyeksi di-cache per dataset (kunci = digest isi file), bukan dihitung ulang tiap rerun
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _cached_pca(dataset_key: str, method: str, _df: pd.DataFrame):
+    return fit_packet_pca(_df, method=method)
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _cached_projection(dataset_key: str, method: str, _df: pd.DataFrame) -> np.ndarray:
+    return _cached_pca(dataset_key, method, _df).transform(_df)
+
 
-    # Pilih kolom numerik untuk PCA
-    numerical_cols = df.select_dtypes(include=['int64', 'float64']).columns.tolist()
-    if 'length' not in numerical_cols:
-        numerical_cols.append('length')
+def _protocol_labels(df: pd.DataFrame) -> pd.Series:
+    if 'protocol' in df.columns:
+        return df['protocol']
+    return pd.Series(0, index=df.index)
 
-    df_clean = df[numerical_cols].fillna(0)
-    if df_clean.shape[1] < 2:
-        st.warning("❌ PCA membutuhkan minimal 2 fitur numerik.")
+
+@timed_stage("page.pca")
+def show_pca_visualization(df: pd.DataFrame, dataset_key: str | None = None):
+    st.subheader("📉 PCA Analysis")
+
+    if len(df) < 2:
+        st.warning("❌ PCA membutuhkan minimal 2 paket.")
         return
 
-    # Lakukan PCA
-    pca = PCA(n_components=2)
-    components = pca.fit_transform(df_clean)
-    df_pca = pd.DataFrame(data=components, columns=['PC1', 'PC2'])
+    # Tanpa digest file (mis. data dari sesi lama), pakai identitas objek DataFrame
+    dataset_key = dataset_key or f"{id(df)}:{len(df)}"
+    method = st.radio("Metode PCA:", ("sample", "incremental"), horizontal=True,
+                      format_func=lambda m: "Randomized (sampel terstratifikasi)" if m == "sample" else "Incremental (semua baris)")
 
-    # Tambahkan kolom protocol sebagai warna
-    if 'protocol' in df:
-        df_pca['protocol'] = pd.Series(df['protocol']).astype('category').cat.codes
+    with st.spinner("Menghitung PCA..."):
+        result = _cached_pca(dataset_key, method, df)
+    ratio = result.explained_variance_ratio
+    st.caption(f"Fitur: {', '.join(PCA_FEATURES)} | Variansi terjelaskan: PC1 {ratio[0]:.1%}, PC2 {ratio[1]:.1%}")
+
+    full = st.checkbox(f"Proyeksikan semua {len(df):,} paket", value=False)
+    if full:
+        with st.spinner("Memproyeksikan semua paket..."):
+            components = _cached_projection(dataset_key, method, df)
+        rows = np.arange(len(df))
     else:
-        df_pca['protocol'] = 0
+        rows = result.sample_rows
+        components = result.transform(df.iloc[rows])
+
+    labels = _protocol_labels(df)
+    view = st.radio("Tampilan:", ("Hexbin (densitas)", "Scatter (sampel)"), horizontal=True)
 
-    # Plot hasil PCA
+    # Plot hasil PCA: ukuran gambar tidak bergantung pada jumlah paket
     fig, ax = plt.subplots()
-    scatter = ax.scatter(
-        df_pca['PC1'],
-        df_pca['PC2'],
-        c=df_pca['protocol'],
-        cmap='viridis',
-        alpha=0.7
-    )
-    plt.colorbar(scatter, ax=ax, label='Protocol')
+    if view.startswith("Hexbin"):
+        hb = ax.hexbin(components[:, 0], components[:, 1], gridsize=60, bins='log', cmap='viridis', mincnt=1)
+        plt.colorbar(hb, ax=ax, label='Jumlah paket (log)')
+    else:
+        picked = stratified_sample(labels.iloc[rows], PLOT_SAMPLE_ROWS)
+        codes = pd.Series(labels.iloc[rows].iloc[picked]).astype('category').cat.codes
+        scatter = ax.scatter(components[picked, 0], components[picked, 1], c=codes, cmap='viridis', alpha=0.7, s=8)
+        plt.colorbar(scatter, ax=ax, label='Protocol')
     plt.xlabel("PC1")
     plt.ylabel("PC2")
     plt.title("Distribusi Paket Berdasarkan PCA")
     st.pyplot(fig)
+    plt.close(fig)
+    st.caption(f"Titik dipakai: {len(components):,} dari {len(df):,} paket")
 
     # Insight outlier berdasarkan PC1
-    threshold_pc1 = df_pca['PC1'].quantile(0.95)
-    outliers = df_pca[df_pca['PC1'] > threshold_pc1]
+    outliers = pca_outliers(components)["outliers"]
+    scope = "paket" if full else "paket sampel"
 
     st.markdown("---")
     st.markdown("### 📌 Insight")
-    if not outliers.empty:
-        st.warning(f"🚨 Terdapat {len(outliers)} paket dengan PC1 > percentile 95% → potensi outlier atau anomali.")
+    if outliers:
+        st.warning(f"🚨 Terdapat {outliers:,} {scope} dengan PC1 > percentile 95% → potensi outlier atau anomali.")
     else:
         st.success("✅ Tidak ada outlier yang signifikan terdeteksi pada PC1.")
@@ -2,42 +2,61 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 
-def show_summary(df: pd.DataFrame):
+from core.aggregates import PacketAggregates, build_summary_cube
+from core.sketches import TrafficSketches
+from core.metrics import timed_stage
+from core.downsample import payload_estimate, payload_caption
+from core.analysis import summary_metrics, top_sources, top_ports, protocol_distribution, traffic_timeline
+
+
+def sketch_caption(sketches: TrafficSketches) -> str:
+    # Batas galat sketch untuk ditampilkan di bawah angka/grafik
+    bounds = sketches.error_bounds()
+    return (f"🧮 Sketch ({sketches.memory_bytes() / 1e6:,.1f} MB): IP unik ±{bounds['distinct_relative_error']:.1%} "
+            f"(HyperLogLog), jumlah paket top-K lebih paling banyak {bounds['count_overestimate']:,.0f} "
+            f"dengan peluang {bounds['count_confidence']:.0%} (Count-Min), IP di luar daftar ≤ {bounds['src_floor']:,} paket.")
+
+
+@timed_stage("page.summary")
+def show_summary(df: pd.DataFrame, cube: PacketAggregates | None = None, sketches: TrafficSketches | None = None):
     st.header("📈 Network Summary")
 
     if df.empty:
         st.warning("⚠️ Data belum tersedia.")
         return
 
+    # Semua angka & grafik diambil dari summary cube (O(grup), bukan O(paket))
+    if cube is None:
+        cube = build_summary_cube(df)
+
+    # Mode sketch: top-K & IP unik dari sketch (memori tetap), sisanya tetap dari cube
+    stats = summary_metrics(df, cube, sketches)
+    approx = "≈" if stats["approximate"] else ""
+
     col1, col2, col3, col4 = st.columns(4)
-    col1.metric("📦 Total Packets", f"{len(df):,}")
-    col2.metric("🔁 Unique Source IPs", df['src'].nunique())
-    col3.metric("🎯 Unique Destination IPs", df['dst'].nunique())
-    col4.metric("📡 Unique Protocols", df['protocol'].nunique() if 'protocol' in df.columns else "-")
+    col1.metric("📦 Total Packets", f"{stats['total_packets']:,}")
+    col2.metric("🔁 Unique Source IPs", f"{approx}{stats['unique_sources']:,}")
+    col3.metric("🎯 Unique Destination IPs", f"{approx}{stats['unique_destinations']:,}")
+    col4.metric("📡 Unique Protocols", stats["unique_protocols"] if 'protocol' in df.columns else "-")
 
     st.subheader("📍 Top Source IPs")
-    top_src = df['src'].value_counts().head(10).reset_index()
-    top_src.columns = ['Source IP', 'Jumlah Paket']
+    if sketches is not None:
+        st.caption(sketch_caption(sketches))
+    top_src = top_sources(cube, 10, sketches).set_axis(['Source IP', 'Jumlah Paket'], axis=1)
     fig_src = px.bar(top_src, x='Jumlah Paket', y='Source IP', orientation='h', color='Jumlah Paket', color_continuous_scale='Blues')
     st.plotly_chart(fig_src, use_container_width=True)
 
     st.subheader("🎯 Top Destination Ports")
-    if 'tcp_dstport' in df.columns or 'udp_dstport' in df.columns:
-        port_series = pd.concat([
-            df['tcp_dstport'].dropna().astype(int) if 'tcp_dstport' in df else pd.Series(dtype=int),
-            df['udp_dstport'].dropna().astype(int) if 'udp_dstport' in df else pd.Series(dtype=int)
-        ])
-        top_ports = port_series.value_counts().head(10).reset_index()
-        top_ports.columns = ['Port Tujuan', 'Jumlah Paket']
-        fig_ports = px.bar(top_ports, x='Jumlah Paket', y='Port Tujuan', orientation='h', color='Jumlah Paket', color_continuous_scale='Greens')
+    if cube.by_port is not None:
+        ports = top_ports(cube, 10, sketches).set_axis(['Port Tujuan', 'Jumlah Paket'], axis=1)
+        fig_ports = px.bar(ports, x='Jumlah Paket', y='Port Tujuan', orientation='h', color='Jumlah Paket', color_continuous_scale='Greens')
         st.plotly_chart(fig_ports, use_container_width=True)
     else:
         st.info("Data port tidak tersedia.")
 
     st.subheader("📡 Protocol Distribution")
     if 'protocol' in df.columns:
-        proto_counts = df['protocol'].value_counts().reset_index()
-        proto_counts.columns = ['Protokol', 'Jumlah Paket']
+        proto_counts = protocol_distribution(cube).set_axis(['Protokol', 'Jumlah Paket'], axis=1)
         fig_proto = px.bar(proto_counts, x='Jumlah Paket', y='Protokol', orientation='h', color='Jumlah Paket', color_continuous_scale='Oranges')
         st.plotly_chart(fig_proto, use_container_width=True)
     else:
@@ -45,13 +64,12 @@ def show_summary(df: pd.DataFrame):
 
     st.subheader("⏱️ Traffic Volume per Minute")
     if 'time' in df.columns:
-        df_time = df.copy()
-        df_time['time'] = pd.to_datetime(df_time['time'], errors='coerce')
-        df_time = df_time.dropna(subset=['time'])
-        df_time['minute'] = df_time['time'].dt.floor('min')
-        traffic_per_min = df_time.groupby('minute').size().reset_index(name='Packet Count')
-        fig_traffic = px.line(traffic_per_min, x='minute', y='Packet Count', markers=True)
+        # Resolusi adaptif lalu min/max per bucket agar lonjakan tetap terlihat
+        traffic_points, freq = traffic_timeline(df, cube)
+        traffic_points = traffic_points.rename(columns={'packets': 'Packet Count'})
+        fig_traffic = px.line(traffic_points, x='minute', y='Packet Count', markers=len(traffic_points) <= 200)
         st.plotly_chart(fig_traffic, use_container_width=True)
+        st.caption(payload_caption(payload_estimate(traffic_points[['minute', 'Packet Count']]), freq))
     else:
         st.info("Kolom 'time' tidak tersedia dalam data.")
 
@@ -1,55 +1,249 @@
 import shutil
 import subprocess
-import pandas as pd
 import tempfile
-import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 import logging
+from typing import Iterator
+
+from core.metrics import timed_stage
+from parsers.schema import PACKET_COLUMNS, NULLABLE_TYPES, ETHERTYPE_IPV4, ETHERTYPE_IPV6, ETHERTYPE_ARP, conform_schema
 
 logger = logging.getLogger(__name__)
 
 FIELDS = [
-    "frame.time_epoch", "ip.src", "ip.dst", "frame.len", "ip.proto",
-    "tcp.srcport", "tcp.dstport", "udp.srcport", "udp.dstport", "frame.protocols"
+    "frame.time_epoch", "ip.src", "ip.dst", "ipv6.src", "ipv6.dst", "arp.src.proto_ipv4", "arp.dst.proto_ipv4",
+    "frame.len", "ip.proto", "ipv6.nxt", "tcp.srcport", "tcp.dstport", "udp.srcport", "udp.dstport",
+    "tcp.flags", "frame.protocols"
 ]
 
-def parse_pcap_file(pcap_path: str) -> pd.DataFrame:
-    try:
-        logger.info(f"🔍 Parsing file: {pcap_path}")
+_DICT = pa.dictionary(pa.int32(), pa.string())
+
+# Skema eksplisit tanpa inferensi tipe. Field yang bisa muncul berulang (tunnel, VXLAN) dibaca
+# semua kemunculannya ("10.0.0.1,192.168.0.1") sebagai dictionary dan dipecah per nilai unik.
+FIELD_TYPES = {field: _DICT for field in FIELDS}
+FIELD_TYPES.update({"frame.time_epoch": pa.float64(), "frame.len": pa.uint32()})
+
+# Field -> (kolom, basis angka) untuk integer: kemunculan pertama = header terluar
+INT_FIELDS = {
+    "tcp.srcport": ("tcp_srcport", 10), "tcp.dstport": ("tcp_dstport", 10),
+    "udp.srcport": ("udp_srcport", 10), "udp.dstport": ("udp_dstport", 10),
+    # tshark menulis flag sebagai heksadesimal ("0x0018")
+    "tcp.flags": ("tcp_flags", 16),
+}
+
+# Keluarga alamat per lapisan stack
+_NONE, _V4, _V6, _ARP = 0, 4, 6, 1
+_FAMILY_TOKENS = {"ip": _V4, "ipv6": _V6, "arp": _ARP}
+_ADDRESS_FIELDS = {_V4: ("ip.src", "ip.dst"), _V6: ("ipv6.src", "ipv6.dst"),
+                   _ARP: ("arp.src.proto_ipv4", "arp.dst.proto_ipv4")}
+_ETHERTYPES = {_V4: ETHERTYPE_IPV4, _V6: ETHERTYPE_IPV6, _ARP: ETHERTYPE_ARP}
+
+READ_BLOCK_BYTES = 4 * 1024 * 1024
+
+
+def tshark_command(tshark_path: str, pcap_path: str) -> list[str]:
+    cmd = [
+        tshark_path,
+        "-r", pcap_path,
+        "-T", "fields",
+        "-E", "header=y",
+        "-E", "separator=/t",
+        "-E", "quote=n",
+        "-E", "occurrence=a",
+        "-E", "aggregator=,",
+    ]
+    for field in FIELDS:
+        cmd += ["-e", field]
+    return cmd
+
+
+def open_tshark_reader(stream) -> pa_csv.CSVStreamingReader:
+    """
+    Reader Arrow streaming untuk output `tshark -T fields` (tab-separated) dengan skema tetap.
+    """
+    return pa_csv.open_csv(
+        stream,
+        read_options=pa_csv.ReadOptions(block_size=READ_BLOCK_BYTES),
+        parse_options=pa_csv.ParseOptions(delimiter="\t", quote_char=False),
+        convert_options=pa_csv.ConvertOptions(
+            column_types=FIELD_TYPES,
+            strings_can_be_null=True,
+            null_values=[""],
+        ),
+    )
+
+
+def tshark_table_to_frame(table: pa.Table) -> pd.DataFrame:
+    """
+    Tabel field tshark -> frame dengan skema bersama (`parsers.schema.PACKET_COLUMNS`) + `layers`.
+
+    Alamat IPv4, IPv6 dan ARP dari satu pass tshark digabung: urutan lapisan di `frame.protocols`
+    menentukan header terluar (src/dst) dan header dalam tunnel (inner_src/inner_dst).
+    """
+    length = table.column("frame.len").fill_null(0)
+    table = table.set_column(table.schema.get_field_index("frame.len"), "frame.len", length)
+    fields = table.to_pandas()
+    n = len(fields)
+
+    outer, inner = _stack_families(fields, n)
+    out = pd.DataFrame({"time": fields["frame.time_epoch"]})
+    out = out.assign(**_address_columns(fields, outer, inner, n))
+    out["length"] = fields["frame.len"]
+
+    proto = np.full(n, -1, dtype=np.int64)
+    for family, field in ((_V4, "ip.proto"), (_V6, "ipv6.nxt")):
+        if field in fields.columns:
+            values = _first_int(fields[field], 10)
+            proto = np.where((outer == family) & (values >= 0), values, proto)
+    out["protocol"] = pd.arrays.IntegerArray(proto.clip(0, 255).astype(np.uint8), proto < 0)
+    ethertype = np.zeros(n, dtype=np.int64)
+    for family, value in _ETHERTYPES.items():
+        ethertype = np.where(outer == family, value, ethertype)
+    out["ethertype"] = pd.arrays.IntegerArray(ethertype.astype(np.uint16), ethertype == 0)
 
-        tshark_path = shutil.which("tshark")
-        if tshark_path is None:
-            raise FileNotFoundError("❌ TShark tidak ditemukan. Pastikan sudah terinstall dan ditambahkan ke PATH.")
+    for field, (col, base) in INT_FIELDS.items():
+        if field in fields.columns:
+            values = _first_int(fields[field], base)
+            dtype = NULLABLE_TYPES[col].numpy_dtype
+            out[col] = pd.arrays.IntegerArray(values.clip(0, np.iinfo(dtype).max).astype(dtype), values < 0)
+    if "frame.protocols" in fields.columns:
+        out["layers"] = fields["frame.protocols"]
+    conform_schema(out)
+    return out[PACKET_COLUMNS + [c for c in ("layers",) if c in out.columns]]
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".csv") as temp_csv:
-            temp_csv_path = temp_csv.name
 
-        tshark_cmd = [
-            tshark_path,
-            "-r", pcap_path,
-            "-T", "fields",
-            "-Eheader=y",
-            "-Eseparator=,", 
-            "-Equote=d"
-        ]
+def _categorical(s: pd.Series) -> pd.Series:
+    return s if isinstance(s.dtype, pd.CategoricalDtype) else s.astype("category")
 
-        for field in FIELDS:
-            tshark_cmd += ["-e", field]
 
-        logger.debug(f"📤 Running tshark command: {' '.join(tshark_cmd)}")
-        with open(temp_csv_path, "w") as f:
-            subprocess.run(tshark_cmd, stdout=f, stderr=subprocess.PIPE, check=True)
+def _token_lut(s: pd.Series, position: int, parse) -> list:
+    # `parse(token ke-position)` per kategori (None bila tidak ada); tidak ada parsing per baris
+    s = _categorical(s)
+    values = []
+    for category in s.cat.categories:
+        tokens = str(category).split(",")
+        values.append(parse(tokens[position]) if len(tokens) > position and tokens[position] else None)
+    return values
 
-        df = pd.read_csv(temp_csv_path)
-        os.remove(temp_csv_path)
 
-        df.rename(columns={
-            "frame.time_epoch": "time", "ip.src": "src", "ip.dst": "dst", "frame.len": "length",
-            "ip.proto": "protocol", "tcp.srcport": "tcp_srcport", "tcp.dstport": "tcp_dstport",
-            "udp.srcport": "udp_srcport", "udp.dstport": "udp_dstport", "frame.protocols": "layers"
-        }, inplace=True)
+def _first_int(s: pd.Series, base: int) -> np.ndarray:
+    # Kemunculan pertama sebagai integer (-1 = kosong/tidak valid)
+    def parse(token):
+        try:
+            return int(token, base)
+        except ValueError:
+            return -1
+    lut = np.array([-1 if v is None else v for v in _token_lut(s, 0, parse)] + [-1], dtype=np.int64)
+    return lut[_categorical(s).cat.codes.to_numpy()]
+
+
+def _families(stack) -> tuple[int, int]:
+    # (keluarga header terluar, keluarga header dalam tunnel); IP di dalam pesan error ICMP bukan tunnel
+    found = []
+    for token in str(stack).split(":"):
+        if token in ("icmp", "icmpv6"):
+            break
+        if token in _FAMILY_TOKENS:
+            found.append(_FAMILY_TOKENS[token])
+    return (found[0] if found else _NONE), (found[1] if len(found) > 1 else _NONE)
+
+
+def _stack_families(fields: pd.DataFrame, n: int) -> tuple[np.ndarray, np.ndarray]:
+    if "frame.protocols" in fields.columns:
+        stacks = _categorical(fields["frame.protocols"])
+        pairs = np.array([_families(c) for c in stacks.cat.categories] + [(_NONE, _NONE)], dtype=np.int64)
+        codes = stacks.cat.codes.to_numpy()
+        return pairs[codes, 0], pairs[codes, 1]
+    # tanpa stack: keluarga dari field alamat yang terisi
+    outer = np.full(n, _NONE, dtype=np.int64)
+    for family in (_ARP, _V6, _V4):
+        field = _ADDRESS_FIELDS[family][0]
+        if field in fields.columns:
+            outer = np.where(fields[field].notna().to_numpy(), family, outer)
+    return outer, np.full(n, _NONE, dtype=np.int64)
+
+
+def _address_columns(fields: pd.DataFrame, outer: np.ndarray, inner: np.ndarray, n: int) -> dict:
+    # Semua token alamat ke satu kamus, lalu pilih kode per baris sesuai keluarga outer/inner
+    tokens = {}
+    for family, names in _ADDRESS_FIELDS.items():
+        for side, field in zip(("src", "dst"), names):
+            if field in fields.columns:
+                for position in (0, 1):
+                    tokens[(family, side, position)] = (field, _token_lut(fields[field], position, str))
+    dictionary = pd.Index(sorted({v for _, values in tokens.values() for v in values if v is not None}), dtype=object)
+
+    def codes(family, side, position):
+        if (family, side, position) not in tokens:
+            return np.full(n, -1, dtype=np.int32)
+        field, values = tokens[(family, side, position)]
+        # None tidak ada di kamus -> -1; slot terakhir untuk baris NA
+        lut = np.append(dictionary.get_indexer(pd.Index(values, dtype=object)), -1).astype(np.int32)
+        return lut[_categorical(fields[field]).cat.codes.to_numpy()]
+
+    columns = {}
+    for side in ("src", "dst"):
+        outer_codes = np.full(n, -1, dtype=np.int32)
+        inner_codes = np.full(n, -1, dtype=np.int32)
+        for family in (_V4, _V6, _ARP):
+            first = codes(family, side, 0)
+            outer_codes = np.where(outer == family, first, outer_codes)
+            if family != _ARP:
+                # keluarga yang sama dengan outer: kemunculan kedua; beda keluarga: kemunculan pertama
+                nested = np.where(outer == family, codes(family, side, 1), first)
+                inner_codes = np.where(inner == family, nested, inner_codes)
+        columns[side] = pd.Categorical.from_codes(outer_codes, categories=dictionary)
+        columns[f"inner_{side}"] = pd.Categorical.from_codes(inner_codes, categories=dictionary)
+    return columns
+
+
+def iter_tshark_batches(pcap_path: str) -> Iterator[pa.RecordBatch]:
+    """
+    Jalankan tshark dan baca stdout langsung sebagai RecordBatch bertipe (tanpa CSV sementara).
+    """
+    tshark_path = shutil.which("tshark")
+    if tshark_path is None:
+        raise FileNotFoundError("❌ TShark tidak ditemukan. Pastikan sudah terinstall dan ditambahkan ke PATH.")
+
+    tshark_cmd = tshark_command(tshark_path, pcap_path)
+    logger.debug(f"📤 Running tshark command: {' '.join(tshark_cmd)}")
+
+    # stderr ke file agar pipe stderr yang penuh tidak memblokir tshark
+    with tempfile.TemporaryFile() as stderr_file:
+        proc = subprocess.Popen(tshark_cmd, stdout=subprocess.PIPE, stderr=stderr_file)
+        try:
+            try:
+                reader = open_tshark_reader(proc.stdout)
+            except pa.ArrowInvalid:
+                # output kosong (mis. tshark gagal sebelum menulis header)
+                reader = None
+            if reader is not None:
+                yield from reader
+        finally:
+            proc.stdout.close()
+            returncode = proc.wait()
+        if returncode != 0:
+            stderr_file.seek(0)
+            raise subprocess.CalledProcessError(returncode, tshark_cmd, stderr=stderr_file.read())
+
+
+@timed_stage("parse.tshark")
+def parse_pcap_file(pcap_path: str, jobs: int = 1) -> pd.DataFrame:
+    try:
+        if jobs > 1:
+            # Satu proses tshark per segmen capture, hasil di-merge urut waktu
+            from parsers.pcap_segments import parse_segments_parallel
+            return parse_segments_parallel(pcap_path, jobs=jobs, backend="tshark")
+
+        logger.info(f"🔍 Parsing file: {pcap_path}")
 
-        df["time"] = pd.to_numeric(df["time"], errors="coerce")
-        df["length"] = pd.to_numeric(df["length"], errors="coerce")
+        batches = list(iter_tshark_batches(pcap_path))
+        if not batches:
+            return pd.DataFrame()
+        df = tshark_table_to_frame(pa.Table.from_batches(batches))
 
         logger.info(f"✅ Parsed successfully. Rows: {len(df)}")
         return df
@@ -0,0 +1,568 @@
+# parsers/parse_pcap_native.py
+
+import os
+import mmap
+import struct
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from core.metrics import timed_stage
+from parsers.schema import PACKET_COLUMNS, ETHERTYPE_IPV4, ETHERTYPE_IPV6, ETHERTYPE_ARP, empty_addresses
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_ROWS = 262_144
+
+# Naikkan bila skema atau hasil decode berubah (dipakai sebagai bagian kunci cache)
+PARSER_VERSION = "3"
+
+# Magic number libpcap -> (byte order, skala fraksi timestamp)
+PCAP_MAGIC = {
+    b"\xd4\xc3\xb2\xa1": ("<", 1e-6),
+    b"\xa1\xb2\xc3\xd4": (">", 1e-6),
+    b"\x4d\x3c\xb2\xa1": ("<", 1e-9),
+    b"\xa1\xb2\x3c\x4d": (">", 1e-9),
+}
+PCAPNG_SHB = 0x0A0D0D0A
+PCAPNG_BYTE_ORDER_MAGIC = 0x1A2B3C4D
+
+LINKTYPE_NULL = 0
+LINKTYPE_ETHERNET = 1
+LINKTYPE_RAW = 101
+LINKTYPE_LOOP = 108
+LINKTYPE_LINUX_SLL = 113
+LINKTYPE_IPV4 = 228
+LINKTYPE_IPV6 = 229
+LINKTYPE_LINUX_SLL2 = 276
+
+ETHERTYPE_VLAN = (0x8100, 0x88A8, 0x9100)
+
+# Enkapsulasi yang header IP dalamnya ikut dibaca
+IPPROTO_IPIP = 4
+IPPROTO_IPV6 = 41
+IPPROTO_GRE = 47
+VXLAN_PORT = 4789
+
+# Batas wajar caplen; record lebih besar dianggap korup
+MAX_CAPLEN = 256 * 1024
+
+COLUMNS = PACKET_COLUMNS
+
+
+@dataclass
+class CaptureLayout:
+    """
+    Format capture yang sedang dibaca: libpcap klasik atau pcapng beserta state antarmukanya.
+    """
+    kind: str
+    endian: str = "<"
+    linktype: int = LINKTYPE_ETHERNET
+    ts_scale: float = 1e-6
+    # pcapng: satu entri (linktype, resolusi timestamp) per Interface Description Block
+    interfaces: list = field(default_factory=list)
+    # pcapng: timestamp paket terakhir yang sudah di-scan, untuk SPB (tanpa timestamp) di batch berikutnya
+    last_time: float = np.nan
+
+
+@dataclass
+class RecordBatch:
+    """
+    Lokasi dan metadata record hasil scan, sebagai array kolom.
+    """
+    record_off: np.ndarray
+    data_off: np.ndarray
+    caplen: np.ndarray
+    origlen: np.ndarray
+    time: np.ndarray
+    linktype: np.ndarray
+    # pcapng: (offset, panjang) setiap SHB/IDB yang dilewati scan ini, sesuai urutan file
+    section_blocks: list = field(default_factory=list)
+
+    def __len__(self):
+        return len(self.data_off)
+
+
+def read_layout(buf) -> tuple[CaptureLayout, int]:
+    """
+    Baca header file dan kembalikan (layout, offset record pertama).
+    """
+    magic = bytes(buf[:4])
+    if magic in PCAP_MAGIC:
+        if len(buf) < 24:
+            raise ValueError("Header pcap terpotong")
+        endian, scale = PCAP_MAGIC[magic]
+        linktype = struct.unpack_from(endian + "I", buf, 20)[0] & 0x0FFFFFFF
+        return CaptureLayout(kind="pcap", endian=endian, linktype=linktype, ts_scale=scale), 24
+    if len(buf) >= 12 and struct.unpack_from("<I", buf, 0)[0] == PCAPNG_SHB:
+        return CaptureLayout(kind="pcapng"), 0
+    raise ValueError("Bukan file pcap/pcapng yang dikenali")
+
+
+def scan_records(buf, layout: CaptureLayout, offset: int, max_records: int) -> tuple[RecordBatch, int]:
+    """
+    Scan header record mulai dari `offset` sampai `max_records` paket.
+
+    Record terakhir yang belum lengkap tidak dibaca; offset yang dikembalikan menunjuk
+    ke awal record tersebut sehingga scan bisa dilanjutkan saat file bertambah.
+    """
+    if layout.kind == "pcap":
+        return _scan_pcap(buf, layout, offset, max_records)
+    return _scan_pcapng(buf, layout, offset, max_records)
+
+
+def _scan_pcap(buf, layout, offset, max_records):
+    # Loop Python hanya mengikuti rantai caplen; field header dibaca vektor setelahnya
+    size = len(buf)
+    unpack_caplen = struct.Struct(layout.endian + "I").unpack_from
+    starts = []
+    append = starts.append
+    off = offset
+    n = 0
+    while n < max_records and off + 16 <= size:
+        incl = unpack_caplen(buf, off + 8)[0]
+        if incl > MAX_CAPLEN:
+            logger.warning(f"⚠️ Record korup di offset {off} (caplen={incl}), scan dihentikan.")
+            off = size
+            break
+        if off + 16 + incl > size:
+            break
+        append(off)
+        off += 16 + incl
+        n += 1
+
+    starts = np.asarray(starts, dtype=np.int64)
+    dtype = np.dtype(layout.endian + "u4")
+    headers = np.frombuffer(buf, dtype=np.uint8)[starts[:, None] + np.arange(16)].copy().view(dtype)
+    time = headers[:, 0].astype(np.float64) + headers[:, 1].astype(np.float64) * layout.ts_scale
+    batch = RecordBatch(
+        record_off=starts,
+        data_off=starts + 16,
+        caplen=headers[:, 2].astype(np.int64),
+        origlen=headers[:, 3].astype(np.uint32),
+        time=time,
+        linktype=np.full(n, layout.linktype, dtype=np.int32),
+    )
+    return batch, off
+
+
+def _scan_pcapng(buf, layout, offset, max_records):
+    size = len(buf)
+    starts, kinds, bases, section_blocks = [], [], [], []
+    # tabel interface semua section yang terlihat di batch ini; id interface relatif ke section
+    iface_table = list(layout.interfaces)
+    base = 0
+    off = offset
+    n = 0
+    while n < max_records and off + 12 <= size:
+        block_type = struct.unpack_from("<I", buf, off)[0]
+        if block_type == PCAPNG_SHB:
+            bom = struct.unpack_from("<I", buf, off + 8)[0]
+            layout.endian = "<" if bom == PCAPNG_BYTE_ORDER_MAGIC else ">"
+            layout.interfaces = []
+            base = len(iface_table)
+        block_type, block_len = struct.unpack_from(layout.endian + "II", buf, off)
+        if block_len < 12 or block_len % 4:
+            logger.warning(f"⚠️ Block pcapng korup di offset {off}, scan dihentikan.")
+            off = size
+            break
+        if off + block_len > size:
+            break
+        if block_type in (6, 3, 2):  # EPB, SPB, PB (obsolete)
+            starts.append(off)
+            kinds.append(block_type)
+            bases.append(base)
+            n += 1
+        elif block_type == PCAPNG_SHB:
+            section_blocks.append((off, block_len))
+        elif block_type == 1:  # Interface Description Block
+            section_blocks.append((off, block_len))
+            linktype = struct.unpack_from(layout.endian + "H", buf, off + 8)[0]
+            iface = (linktype, _idb_tsresol(buf, off, block_len, layout.endian))
+            layout.interfaces.append(iface)
+            iface_table.append(iface)
+        off += block_len
+
+    starts = np.asarray(starts, dtype=np.int64)
+    kinds = np.asarray(kinds, dtype=np.int64)
+    u32 = np.dtype(layout.endian + "u4")
+    u16 = np.dtype(layout.endian + "u2")
+    # SPB bisa lebih pendek dari 28 byte; posisi di luar file di-clip (field-nya tidak dipakai)
+    raw = np.frombuffer(buf, dtype=np.uint8)[np.minimum(starts[:, None] + np.arange(28), size - 1)]
+    fields = raw.view(u32)
+    block_len = fields[:, 1].astype(np.int64)
+
+    is_spb = kinds == 3
+    is_pb = kinds == 2
+    if_id = fields[:, 2].astype(np.int64)
+    if is_pb.any():
+        if_id[is_pb] = raw[is_pb][:, 8:10].copy().view(u16).ravel()
+    if_id[is_spb] = 0
+    incl = np.where(is_spb, fields[:, 2], fields[:, 5]).astype(np.int64)
+    origlen = np.where(is_spb, fields[:, 2], fields[:, 6]).astype(np.uint32)
+    caplen = np.minimum(incl, block_len - np.where(is_spb, 16, 32))
+    data_off = starts + np.where(is_spb, 12, 28)
+
+    ifaces = iface_table or [(LINKTYPE_ETHERNET, 1_000_000)]
+    if_id = (np.asarray(bases, dtype=np.int64) + if_id).clip(0, len(ifaces) - 1)
+    link_lut = np.array([i[0] for i in ifaces], dtype=np.int32)
+    units_lut = np.array([i[1] for i in ifaces], dtype=np.int64)
+    ts_raw = (fields[:, 3].astype(np.int64) << 32) | fields[:, 4].astype(np.int64)
+    units = units_lut[if_id]
+    time = (ts_raw // units) + (ts_raw % units) / units
+    if is_spb.any():
+        time = _fill_spb_time(time, is_spb, layout.last_time)
+    if len(time) and not np.isnan(time[-1]):
+        layout.last_time = time[-1]
+
+    batch = RecordBatch(
+        record_off=starts,
+        data_off=data_off,
+        caplen=caplen,
+        origlen=origlen,
+        time=time,
+        linktype=link_lut[if_id],
+        section_blocks=section_blocks,
+    )
+    return batch, off
+
+
+def _fill_spb_time(time: np.ndarray, is_spb: np.ndarray, last_time: float) -> np.ndarray:
+    # SPB tidak membawa timestamp: pakai waktu paket sebelumnya (EPB/PB atau batch sebelumnya);
+    # SPB di awal capture memakai waktu paket bertimestamp pertama setelahnya
+    prev = np.where(is_spb, -1, np.arange(len(time)))
+    np.maximum.accumulate(prev, out=prev)
+    time = np.where(prev >= 0, time[prev.clip(0)], last_time)
+    missing = np.isnan(time)
+    if missing.any() and not is_spb.all():
+        time[missing] = time[np.argmax(~is_spb)]
+        missing = np.isnan(time)
+    if missing.any():
+        logger.warning(f"⚠️ {int(missing.sum()):,} SPB tanpa paket bertimestamp di dekatnya; "
+                       f"baris ini akan dibuang saat preprocess.")
+    return time
+
+
+def _idb_tsresol(buf, off, block_len, endian) -> int:
+    # Cari opsi if_tsresol (kode 9); hasilnya jumlah unit per detik, default mikrodetik
+    pos = off + 16
+    end = off + block_len - 4
+    while pos + 4 <= end:
+        code, length = struct.unpack_from(endian + "HH", buf, pos)
+        if code == 0:
+            break
+        if code == 9 and length >= 1:
+            value = buf[pos + 4]
+            return 2 ** (value & 0x7F) if value & 0x80 else 10 ** value
+        pos += 4 + length + ((-length) % 4)
+    return 1_000_000
+
+
+# === Decode header L2/L3/L4 secara vektor ===
+
+def _u8(arr, pos, ok):
+    return np.where(ok, arr[np.where(ok, pos, 0)], 0).astype(np.int64)
+
+
+def _u16(arr, pos, ok):
+    pos = np.where(ok, pos, 0)
+    return np.where(ok, (arr[pos].astype(np.int64) << 8) | arr[pos + 1], 0)
+
+
+def _u32(arr, pos, ok):
+    pos = np.where(ok, pos, 0)
+    out = arr[pos].astype(np.int64) << 24
+    out |= arr[pos + 1].astype(np.int64) << 16
+    out |= arr[pos + 2].astype(np.int64) << 8
+    out |= arr[pos + 3]
+    return np.where(ok, out, 0)
+
+
+def decode_batch(arr: np.ndarray, batch: RecordBatch) -> dict:
+    """
+    Decode Ethernet/SLL/raw -> IPv4/IPv6/ARP -> TCP/UDP (+ header IP dalam tunnel) untuk seluruh batch sekaligus.
+
+    `arr` adalah view uint8 dari buffer file (mmap), tidak ada salinan data paket.
+    """
+    n = len(batch)
+    off = batch.data_off
+    end = off + batch.caplen
+    link = batch.linktype
+
+    def has(pos, width):
+        return (pos + width) <= end
+
+    # --- Layer 2: tentukan ethertype dan offset L3 ---
+    ethertype = np.zeros(n, dtype=np.int64)
+    l3 = off.copy()
+
+    is_eth = link == LINKTYPE_ETHERNET
+    ok = is_eth & has(off + 12, 2)
+    ethertype = np.where(ok, _u16(arr, off + 12, ok), ethertype)
+    l3 = np.where(is_eth, off + 14, l3)
+    for _ in range(2):  # 802.1Q / QinQ
+        vlan = is_eth & np.isin(ethertype, ETHERTYPE_VLAN) & has(l3, 4)
+        ethertype = np.where(vlan, _u16(arr, l3 + 2, vlan), ethertype)
+        l3 = np.where(vlan, l3 + 4, l3)
+
+    is_sll = link == LINKTYPE_LINUX_SLL
+    ok = is_sll & has(off + 14, 2)
+    ethertype = np.where(ok, _u16(arr, off + 14, ok), ethertype)
+    l3 = np.where(is_sll, off + 16, l3)
+
+    is_sll2 = link == LINKTYPE_LINUX_SLL2
+    ok = is_sll2 & has(off, 2)
+    ethertype = np.where(ok, _u16(arr, off, ok), ethertype)
+    l3 = np.where(is_sll2, off + 20, l3)
+
+    # Link tanpa ethertype: tebak dari nibble versi IP
+    is_raw = np.isin(link, (LINKTYPE_RAW, LINKTYPE_IPV4, LINKTYPE_IPV6, LINKTYPE_NULL, LINKTYPE_LOOP))
+    l3 = np.where(np.isin(link, (LINKTYPE_NULL, LINKTYPE_LOOP)), off + 4, l3)
+    ok = is_raw & has(l3, 1)
+    version = _u8(arr, l3, ok) >> 4
+    ethertype = np.where(ok & (version == 4), ETHERTYPE_IPV4, ethertype)
+    ethertype = np.where(ok & (version == 6), ETHERTYPE_IPV6, ethertype)
+
+    # --- Layer 3 ---
+    is_v4 = (ethertype == ETHERTYPE_IPV4) & has(l3, 20)
+    is_v6 = (ethertype == ETHERTYPE_IPV6) & has(l3, 40)
+
+    proto = np.full(n, -1, dtype=np.int64)
+    l4 = np.zeros(n, dtype=np.int64)
+    first_fragment = np.ones(n, dtype=bool)
+
+    ihl = (_u8(arr, l3, is_v4) & 0x0F) * 4
+    proto = np.where(is_v4, _u8(arr, l3 + 9, is_v4), proto)
+    l4 = np.where(is_v4, l3 + ihl, l4)
+    first_fragment &= ~(is_v4 & ((_u16(arr, l3 + 6, is_v4) & 0x1FFF) != 0))
+    src4 = _u32(arr, l3 + 12, is_v4).astype(np.uint32)
+    dst4 = _u32(arr, l3 + 16, is_v4).astype(np.uint32)
+
+    proto = np.where(is_v6, _u8(arr, l3 + 6, is_v6), proto)
+    l4 = np.where(is_v6, l3 + 40, l4)
+    for _ in range(3):  # extension header: hop-by-hop, routing, destination options, fragment
+        ext = is_v6 & np.isin(proto, (0, 43, 60)) & has(l4, 2)
+        frag = is_v6 & (proto == 44) & has(l4, 8)
+        ext_len = np.where(frag, 8, (_u8(arr, l4 + 1, ext) + 1) * 8)
+        first_fragment &= ~(frag & ((_u16(arr, l4 + 2, frag) & 0xFFF8) != 0))
+        moved = ext | frag
+        proto = np.where(moved, _u8(arr, l4, moved), proto)
+        l4 = np.where(moved, l4 + ext_len, l4)
+
+    # ARP (IPv4): alamat IP sender/target sebagai src/dst
+    is_arp = (ethertype == ETHERTYPE_ARP) & has(l3, 28)
+    is_arp &= (_u16(arr, l3 + 2, is_arp) == ETHERTYPE_IPV4) & (_u8(arr, l3 + 5, is_arp) == 4)
+    src4 = np.where(is_arp, _u32(arr, l3 + 14, is_arp), src4).astype(np.uint32)
+    dst4 = np.where(is_arp, _u32(arr, l3 + 24, is_arp), dst4).astype(np.uint32)
+
+    # --- Layer 4 ---
+    ports_ok = (is_v4 | is_v6) & first_fragment & has(l4, 4)
+    is_tcp = ports_ok & (proto == 6)
+    is_udp = ports_ok & (proto == 17)
+    l4_ok = is_tcp | is_udp
+    sport = _u16(arr, l4, l4_ok)
+    dport = _u16(arr, l4 + 2, l4_ok)
+    # byte flag TCP (CWR..FIN) ada di offset 13 header TCP
+    has_flags = is_tcp & has(l4, 14)
+    tcp_flags = _u8(arr, l4 + 13, has_flags)
+
+    # --- Tunnel: IP-in-IP, 6in4, GRE, VXLAN -> offset & versi header IP dalam ---
+    tunneled = (is_v4 | is_v6) & first_fragment
+    inner = np.zeros(n, dtype=np.int64)
+    inner_type = np.zeros(n, dtype=np.int64)
+    ipip = tunneled & np.isin(proto, (IPPROTO_IPIP, IPPROTO_IPV6))
+    inner = np.where(ipip, l4, inner)
+    inner_type = np.where(ipip, np.where(proto == IPPROTO_IPIP, ETHERTYPE_IPV4, ETHERTYPE_IPV6), inner_type)
+    gre = tunneled & (proto == IPPROTO_GRE) & has(l4, 4)
+    gre_flags = _u8(arr, l4, gre)
+    # checksum(+reserved), key, sequence masing-masing menambah 4 byte
+    gre_len = 4 + 4 * (((gre_flags & 0x80) > 0).astype(np.int64) + ((gre_flags & 0x20) > 0) + ((gre_flags & 0x10) > 0))
+    inner = np.where(gre, l4 + gre_len, inner)
+    inner_type = np.where(gre, _u16(arr, l4 + 2, gre), inner_type)
+    vxlan = is_udp & (dport == VXLAN_PORT) & has(l4, 30)
+    inner = np.where(vxlan, l4 + 30, inner)
+    inner_type = np.where(vxlan, _u16(arr, l4 + 28, vxlan), inner_type)
+    inner_v4 = (inner_type == ETHERTYPE_IPV4) & has(inner, 20)
+    inner_v6 = (inner_type == ETHERTYPE_IPV6) & has(inner, 40)
+
+    return {
+        "ethertype": ethertype,
+        "proto": proto, "is_tcp": is_tcp, "is_udp": is_udp, "sport": sport, "dport": dport,
+        "tcp_flags": tcp_flags, "has_flags": has_flags,
+        "src": _addresses(arr, l3, is_v4 | is_arp, src4, is_v6, 8),
+        "dst": _addresses(arr, l3, is_v4 | is_arp, dst4, is_v6, 24),
+        "inner_src": _addresses(arr, inner, inner_v4, _u32(arr, inner + 12, inner_v4).astype(np.uint32), inner_v6, 8),
+        "inner_dst": _addresses(arr, inner, inner_v4, _u32(arr, inner + 16, inner_v4).astype(np.uint32), inner_v6, 24),
+    }
+
+
+def _addresses(arr, l3, v4_mask, v4_values, v6_mask, v6_offset) -> tuple:
+    # (baris IPv4, nilai uint32, baris IPv6, matriks byte (k, 16)) untuk satu kolom alamat
+    v4_rows = np.flatnonzero(v4_mask)
+    v6_rows = np.flatnonzero(v6_mask)
+    v6_bytes = arr[l3[v6_rows][:, None] + v6_offset + np.arange(16)] if len(v6_rows) else None
+    return v4_rows, v4_values[v4_rows], v6_rows, v6_bytes
+
+
+# === Format alamat: hanya nilai unik yang diubah ke string ===
+
+def _ipv4_strings(values: np.ndarray) -> list[str]:
+    return [f"{a >> 24}.{(a >> 16) & 255}.{(a >> 8) & 255}.{a & 255}" for a in values.tolist()]
+
+
+def _ipv6_strings(values: np.ndarray) -> list[str]:
+    import ipaddress
+
+    return [str(ipaddress.IPv6Address(v.tobytes())) for v in values]
+
+
+def _address_column(addresses: tuple, n: int) -> pd.Categorical:
+    # Kolom categorical: kode int32 per paket + kamus alamat unik (string dibuat sekali per alamat)
+    v4_rows, v4_values, v6_rows, v6_bytes = addresses
+    if not len(v4_rows) and not len(v6_rows):
+        return empty_addresses(n)
+    codes = np.full(n, -1, dtype=np.int32)
+    categories = []
+    if len(v4_rows):
+        uniq, inverse = np.unique(v4_values, return_inverse=True)
+        codes[v4_rows] = inverse
+        categories += _ipv4_strings(uniq)
+    if v6_bytes is not None:
+        packed = np.ascontiguousarray(v6_bytes).view("V16").ravel()
+        uniq, inverse = np.unique(packed, return_inverse=True)
+        codes[v6_rows] = inverse + len(categories)
+        categories += _ipv6_strings(uniq)
+    return pd.Categorical.from_codes(codes, categories=pd.Index(categories, dtype=object))
+
+
+def _port_column(values: np.ndarray, mask: np.ndarray) -> pd.arrays.IntegerArray:
+    return pd.arrays.IntegerArray(values.astype(np.uint16), ~mask)
+
+
+def batch_to_frame(arr: np.ndarray, batch: RecordBatch) -> pd.DataFrame:
+    """
+    Ubah satu RecordBatch menjadi DataFrame dengan skema bersama (`parsers.schema.PACKET_COLUMNS`).
+    """
+    n = len(batch)
+    decoded = decode_batch(arr, batch)
+    is_tcp, is_udp = decoded["is_tcp"], decoded["is_udp"]
+    ethertype = decoded["ethertype"]
+    return pd.DataFrame({
+        "time": batch.time,
+        **{col: _address_column(decoded[col], n) for col in ("src", "dst", "inner_src", "inner_dst")},
+        "length": batch.origlen,
+        "protocol": pd.arrays.IntegerArray(decoded["proto"].clip(0, 255).astype(np.uint8), decoded["proto"] < 0),
+        "ethertype": pd.arrays.IntegerArray(ethertype.astype(np.uint16), ethertype == 0),
+        "tcp_srcport": _port_column(decoded["sport"], is_tcp),
+        "tcp_dstport": _port_column(decoded["dport"], is_tcp),
+        "udp_srcport": _port_column(decoded["sport"], is_udp),
+        "udp_dstport": _port_column(decoded["dport"], is_udp),
+        "tcp_flags": pd.arrays.IntegerArray(decoded["tcp_flags"].astype(np.uint8), ~decoded["has_flags"]),
+    }, columns=COLUMNS)
+
+
+def iter_pcap_chunks(pcap_path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                     byte_range: tuple[int, int] | None = None,
+                     layout: CaptureLayout | None = None,
+                     on_offset: Callable[[int], None] | None = None) -> Iterator[pd.DataFrame]:
+    """
+    Baca pcap/pcapng lewat memory map dan hasilkan DataFrame per `chunk_rows` paket.
+
+    `byte_range` + `layout` membatasi scan pada satu segmen (lihat `parsers.pcap_segments`).
+    `on_offset` dipanggil dengan posisi byte setelah tiap potongan (untuk progres).
+    """
+    if os.path.getsize(pcap_path) == 0:
+        return
+    with open(pcap_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if layout is None:
+            layout, offset = read_layout(mm)
+        else:
+            offset = 0
+        end = len(mm)
+        if byte_range is not None:
+            offset, end = byte_range
+        released = offset // mmap.PAGESIZE * mmap.PAGESIZE
+        with memoryview(mm)[:end] as buf:
+            arr = np.frombuffer(buf, dtype=np.uint8)
+            try:
+                while True:
+                    batch, offset = scan_records(buf, layout, offset, chunk_rows)
+                    if len(batch) == 0:
+                        break
+                    if on_offset is not None:
+                        on_offset(offset)
+                    frame = batch_to_frame(arr, batch)
+                    released = _release_pages(mm, released, offset)
+                    yield frame
+            finally:
+                # view numpy harus dilepas sebelum mmap ditutup
+                del arr
+
+
+def _release_pages(mm: mmap.mmap, start: int, offset: int) -> int:
+    # Halaman file yang sudah didekode tidak perlu tetap resident: RSS tidak tumbuh dengan ukuran file
+    # (halaman dibaca ulang dari file bila diakses lagi)
+    stop = offset // mmap.PAGESIZE * mmap.PAGESIZE
+    if stop > start and hasattr(mmap, "MADV_DONTNEED"):
+        mm.madvise(mmap.MADV_DONTNEED, start, stop - start)
+    return max(start, stop)
+
+
+def unify_categoricals(frames: list[pd.DataFrame]) -> list[pd.DataFrame]:
+    """
+    Samakan kategori kolom categorical antar frame agar `pd.concat` tidak jatuh ke object.
+    """
+    if len(frames) < 2:
+        return frames
+    columns = [c for c in frames[0].columns
+               if all(c in f.columns and isinstance(f[c].dtype, pd.CategoricalDtype) for f in frames)]
+    if not columns:
+        return frames
+    frames = [f.copy(deep=False) for f in frames]
+    for col in columns:
+        categories = frames[0][col].cat.categories
+        for f in frames[1:]:
+            categories = categories.union(f[col].cat.categories)
+        for f in frames:
+            if not f[col].cat.categories.equals(categories):
+                f[col] = f[col].cat.set_categories(categories)
+    return frames
+
+
+def concat_chunks(chunks: list[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Gabungkan potongan kolom demi kolom. `chunks` dikosongkan dan kolom tiap potongan dilepas begitu
+    disalin, sehingga memori puncak kira-kira tabel hasil + satu kolom, bukan dua kali tabel.
+    """
+    if len(chunks) == 1:
+        return chunks.pop()
+    frames = list(unify_categoricals(chunks))
+    chunks.clear()
+    if any(not f.columns.equals(frames[0].columns) for f in frames):
+        return pd.concat(frames, ignore_index=True)
+    # pop hanya mengubah shallow copy, frame milik pemanggil tidak tersentuh
+    frames = [f.copy(deep=False) for f in frames]
+    columns = {col: pd.concat([f.pop(col) for f in frames], ignore_index=True) for col in list(frames[0].columns)}
+    return pd.DataFrame(columns, copy=False)
+
+
+@timed_stage("parse.native_file")
+def parse_pcap_file(pcap_path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS, jobs: int = 1) -> pd.DataFrame:
+    try:
+        if jobs > 1:
+            from parsers.pcap_segments import parse_segments_parallel
+            return parse_segments_parallel(pcap_path, jobs=jobs, backend="native")
+
+        logger.info(f"🔍 Parsing native: {pcap_path}")
+        chunks = list(iter_pcap_chunks(pcap_path, chunk_rows=chunk_rows))
+        if not chunks:
+            return pd.DataFrame(columns=COLUMNS)
+        df = concat_chunks(chunks)
+        logger.info(f"✅ Parsed successfully. Rows: {len(df)}")
+        return df
+    except Exception as e:
+        logger.error(f"❌ Parsing error: {e}")
+        return pd.DataFrame()
@@ -0,0 +1,231 @@
+# parsers/pcap_segments.py
+
+import os
+import mmap
+import bisect
+import logging
+import tempfile
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from parsers.parse_pcap_native import (
+    COLUMNS, CaptureLayout, read_layout, scan_records, iter_pcap_chunks,
+    concat_chunks, unify_categoricals,
+)
+
+logger = logging.getLogger(__name__)
+
+SCAN_BATCH = 1_000_000
+
+
+@dataclass
+class Segment:
+    """
+    Rentang byte [start, end) yang selaras dengan batas record, plus header yang dibutuhkan
+    agar segmen bisa dibaca berdiri sendiri (header pcap, atau SHB/IDB pcapng sebelumnya).
+    """
+    path: str
+    preamble: bytes
+    start: int
+    end: int
+    packets: int
+
+
+def _pcapng_preamble(buf, section_blocks: list, end: int) -> bytes:
+    # Semua SHB dan IDB (dicatat saat scan offset record) sebelum `end` sesuai urutan aslinya
+    count = bisect.bisect_left(section_blocks, (end,))
+    return b"".join(bytes(buf[off:off + length]) for off, length in section_blocks[:count])
+
+
+def split_capture(pcap_path: str, n_segments: int) -> list[Segment]:
+    """
+    Scan offset record lalu bagi capture menjadi `n_segments` rentang paket yang kira-kira sama besar.
+    """
+    with open(pcap_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        layout, offset = read_layout(mm)
+        first = offset
+        starts, section_blocks = [], []
+        while True:
+            batch, offset = scan_records(mm, layout, offset, SCAN_BATCH)
+            section_blocks += batch.section_blocks
+            if len(batch) == 0:
+                break
+            starts.append(batch.record_off)
+        end_of_records = offset
+        starts = np.concatenate(starts) if starts else np.zeros(0, dtype=np.int64)
+
+        n_segments = max(1, min(n_segments, len(starts)))
+        cut_idx = np.linspace(0, len(starts), n_segments + 1).astype(np.int64)
+        bounds = [int(starts[i]) if i < len(starts) else end_of_records for i in cut_idx]
+        bounds[0] = first
+
+        segments = []
+        file_header = bytes(mm[:first])
+        for i in range(n_segments):
+            start, end = bounds[i], bounds[i + 1]
+            if layout.kind == "pcapng":
+                # SHB/IDB yang ada di dalam rentang segmen tetap ikut terbaca dari rentang itu sendiri
+                preamble = _pcapng_preamble(mm, section_blocks, start)
+            else:
+                preamble = file_header
+            segments.append(Segment(pcap_path, preamble, start, end, int(cut_idx[i + 1] - cut_idx[i])))
+    return segments
+
+
+def write_segment(segment: Segment, output_path: str):
+    """
+    Tulis segmen sebagai file capture mandiri (untuk worker tshark).
+    """
+    with open(segment.path, "rb") as src, open(output_path, "wb") as dst:
+        dst.write(segment.preamble)
+        src.seek(segment.start)
+        remaining = segment.end - segment.start
+        while remaining > 0:
+            block = src.read(min(remaining, 4 * 1024 * 1024))
+            if not block:
+                break
+            dst.write(block)
+            remaining -= len(block)
+
+
+def _segment_layout(segment: Segment) -> CaptureLayout | None:
+    if not segment.preamble:
+        # segmen pertama pcapng diawali SHB miliknya sendiri
+        return None
+    layout, offset = read_layout(segment.preamble)
+    if layout.kind == "pcapng":
+        # proses SHB/IDB di preamble agar endian & tabel interface terisi
+        scan_records(segment.preamble, layout, offset, 1)
+    return layout
+
+
+def _native_segment_worker(segment: Segment) -> pd.DataFrame:
+    layout = _segment_layout(segment)
+    chunks = list(iter_pcap_chunks(segment.path, byte_range=(segment.start, segment.end), layout=layout))
+    if not chunks:
+        return pd.DataFrame(columns=COLUMNS)
+    return concat_chunks(chunks)
+
+
+def _tshark_segment_worker(segment: Segment) -> pd.DataFrame:
+    from parsers.parse_pcap import parse_pcap_file
+
+    suffix = os.path.splitext(segment.path)[1] or ".pcap"
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+        tmp_path = tmp.name
+    try:
+        write_segment(segment, tmp_path)
+        return parse_pcap_file(tmp_path)
+    finally:
+        os.remove(tmp_path)
+
+
+WORKERS = {
+    "native": _native_segment_worker,
+    "tshark": _tshark_segment_worker,
+}
+
+
+def _merge_runs(a_keys, a_pos, b_keys, b_pos):
+    # Merge dua run terurut; elemen b yang sama dengan a ditempatkan setelahnya (stabil)
+    n = len(a_keys) + len(b_keys)
+    b_at = np.searchsorted(a_keys, b_keys, side="right") + np.arange(len(b_keys))
+    from_b = np.zeros(n, dtype=bool)
+    from_b[b_at] = True
+    keys = np.empty(n, dtype=a_keys.dtype)
+    pos = np.empty(n, dtype=np.int64)
+    keys[b_at], pos[b_at] = b_keys, b_pos
+    keys[~from_b], pos[~from_b] = a_keys, a_pos
+    return keys, pos
+
+
+def merge_time_ordered(frames: list[pd.DataFrame], key: str = "time") -> pd.DataFrame:
+    """
+    K-way merge beberapa frame berdasarkan `key` tanpa sort ulang seluruh data.
+
+    Tiap frame diurutkan sendiri bila perlu, lalu run digabung berpasangan (searchsorted),
+    sehingga urutan asli dipertahankan untuk nilai `key` yang sama.
+    """
+    frames = [f for f in frames if f is not None and len(f)]
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1 and frames[0][key].is_monotonic_increasing:
+        return frames[0].reset_index(drop=True)
+
+    runs = []
+    base = 0
+    for f in frames:
+        keys = f[key].to_numpy()
+        pos = np.arange(base, base + len(f), dtype=np.int64)
+        if not f[key].is_monotonic_increasing:
+            order = np.argsort(keys, kind="stable")
+            keys, pos = keys[order], pos[order]
+        runs.append((keys, pos))
+        base += len(f)
+
+    while len(runs) > 1:
+        merged = [_merge_runs(*runs[i], *runs[i + 1]) for i in range(0, len(runs) - 1, 2)]
+        if len(runs) % 2:
+            merged.append(runs[-1])
+        runs = merged
+    order = runs[0][1]
+
+    frames = unify_categoricals(frames)
+    if np.array_equal(order, np.arange(len(order))):
+        return pd.concat(frames, ignore_index=True)
+    # posisi tujuan tiap baris: kolom ditulis langsung ke urutan hasil merge (satu salinan)
+    dest = np.empty(len(order), dtype=np.int64)
+    dest[order] = np.arange(len(order))
+    bounds = np.cumsum([0] + [len(f) for f in frames])
+    parts = [dest[bounds[i]:bounds[i + 1]] for i in range(len(frames))]
+    columns = {col: _gather_column([f[col] for f in frames], parts, order) for col in frames[0].columns}
+    return pd.DataFrame(columns)
+
+
+_MASKED_ARRAYS = (pd.arrays.IntegerArray, pd.arrays.FloatingArray, pd.arrays.BooleanArray)
+
+
+def _scatter(values: list[np.ndarray], parts: list[np.ndarray], dtype) -> np.ndarray:
+    out = np.empty(sum(len(p) for p in parts), dtype=dtype)
+    for v, p in zip(values, parts):
+        out[p] = v
+    return out
+
+
+def _gather_column(series: list[pd.Series], parts: list[np.ndarray], order: np.ndarray):
+    dtypes = {s.dtype for s in series}
+    dtype = series[0].dtype
+    if len(dtypes) == 1 and isinstance(dtype, pd.CategoricalDtype):
+        codes = [s.cat.codes.to_numpy() for s in series]
+        return pd.Categorical.from_codes(_scatter(codes, parts, np.result_type(*codes)), dtype=dtype)
+    if len(dtypes) == 1 and isinstance(series[0].array, _MASKED_ARRAYS):
+        # integer/float/boolean nullable: data & mask disusun terpisah
+        data = _scatter([s.to_numpy(dtype=dtype.numpy_dtype, na_value=0) for s in series], parts, dtype.numpy_dtype)
+        mask = _scatter([s.isna().to_numpy() for s in series], parts, bool)
+        return type(series[0].array)(data, mask)
+    if all(isinstance(d, np.dtype) and d.kind in "biufcmM" for d in dtypes):
+        return _scatter([s.to_numpy() for s in series], parts, np.result_type(*dtypes))
+    # dtype campuran / object: concat lalu take
+    return pd.concat(series, ignore_index=True).take(order).reset_index(drop=True)
+
+
+def parse_segments_parallel(pcap_path: str, jobs: int, backend: str = "native") -> pd.DataFrame:
+    """
+    Bagi capture menjadi `jobs` segmen, parse paralel di process pool, lalu merge urut waktu.
+    """
+    worker = WORKERS[backend]
+    segments = split_capture(pcap_path, jobs)
+    logger.info(f"🧩 {len(segments)} segmen, backend={backend}, jobs={jobs}: {pcap_path}")
+
+    if len(segments) <= 1:
+        frames = [worker(s) for s in segments]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            frames = list(pool.map(worker, segments))
+
+    df = merge_time_ordered(frames)
+    logger.info(f"✅ Parsed successfully. Rows: {len(df)}")
+    return df if not df.empty else pd.DataFrame(columns=COLUMNS)
@@ -0,0 +1,89 @@
+# parsers/schema.py
+
+import ipaddress
+
+import numpy as np
+import pandas as pd
+
+# Kolom paket yang sama untuk semua backend (native, tshark, CSV).
+# src/dst: header IP terluar (IPv4 atau IPv6) atau alamat IP sender/target ARP;
+# inner_src/inner_dst: header IP di dalam tunnel (IP-in-IP, 6in4, GRE, VXLAN).
+PACKET_COLUMNS = ["time", "src", "dst", "inner_src", "inner_dst", "length", "protocol", "ethertype",
+                  "tcp_srcport", "tcp_dstport", "udp_srcport", "udp_dstport", "tcp_flags"]
+
+ADDRESS_COLUMNS = ("src", "dst", "inner_src", "inner_dst")
+
+# Kolom integer nullable -> dtype pandas
+NULLABLE_TYPES = {
+    "protocol": pd.UInt8Dtype(),
+    "ethertype": pd.UInt16Dtype(),
+    "tcp_srcport": pd.UInt16Dtype(),
+    "tcp_dstport": pd.UInt16Dtype(),
+    "udp_srcport": pd.UInt16Dtype(),
+    "udp_dstport": pd.UInt16Dtype(),
+    "tcp_flags": pd.UInt8Dtype(),
+}
+
+ETHERTYPE_IPV4 = 0x0800
+ETHERTYPE_ARP = 0x0806
+ETHERTYPE_IPV6 = 0x86DD
+
+
+def empty_addresses(n: int) -> pd.Categorical:
+    return pd.Categorical.from_codes(np.full(n, -1, dtype=np.int8), categories=pd.Index([], dtype=object))
+
+
+def canonical_addresses(s: pd.Series) -> pd.Series:
+    """
+    Alamat teks -> bentuk kanonik `ipaddress` (IPv6 dipadatkan, huruf kecil), dicek sekali per alamat unik.
+
+    Nilai kosong menjadi NA, nilai bukan IP (mis. hostname) dibiarkan; alamat yang sama dalam
+    penulisan berbeda digabung jadi satu kategori.
+    """
+    cat = s if isinstance(s.dtype, pd.CategoricalDtype) else s.astype("category")
+    canonical = []
+    for value in cat.cat.categories:
+        text = str(value).strip()
+        try:
+            canonical.append(str(ipaddress.ip_address(text)))
+        except ValueError:
+            canonical.append(text or None)
+    inverse, uniques = pd.factorize(pd.Index(canonical, dtype=object))
+    lut = np.append(inverse, -1).astype(np.int32)
+    codes = lut[cat.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, categories=pd.Index(uniques, dtype=object)),
+                     index=s.index, name=s.name)
+
+
+def conform_schema(df: pd.DataFrame, normalize_addresses: bool = False) -> pd.DataFrame:
+    """
+    Lengkapi frame hasil backend apa pun ke `PACKET_COLUMNS` (in place, kolom lain dibiarkan).
+
+    Kolom yang tidak ada ditambahkan sebagai NA bertipe; integer dikonversi ke dtype nullable,
+    `length` ke uint32.
+    `normalize_addresses` (mis. untuk CSV) menyeragamkan penulisan alamat.
+    """
+    n = len(df)
+    if "length" in df.columns and df["length"].dtype != np.uint32:
+        # panjang frame kosong/tidak valid -> 0, sama seperti frame.len tshark
+        df["length"] = _nullable_int(df["length"], pd.UInt32Dtype()).to_numpy(dtype=np.uint32, na_value=0)
+    for col in ADDRESS_COLUMNS:
+        if col not in df.columns:
+            df[col] = empty_addresses(n)
+        elif normalize_addresses:
+            df[col] = canonical_addresses(df[col])
+    for col, dtype in NULLABLE_TYPES.items():
+        if col not in df.columns:
+            df[col] = pd.arrays.IntegerArray(np.zeros(n, dtype=dtype.numpy_dtype), np.ones(n, dtype=bool))
+        elif df[col].dtype != dtype and (col != "protocol" or pd.api.types.is_numeric_dtype(df[col])):
+            # `protocol` berupa nama (CSV ekspor pyshark/Wireshark) dibiarkan untuk core.protocols
+            df[col] = _nullable_int(df[col], dtype)
+    return df
+
+
+def _nullable_int(s: pd.Series, dtype) -> pd.arrays.IntegerArray:
+    # Nilai bukan angka / pecahan / di luar rentang dtype -> NA
+    values = pd.to_numeric(s, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    info = np.iinfo(dtype.numpy_dtype)
+    valid = (values >= info.min) & (values <= info.max) & (values == np.floor(values))
+    return pd.arrays.IntegerArray(np.where(valid, values, 0).astype(dtype.numpy_dtype), ~valid)
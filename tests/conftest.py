@@ -0,0 +1,30 @@
+import itertools
+import pytest
+from benchmarks.synthetic import generate_capture
+from core.auto_parser import parse_pcap_auto
+from core.parse_cache import ParseCache
+from core.datasets import DatasetRegistry
+
+
+@pytest.fixture
+def packets(tmp_path):
+    """
+    Factory paket sintetis: `packets(n, seed, **opsi generate_capture)` → DataFrame hasil parse_pcap_auto.
+    """
+    counter = itertools.count()
+
+    def make(n=4_000, seed=0, **options):
+        path = tmp_path / f"capture-{seed}-{next(counter)}.pcap"
+        generate_capture(str(path), n, seed=seed, **options)
+        return parse_pcap_auto(str(path))
+
+    return make
+
+
+@pytest.fixture
+def isolated_cache(tmp_path, monkeypatch):
+    """
+    Parse cache & registry dataset per test (tidak memakai cache di home directory).
+    """
+    monkeypatch.setattr("core.parse_cache._default_cache", ParseCache(str(tmp_path / "cache")))
+    monkeypatch.setattr("core.datasets._registry", DatasetRegistry(spill_dir=str(tmp_path / "spill")))
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+from core.aggregates import build_summary_cube, fold_chunks, LARGE_PACKET_BYTES
+
+
+def test_summary_cube_matches_row_level_queries(packets):
+    df = packets(n_hosts=30, ipv6_ratio=0.2)
+    cube = build_summary_cube(df, chunk_rows=900)
+
+    assert cube.total_packets == len(df)
+    assert cube.unique_sources() == df["src"].nunique()
+    assert cube.unique_destinations() == df["dst"].nunique()
+    expected_proto = df["protocol"].astype(object).value_counts()
+    assert cube.protocol_counts().sort_index().tolist() == expected_proto.sort_index().tolist()
+    ports = df["tcp_dstport"].fillna(df["udp_dstport"]).dropna().astype(int).value_counts()
+    assert cube.top_ports(3).tolist() == ports.head(3).tolist()
+    assert cube.traffic_per_minute().tolist() == df.groupby("minute").size().tolist()
+    assert cube.bytes_per_minute().sum() == df["length"].sum()
+
+
+def test_summary_cube_large_packet_rows_and_merge(packets):
+    df = packets(n_hosts=30, ipv6_ratio=0.2)
+    cube = build_summary_cube(df, chunk_rows=500)
+
+    large = np.flatnonzero(df["length"].to_numpy() > LARGE_PACKET_BYTES)
+    assert cube.large_packets == len(large)
+    assert cube.large_packet_rows.tolist() == large[:20].tolist()
+
+    half = len(df) // 2
+    merged = fold_chunks([df.iloc[:half]]).merge(fold_chunks([df.iloc[half:]]))
+    pd.testing.assert_frame_equal(merged.by_src.sort_index(), cube.by_src.sort_index())
+    assert merged.large_packet_rows.tolist() == cube.large_packet_rows.tolist()
+    assert (merged.length_hist == cube.length_hist).all()
@@ -0,0 +1,57 @@
+import os
+import sys
+import json
+import subprocess
+
+import pandas as pd
+from benchmarks.synthetic import generate_capture
+from core.auto_parser import parse_pcap_auto
+from core.analysis import analyze_capture, analyze_batch
+from core.report import write_pdf_report
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_analyze_capture_matches_raw_counts(tmp_path):
+    truth = generate_capture(str(tmp_path / "scan.pcap"), 5_000, patterns={"scan": 0.1})
+    df = parse_pcap_auto(str(tmp_path / "scan.pcap"))
+    analysis = analyze_capture(df, "scan.pcap", detectors=["length_threshold", "port_scan"], pca=True)
+
+    assert analysis.summary["total_packets"] == len(df)
+    assert analysis.summary["unique_sources"] == df["src"].nunique()
+    assert analysis.summary["large_packets"] == int((df["length"] > 1400).sum())
+    assert analysis.tables["top_sources"]["src"].iloc[0] == truth["scan"]["attacker"]
+    assert [d["name"] for d in analysis.detectors] == ["length_threshold", "port_scan"]
+    assert analysis.pca["points"] > 0
+    json.dumps(analysis.to_dict())
+
+    # default batch: hanya cube, tanpa detektor & PCA
+    quick = analyze_capture(df, "scan.pcap")
+    assert quick.detectors == [] and quick.pca is None
+    assert quick.summary == analysis.summary
+
+
+def test_batch_reports_failures_and_writes_pdf(tmp_path):
+    generate_capture(str(tmp_path / "a.pcap"), 2_000)
+    (tmp_path / "broken.pcap").write_bytes(b"junk")
+
+    analyses = analyze_batch(str(tmp_path), jobs=1, detectors=[], pca=False)
+    assert [a.name for a in analyses] == ["a.pcap", "broken.pcap"]
+    assert analyses[0].error is None and analyses[1].error
+
+    pdf = write_pdf_report(analyses, str(tmp_path / "report.pdf"))
+    assert open(pdf, "rb").read(5) == b"%PDF-"
+
+
+def test_cli_writes_json_parquet_and_pdf(tmp_path):
+    (tmp_path / "in").mkdir()
+    generate_capture(str(tmp_path / "in" / "a.pcap"), 2_000)
+    out = tmp_path / "out"
+    subprocess.run([sys.executable, os.path.join(ROOT, "tools", "analyze_batch.py"), str(tmp_path / "in"),
+                    "-o", str(out), "--jobs", "1", "--detectors", "length_threshold"],
+                   check=True, capture_output=True, timeout=300)
+
+    assert json.loads((out / "a.pcap.json").read_text())["summary"]["total_packets"] == 2_000
+    summary = pd.read_parquet(out / "summary.parquet")
+    assert summary.loc[0, "capture"] == "a.pcap" and "anomalies_length_threshold" in summary
+    assert (out / "report.pdf").stat().st_size > 0
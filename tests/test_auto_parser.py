@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic import generate_capture
+from core.auto_parser import parse_pcap_auto, parse_pcap_iter
+from core.aggregates import aggregate_pcap, value_counts, LENGTH_BINS
+from core.preprocessor import preprocess_packets
+
+
+def test_parse_pcap_iter_yields_preprocessed_chunks(tmp_path):
+    path = tmp_path / "capture.pcap"
+    generate_capture(str(path), 2_500)
+
+    chunks = list(parse_pcap_iter(str(path), chunk_rows=1_000))
+
+    assert [len(c) for c in chunks] == [1_000, 1_000, 500]
+    assert all("minute" in c.columns for c in chunks)
+    assert pd.api.types.is_datetime64_any_dtype(chunks[0]["time"])
+
+
+def test_preprocess_packets_shares_address_dictionary():
+    raw = pd.DataFrame({"time": [1.0, 2.0, 3.0], "src": ["a", "b", "a"], "dst": ["c", "a", None],
+                        "protocol": pd.array([6, 17, None], dtype="UInt8")})
+    out = preprocess_packets(raw)
+
+    assert out["src"].cat.categories.equals(out["dst"].cat.categories)
+    assert list(out["src"].cat.categories) == ["a", "b", "c"]
+    assert out["dst"].cat.codes.tolist() == [2, 0, -1]
+    assert isinstance(out["protocol"].dtype, pd.CategoricalDtype)
+
+
+def test_parse_pcap_iter_csv(tmp_path):
+    path = tmp_path / "capture.csv"
+    path.write_text("time,src,dst,length\n2025-01-01 10:00:00,a,b,10\nbad,a,c,\n2025-01-01 10:01:00,b,a,30\n")
+
+    df = pd.concat(parse_pcap_iter(str(path), chunk_rows=2), ignore_index=True)
+
+    assert len(df) == 2
+    assert df["length"].tolist() == [10, 30]
+
+
+def test_preprocess_packets_does_not_modify_input():
+    raw = pd.DataFrame({"time": [1_700_000_000.0, 1_700_000_060.0], "length": [10, 20]})
+    out = preprocess_packets(raw)
+    assert raw["time"].dtype == np.float64
+    assert out["minute"].nunique() == 2
+
+
+def test_aggregate_pcap_matches_full_table(tmp_path):
+    path = tmp_path / "capture.pcapng"
+    generate_capture(str(path), 3_000, fmt="pcapng", n_hosts=20)
+
+    agg = aggregate_pcap(str(path), chunk_rows=700)
+    df = parse_pcap_auto(str(path))
+
+    assert agg.total_packets == len(df)
+    assert agg.total_bytes == int(df["length"].sum())
+    pd.testing.assert_series_equal(
+        agg.src_counts.sort_index(), value_counts(df["src"]).sort_index(), check_names=False)
+    assert agg.traffic_per_minute().sum() == len(df)
+    assert agg.length_hist.sum() == len(df)
+    assert (agg.length_hist == np.histogram(df["length"], bins=LENGTH_BINS)[0]).all()
@@ -0,0 +1,34 @@
+import pandas as pd
+from benchmarks.synthetic import generate_capture
+from core.auto_parser import parse_pcap_auto
+from core.batch import parse_batch, expand_inputs
+
+
+def test_expand_inputs_directory_and_glob(tmp_path):
+    for name in ("b.pcap", "a.pcapng", "c.csv", "notes.txt"):
+        (tmp_path / name).write_bytes(b"")
+
+    assert [p.split("/")[-1] for p in expand_inputs(str(tmp_path))] == ["a.pcapng", "b.pcap", "c.csv"]
+    assert [p.split("/")[-1] for p in expand_inputs(str(tmp_path / "*.pcap"))] == ["b.pcap"]
+
+
+def test_parse_batch_merges_by_time_and_tolerates_bad_files(tmp_path):
+    # rentang waktu saling tumpang tindih agar merge benar-benar menyisipkan
+    for i in range(3):
+        generate_capture(str(tmp_path / f"dump-{i}.pcap"), 1_000, seed=i, start_time=1.7e9 + i * 10, duration=60)
+    (tmp_path / "broken.pcap").write_bytes(b"bukan capture sama sekali")
+
+    result = parse_batch(str(tmp_path), jobs=2)
+
+    assert len(result.df) == 3_000
+    assert result.df["time"].is_monotonic_increasing
+    assert result.df["source_file"].value_counts().to_dict() == {"dump-0.pcap": 1_000, "dump-1.pcap": 1_000, "dump-2.pcap": 1_000}
+    assert result.df["src"].cat.categories.equals(result.df["dst"].cat.categories)
+
+    report = result.report().set_index("file")
+    assert report.loc["broken.pcap", "error"] != "" and report.loc["broken.pcap", "packets"] == 0
+    assert report.loc["dump-0.pcap", "error"] == ""
+
+    single = parse_pcap_auto(str(tmp_path / "dump-1.pcap"))
+    from_batch = result.df[result.df["source_file"] == "dump-1.pcap"].reset_index(drop=True)
+    pd.testing.assert_series_equal(from_batch["length"], single["length"])
@@ -0,0 +1,65 @@
+import pandas as pd
+from benchmarks.synthetic import generate_capture
+from benchmarks.run_benchmarks import bench_size, compare, parse_size
+from core.auto_parser import parse_pcap_auto
+
+
+def test_synthetic_patterns_and_csv_match_pcap(tmp_path):
+    truth = generate_capture(str(tmp_path / "attack.pcap"), 5_000, patterns={"scan": 0.1, "ddos": 0.2})
+    generate_capture(str(tmp_path / "attack.csv"), 5_000, fmt="csv", patterns={"scan": 0.1, "ddos": 0.2})
+    pcap = parse_pcap_auto(str(tmp_path / "attack.pcap"))
+    csv = parse_pcap_auto(str(tmp_path / "attack.csv"))
+
+    scan = pcap[pcap["src"] == truth["scan"]["attacker"]]
+    assert len(scan) == truth["scan"]["packets"] == 500
+    assert scan["tcp_dstport"].nunique() == 500 and (scan["tcp_flags"] == 0x02).all()
+    assert (pcap["dst"] == truth["ddos"]["victim"]).sum() >= truth["ddos"]["packets"]
+
+    assert len(csv) == len(pcap)
+    assert csv["src"].astype(str).tolist() == pcap["src"].astype(str).tolist()
+    assert (csv["length"].to_numpy() == pcap["length"].to_numpy()).all()
+    assert pd.Series(csv["tcp_dstport"], dtype="float").fillna(-1).tolist() == pd.Series(pcap["tcp_dstport"], dtype="float").fillna(-1).tolist()
+
+
+def test_mixed_stack_csv_matches_pcap(tmp_path):
+    mix = {"arp": 0.1, "ipip": 0.1, "6in4": 0.1, "gre": 0.1, "vxlan": 0.1}
+    truth = generate_capture(str(tmp_path / "mixed.pcap"), 5_000, ipv6_ratio=0.3, stack_mix=mix)
+    generate_capture(str(tmp_path / "mixed.csv"), 5_000, fmt="csv", ipv6_ratio=0.3, stack_mix=mix)
+    pcap = parse_pcap_auto(str(tmp_path / "mixed.pcap"))
+    csv = parse_pcap_auto(str(tmp_path / "mixed.csv"))
+
+    # skema & nilai sama dari kedua backend
+    assert pcap.dtypes.equals(csv.dtypes)
+    for col in ("src", "dst", "inner_src", "inner_dst", "protocol", "ethertype", "udp_dstport", "l3"):
+        assert pcap[col].astype(object).tolist() == csv[col].astype(object).tolist()
+    counts = truth["encap_counts"]
+    assert (pcap["l3"] == "ARP").sum() == counts["arp"]
+    assert pcap["inner_src"].notna().sum() == counts["ipip"] + counts["6in4"] + counts["gre"] + counts["vxlan"]
+
+
+def test_bench_size_times_every_stage(tmp_path):
+    results = bench_size(2_000, str(tmp_path), formats=("pcap", "csv"), repeat=1)
+    stages = {r["stage"] for r in results}
+
+    assert {"parse_native_pcap", "parse_native_mixed_stack", "parse_csv", "preprocess_packets", "summary_cube", "page_summary",
+            "flows", "pca_fit", "detector_port_scan", "packet_index", "interactive_pages",
+            "batch_analyze_capture", "batch_analyze"} <= stages
+    timed = [r for r in results if "seconds" in r]
+    batch = next(r for r in results if r["stage"] == "batch_analyze_capture")
+    assert batch["interactive_seconds"] > 0 and batch["speedup_vs_interactive"] > 0
+    assert all(r["rows_per_sec"] >= 0 and r["peak_rss_mb"] > 0 for r in timed)
+
+
+def test_compare_flags_regressions_only_beyond_tolerance():
+    baseline = {"results": [{"packets": 1_000, "stage": "flows", "seconds": 1.0, "peak_rss_mb": 100.0}]}
+
+    def run(seconds, rss):
+        return {"results": [{"packets": 1_000, "stage": "flows", "seconds": seconds, "peak_rss_mb": rss}]}
+
+    assert compare(run(1.2, 110.0), baseline) == []
+    assert len(compare(run(1.5, 110.0), baseline)) == 1
+    assert len(compare(run(1.0, 200.0), baseline)) == 1
+    slow_batch = {"results": [{"packets": 1_000, "stage": "batch_analyze_capture", "seconds": 0.5,
+                               "peak_rss_mb": 100.0, "speedup_vs_interactive": 4.0}]}
+    assert len(compare(slow_batch, baseline)) == 1
+    assert parse_size("10k") == 10_000 and parse_size("1.5m") == 1_500_000
@@ -0,0 +1,109 @@
+import gc
+import threading
+import numpy as np
+import pandas as pd
+import pytest
+from core.datasets import DatasetRegistry, RESIDENT, SPILLED, spill_stem
+
+
+def test_sessions_share_one_copy_and_load_once(tmp_path, packets):
+    registry = DatasetRegistry(spill_dir=str(tmp_path / "spill"))
+    df = packets(3_000)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return {"df": df, "name": "capture"}
+
+    handles = []
+    threads = [threading.Thread(target=lambda: handles.append(registry.get_or_load("abc", loader))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert all(np.shares_memory(h.df["length"].to_numpy(), df["length"].to_numpy()) for h in handles)
+    assert registry.report()["sesi"].tolist() == [5]
+
+    handles[0].release()
+    del handles[1:]
+    gc.collect()
+    assert registry.report()["sesi"].tolist() == [0]
+    assert registry.stats()["shares"] == 4
+
+
+def test_budget_spills_lru_and_reloads_identical(tmp_path, packets):
+    a_df, b_df = packets(3_000, seed=1), packets(3_000, seed=2)
+    registry = DatasetRegistry(budget_bytes=int(a_df.memory_usage(deep=True).sum() * 1.5),
+                               spill_dir=str(tmp_path / "spill"))
+
+    a = registry.put("a", a_df, flows=None, name="a")
+    b = registry.put("b", b_df, name="b")
+    assert registry.entry("a").state == SPILLED and registry.entry("b").state == RESIDENT
+    assert len(list(registry.spill_dir.glob(f"{spill_stem('a')}.*.arrow"))) == 1
+
+    reloaded = a.df
+    pd.testing.assert_frame_equal(reloaded, a_df)
+    assert not reloaded["length"].to_numpy().flags.writeable
+    assert registry.entry("a").state == RESIDENT and registry.entry("b").state == SPILLED
+    assert registry.stats()["resident_bytes"] <= registry.budget_bytes
+
+    # dataset tanpa sesi dilepas (bukan di-spill) saat memori dibutuhkan
+    b.release()
+    registry.put("c", packets(3_000, seed=3), name="c")
+    assert "b" not in set(registry.report()["dataset"]) and not list(registry.spill_dir.glob(f"{spill_stem('b')}.*"))
+    assert registry.stats()["reloads"] == 1
+
+
+def test_handles_are_read_only_views(tmp_path, packets):
+    registry = DatasetRegistry(spill_dir=str(tmp_path / "spill"))
+    df = packets(3_000)
+    first, second = registry.put("a", df), registry.open("a")
+
+    view = first.df
+    for col in ["length", "src", "protocol", "tcp_dstport", "time"]:
+        with pytest.raises((ValueError, AssertionError)):
+            view.iloc[0, view.columns.get_loc(col)] = view[col].iloc[1]
+    pd.testing.assert_frame_equal(second.df, df)
+
+    # kolom baru / pengganti hanya ada di view pemanggil
+    view["length"] = 0
+    view["tag"] = 1
+    other = second.df
+    assert "tag" not in other and other["length"].equals(df["length"])
+
+
+def test_spill_handles_free_text_keys_and_partial_failure(tmp_path, packets, monkeypatch):
+    import pyarrow as pa
+
+    df, flows = packets(2_000, seed=1), packets(500, seed=2)
+    budget = int(df.memory_usage(deep=True).sum() * 1.5)
+    registry = DatasetRegistry(budget_bytes=budget, spill_dir=str(tmp_path / "spill"))
+    key = "upload/../" + "x" * 400
+
+    a = registry.put(key, df, flows=flows, name="a")
+    registry.put("b", packets(2_000, seed=3), name="b")
+
+    assert registry.entry(key).state == SPILLED
+    assert sorted(p.name for p in registry.spill_dir.iterdir()) == \
+        [f"{spill_stem(key)}.{table}.arrow" for table in ("df", "flows")]
+    pd.testing.assert_frame_equal(a.flows, flows)
+
+    # tulisan tabel kedua gagal: dataset tetap utuh di memori dan tidak ada file tersisa
+    real_new_file = pa.ipc.new_file
+    writes = []
+
+    def failing_new_file(sink, schema):
+        writes.append(schema)
+        if len(writes) == 2:
+            raise OSError("disk penuh")
+        return real_new_file(sink, schema)
+
+    monkeypatch.setattr(pa.ipc, "new_file", failing_new_file)
+    registry.put("c", packets(2_000, seed=4), name="c")
+
+    entry = registry.entry(key)
+    assert len(writes) == 2
+    assert entry.state == RESIDENT and entry.df is not None and entry.flows is not None
+    assert not list(registry.spill_dir.glob(f"{spill_stem(key)}.*"))
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+from core.detectors import DETECTORS, run_detector, run_detectors
+from core.flows import build_flows
+from core.preprocessor import preprocess_packets
+
+
+def packets_with_burst_and_scan():
+    rng = np.random.default_rng(0)
+    rows = []
+    # trafik dasar: 5 host, ~10 paket per menit selama 30 menit
+    for minute in range(30):
+        for host in range(5):
+            for i in range(10 + rng.integers(0, 3)):
+                rows.append((minute * 60 + i, f"10.0.0.{host}", "10.0.1.1", 40000 + i, 443, 500, 0x18))
+    # lonjakan host 0 di menit 25
+    rows += [(25 * 60 + i * 0.1, "10.0.0.0", "10.0.1.1", 50000, 443, 500, 0x18) for i in range(200)]
+    # port scan dari 10.9.9.9: satu SYN ke 300 port
+    rows += [(600 + i * 0.01, "10.9.9.9", "10.0.1.1", 60000, port, 60, 0x02) for port in range(1, 301)]
+    df = pd.DataFrame(rows, columns=["time", "src", "dst", "tcp_srcport", "tcp_dstport", "length", "tcp_flags"])
+    df["time"] = df["time"] + 1_700_000_000.0
+    df["protocol"] = 6
+    return preprocess_packets(df)
+
+
+def test_registry_exposes_builtin_detectors():
+    assert {"length_threshold", "host_volume_ewma", "port_scan", "flow_isolation_forest"} <= set(DETECTORS)
+
+
+def test_host_volume_detector_flags_burst():
+    df = packets_with_burst_and_scan()
+    result = run_detector("host_volume_ewma", df)
+
+    top = result.top(1).iloc[0]
+    assert top["src"] == "10.0.0.0" and top["minute"] == pd.Timestamp(1_700_000_000 + 25 * 60, unit="s").floor("min")
+    assert result.rows == len(df) and result.runtime_s > 0
+
+
+def test_port_scan_and_isolation_forest_use_flows():
+    df = packets_with_burst_and_scan()
+    flows = build_flows(df)
+
+    results = run_detectors(df, flows, names=["port_scan", "flow_isolation_forest", "length_threshold"])
+
+    scan = results["port_scan"].top(5)
+    assert scan["src"].tolist() == ["10.9.9.9"]
+    assert scan["syn_only_flows"].iloc[0] == 300
+    forest = results["flow_isolation_forest"]
+    assert len(forest.scores) == len(flows) and forest.rows == len(flows)
+    assert results["length_threshold"].anomalies == 0
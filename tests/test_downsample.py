@@ -0,0 +1,57 @@
+import json
+import numpy as np
+import pandas as pd
+import plotly.express as px
+from core.aggregates import build_summary_cube
+from core.downsample import choose_resolution, bin_times, traffic_series, lttb, minmax, downsample, payload_estimate
+
+
+def _packets(n, span):
+    rng = np.random.default_rng(0)
+    time = pd.Timestamp("2024-01-01") + pd.to_timedelta(np.sort(rng.uniform(0, span.total_seconds(), n)), unit="s")
+    df = pd.DataFrame({"time": time, "length": rng.integers(60, 1500, n), "protocol": 6})
+    df["minute"] = df["time"].dt.floor("min")
+    return df
+
+
+def test_resolution_follows_time_span():
+    start = pd.Timestamp("2024-01-01")
+    assert choose_resolution(start, start + pd.Timedelta(minutes=30)) == "s"
+    assert choose_resolution(start, start + pd.Timedelta(days=3)) == "min"
+    assert choose_resolution(start, start + pd.Timedelta(days=60)) == "h"
+
+
+def test_bin_times_matches_groupby():
+    df = _packets(5_000, pd.Timedelta(minutes=20))
+    binned = bin_times(df["time"], "s", df["length"])
+    expected = df.groupby(df["time"].dt.floor("s"))["length"].sum()
+    assert binned.sum() == df["length"].sum()
+    assert np.allclose(binned.reindex(expected.index), expected)
+
+
+def test_traffic_series_rebins_long_captures():
+    df = _packets(20_000, pd.Timedelta(days=30))
+    traffic, freq = traffic_series(df, build_summary_cube(df))
+    assert freq == "h"
+    assert traffic["packets"].sum() == len(df)
+    assert len(traffic) <= 30 * 24 + 1
+
+
+def test_downsampling_bounds_points_and_keeps_extremes():
+    y = np.random.default_rng(1).normal(size=100_000).cumsum()
+    y[54_321] = y.max() + 100
+    series = pd.Series(y, index=pd.date_range("2024-01-01", periods=len(y), freq="s"))
+
+    index = lttb(np.arange(len(y)), y, 1_000)
+    assert len(index) == 1_000 and index[0] == 0 and index[-1] == len(y) - 1
+    assert np.all(np.diff(index) > 0)
+    assert 54_321 in minmax(y, 1_000)
+
+    reduced = downsample(series, 1_000, method="minmax")
+    assert len(reduced) <= 1_000 and reduced.max() == series.max()
+    points = reduced.reset_index()
+    stats = payload_estimate(points)
+    # perkiraan mendekati ukuran data trace yang benar-benar diserialisasi Plotly
+    data = json.loads(px.line(points, x="index", y=0).to_json())["data"][0]
+    actual = len(json.dumps(data["x"])) + len(json.dumps(data["y"]))
+    assert stats["points"] == len(reduced) and abs(stats["bytes"] - actual) < 0.1 * actual
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+from benchmarks.synthetic import generate_capture
+from core.auto_parser import parse_pcap_auto
+from core.flows import build_flows
+
+
+def packets(rows):
+    df = pd.DataFrame(rows, columns=["time", "src", "dst", "tcp_srcport", "tcp_dstport", "protocol", "length", "tcp_flags"])
+    df["time"] = pd.to_datetime(df["time"], unit="s")
+    for col in ("tcp_srcport", "tcp_dstport"):
+        df[col] = df[col].astype("UInt16")
+    df["tcp_flags"] = df["tcp_flags"].astype("UInt8")
+    return df
+
+
+def test_build_flows_splits_on_key_and_idle_timeout():
+    df = packets([
+        (0.0, "a", "b", 1000, 80, 6, 60, 0x02),
+        (0.5, "b", "a", 80, 1000, 6, 60, 0x12),  # arah balik = flow lain
+        (1.0, "a", "b", 1000, 80, 6, 100, 0x10),
+        (3.0, "a", "b", 1000, 80, 6, 200, 0x11),
+        (100.0, "a", "b", 1000, 80, 6, 40, 0x02),  # setelah idle timeout
+    ])
+
+    flows = build_flows(df, idle_timeout=10)
+
+    assert len(flows) == 3
+    first = flows[(flows["src"] == "a") & (flows["start"] == pd.Timestamp(0, unit="s"))].iloc[0]
+    assert first["packets"] == 3 and first["bytes"] == 360
+    assert first["min_length"] == 60 and first["max_length"] == 200
+    assert first["duration"] == pytest.approx(3.0)
+    assert first["iat_mean"] == pytest.approx(1.5)
+    assert first["iat_min"] == pytest.approx(1.0) and first["iat_max"] == pytest.approx(2.0)
+    assert first["iat_std"] == pytest.approx(0.5)
+    assert (first["syn_count"], first["ack_count"], first["fin_count"]) == (1, 2, 1)
+    assert flows["packets"].sum() == len(df)
+    assert flows.loc[flows["packets"] == 1, "iat_mean"].isna().all()
+
+
+def test_build_flows_active_timeout():
+    df = packets([(float(t), "a", "b", 1, 2, 6, 50, 0x10) for t in range(0, 100, 5)])
+
+    flows = build_flows(df, idle_timeout=60, active_timeout=30)
+
+    assert flows["packets"].tolist() == [6, 6, 6, 2]
+    assert (flows["duration"] <= 30).all()
+
+
+def test_build_flows_matches_groupby(tmp_path):
+    path = tmp_path / "capture.pcap"
+    generate_capture(str(path), 5_000, n_hosts=8, duration=600)
+    df = parse_pcap_auto(str(path))
+
+    flows = build_flows(df, idle_timeout=1e9, active_timeout=1e9)
+
+    sport = df["tcp_srcport"].fillna(df["udp_srcport"])
+    dport = df["tcp_dstport"].fillna(df["udp_dstport"])
+    expected = df.groupby([df["src"], df["dst"], sport, dport, df["protocol"]],
+                          dropna=False, observed=True)["length"].agg(["size", "sum"])
+    assert len(flows) == len(expected)
+    assert flows["packets"].sum() == len(df)
+    assert sorted(flows["bytes"]) == sorted(expected["sum"].astype(np.int64))
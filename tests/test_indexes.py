@@ -0,0 +1,58 @@
+import ipaddress
+import numpy as np
+import pandas as pd
+from core.aggregates import source_ports, destination_ports
+from core.indexes import PacketFilter, sort_by_time, build_packet_index
+
+
+def _indexed(packets):
+    # Acak urutan supaya sort_by_time benar-benar bekerja
+    df = sort_by_time(packets(5_000, seed=3).sample(frac=1, random_state=0))
+    return df, build_packet_index(df)
+
+
+def _mask(df, f: PacketFilter) -> np.ndarray:
+    mask = np.ones(len(df), dtype=bool)
+    if f.start is not None:
+        mask &= ((df["time"] >= f.start) & (df["time"] <= f.end)).to_numpy()
+    for col, cidr in (("src", f.src_cidr), ("dst", f.dst_cidr)):
+        if cidr:
+            net = ipaddress.ip_network(cidr, strict=False)
+            mask &= np.array([ipaddress.ip_address(a) in net for a in df[col]])
+    if f.ports:
+        mask &= (source_ports(df).isin(f.ports) | destination_ports(df).isin(f.ports)).to_numpy(dtype=bool)
+    if f.protocols:
+        mask &= (df["l3"].isin(f.protocols) | df["l4"].isin(f.protocols) | df["l7"].isin(f.protocols)).to_numpy()
+    return mask
+
+
+def test_index_selection_matches_boolean_masks(packets):
+    df, index = _indexed(packets)
+    assert df["time"].is_monotonic_increasing and df.index.equals(pd.RangeIndex(len(df)))
+    t0, t1 = index.time_bounds()
+    start, end = t0 + (t1 - t0) / 4, t0 + (t1 - t0) / 2
+    host = str(df["src"].value_counts().index[0])
+    port = int(destination_ports(df).value_counts().index[0])
+    filters = [
+        PacketFilter(src_cidr=host),
+        PacketFilter(dst_cidr="10.0.0.0/8"),
+        PacketFilter(ports=(port, 53)),
+        PacketFilter(protocols=("UDP", "TLS")),
+        PacketFilter(start=start, end=end, src_cidr="10.0.0.0/24", ports=(port,)),
+        PacketFilter(start=start, end=end, dst_cidr=host, protocols=("TCP",)),
+    ]
+    for f in filters:
+        view = index.select(df, f)
+        assert view.index.equals(df.index[_mask(df, f)]), f.key
+    assert len(index.select(df, filters[0])) > 0
+
+
+def test_time_only_filter_is_a_view(packets):
+    df, index = _indexed(packets)
+    t0, t1 = index.time_bounds()
+    f = PacketFilter(start=t0 + (t1 - t0) / 3, end=t1)
+    rows = index.select_rows(df, f)
+    assert isinstance(rows, slice)
+    assert index.select(df, f).index.equals(df.index[_mask(df, f)])
+    assert not PacketFilter().active and f.active
+    assert len(index.select(df, PacketFilter(start=t1 + pd.Timedelta(1, "s")))) == 0
@@ -0,0 +1,79 @@
+import os
+import time
+import pytest
+from benchmarks.synthetic import generate_capture
+from core.jobs import JobManager, DONE, FAILED, CANCELLED
+from core.parse_cache import get_parse_cache
+
+
+pytestmark = pytest.mark.usefixtures("isolated_cache")
+
+
+def wait(manager, job_id, timeout=30):
+    deadline = time.time() + timeout
+    while not manager.get(job_id).finished:
+        assert time.time() < deadline, "job tidak selesai"
+        time.sleep(0.05)
+    return manager.get(job_id)
+
+
+def test_job_manager_delivers_result_and_progress(tmp_path):
+    path = tmp_path / "capture.pcap"
+    generate_capture(str(path), 2_000)
+    manager = JobManager(max_workers=1)
+
+    job = wait(manager, manager.submit(str(path), delete_after=True))
+
+    assert job.status == DONE and job.progress == 1.0
+    assert job.packets_done == 2_000 and job.bytes_done == job.total_bytes
+    dataset = job.result["dataset"]
+    assert len(dataset.df) == 2_000
+    assert dataset.cube.total_packets == 2_000
+    assert dataset.flows["packets"].sum() == 2_000
+    assert not os.path.exists(path)
+    manager.shutdown()
+
+
+def test_job_manager_sketch_mode_cube(tmp_path):
+    path = tmp_path / "capture.pcap"
+    generate_capture(str(path), 2_000)
+    manager = JobManager(max_workers=1)
+
+    exact = wait(manager, manager.submit(str(path))).result
+    sketch = wait(manager, manager.submit(str(path), sketch_params={"capacity": 100})).result
+
+    # mode cube berbeda -> dataset terpisah; cube sketch tanpa grup per host
+    assert exact["dataset_key"] != sketch["dataset_key"]
+    assert exact["dataset"].cube.by_src is not None and exact["dataset"].cube.sketches is None
+    assert sketch["dataset"].cube.by_src is None
+    assert sketch["dataset"].cube.sketches.total_packets == 2_000
+    # parse cache dikunci hash isi saja: ingest kedua tidak mem-parse ulang
+    assert get_parse_cache().stats()["hits"] == 1 and get_parse_cache().stats()["misses"] == 1
+    manager.shutdown()
+
+
+def test_job_manager_queues_and_cancels(tmp_path):
+    paths = []
+    for i in range(3):
+        paths.append(tmp_path / f"capture{i}.pcap")
+        generate_capture(str(paths[-1]), 1_000, seed=i)
+    manager = JobManager(max_workers=1)
+
+    ids = [manager.submit(str(p)) for p in paths]
+    manager.cancel(ids[2])
+    results = [wait(manager, job_id) for job_id in ids]
+
+    assert [r.status for r in results[:2]] == [DONE, DONE]
+    assert results[2].status == CANCELLED and results[2].result is None
+    manager.shutdown()
+
+
+def test_job_manager_reports_failure(tmp_path):
+    path = tmp_path / "bad.pcap"
+    path.write_bytes(b"bukan pcap" * 10)
+    manager = JobManager(max_workers=1)
+
+    job = wait(manager, manager.submit(str(path)))
+
+    assert job.status == FAILED and job.error
+    manager.shutdown()
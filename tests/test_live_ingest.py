@@ -0,0 +1,112 @@
+import os
+import pandas as pd
+from benchmarks.synthetic import generate_capture
+from core.auto_parser import parse_pcap_auto
+from core.live_ingest import CaptureTail, DirectoryTail, SlidingWindows, LiveSession
+
+
+def test_capture_tail_reads_only_appended_records(tmp_path):
+    source = tmp_path / "source.pcap"
+    generate_capture(str(source), 1_000)
+    data = source.read_bytes()
+    live = tmp_path / "live.pcap"
+    live.write_bytes(data[:24])
+
+    tail = CaptureTail(str(live))
+    seen = []
+    # tulis dalam potongan yang memotong record di tengah
+    for start in range(24, len(data), 7_777):
+        with open(live, "ab") as f:
+            f.write(data[start:start + 7_777])
+        seen += [len(chunk) for chunk in tail.poll(chunk_rows=300)]
+    assert list(tail.poll()) == []
+
+    assert sum(seen) == 1_000
+    assert tail.checkpoint() == {str(live): len(data)}
+
+
+def test_directory_tail_follows_rotated_files(tmp_path):
+    for i in range(3):
+        generate_capture(str(tmp_path / f"dump-{i}.pcap"), 200, seed=i)
+        os.utime(tmp_path / f"dump-{i}.pcap", (1_000 + i, 1_000 + i))
+    tail = DirectoryTail(str(tmp_path))
+
+    assert sum(len(c) for c in tail.poll()) == 600
+    generate_capture(str(tmp_path / "dump-3.pcap"), 50, seed=3)
+    assert sum(len(c) for c in tail.poll()) == 50
+
+
+def test_sliding_windows_match_recent_packets(tmp_path):
+    path = tmp_path / "capture.pcap"
+    generate_capture(str(path), 3_000, duration=7_200)
+    df = parse_pcap_auto(str(path))
+
+    windows = SlidingWindows((5, 60))
+    for start in range(0, len(df), 400):
+        windows.update(df.iloc[start:start + 400])
+
+    latest = df["minute"].max()
+    for minutes in (5, 60):
+        recent = df[df["minute"] > latest - pd.Timedelta(minutes=minutes)]
+        assert windows.cube(minutes).total_packets == len(recent)
+        assert len(windows.frame(minutes)) == len(recent)
+    assert len(windows.buckets) <= 60
+
+
+def test_live_session_refresh_counts_new_packets(tmp_path):
+    path = tmp_path / "live.pcap"
+    generate_capture(str(path), 500)
+    session = LiveSession(str(path))
+
+    assert session.refresh() == 500
+    assert session.refresh() == 0
+    assert session.windows.cube(60).total_packets > 0
+
+
+def test_sliding_windows_fold_new_packets_into_window(tmp_path):
+    from core.flows import build_flows, FLOW_KEYS
+
+    path = tmp_path / "capture.pcap"
+    generate_capture(str(path), 4_000, duration=1_200)
+    df = parse_pcap_auto(str(path))
+
+    windows = SlidingWindows((5, 60))
+    for start in range(0, len(df), 250):
+        windows.update(df.iloc[start:start + 250])
+        frame = windows.frame(60)
+        # frame, cube, dan flow disimpan per versi, tidak dirakit ulang tiap panggilan
+        assert windows.frame(60) is frame and windows.cube(60) is windows.cube(60)
+        flows = {minutes: windows.flows(minutes) for minutes in (5, 60)}
+
+    latest = df["minute"].max()
+    for minutes in (5, 60):
+        recent = df[df["minute"] > latest - pd.Timedelta(minutes=minutes)]
+        fresh = SlidingWindows((5, 60))
+        fresh.update(recent)
+        assert windows.cube(minutes).total_packets == fresh.cube(minutes).total_packets == len(recent)
+        assert list(windows.cube(minutes).large_packet_rows) == list(fresh.cube(minutes).large_packet_rows)
+        pd.testing.assert_frame_equal(windows.frame(minutes), fresh.frame(minutes), check_categorical=False)
+
+    # flow jendela 5 menit juga melewati menit yang keluar jendela
+    order = FLOW_KEYS + ["start"]
+    for minutes in (5, 60):
+        expected = build_flows(windows.frame(minutes)).sort_values(order).reset_index(drop=True)
+        folded = flows[minutes].sort_values(order).reset_index(drop=True)
+        pd.testing.assert_frame_equal(folded.astype(object), expected.astype(object))
+
+
+def test_window_key_follows_contents_not_version(tmp_path):
+    path = tmp_path / "capture.pcap"
+    generate_capture(str(path), 2_000, duration=1_800)
+    df = parse_pcap_auto(str(path))
+    windows = SlidingWindows((5, 60))
+    windows.update(df)
+    key5, key60, version = windows.key(5), windows.key(60), windows.version
+
+    # paket terlambat di luar jendela 5 menit: versi naik, isi jendela 5 menit tetap
+    late = df[df["minute"] <= df["minute"].max() - pd.Timedelta(minutes=10)].head(3)
+    windows.update(late)
+
+    assert windows.version == version + 1
+    assert windows.key(5) == key5
+    assert windows.key(60) != key60
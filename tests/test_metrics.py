@@ -0,0 +1,48 @@
+import json
+import pandas as pd
+from core.metrics import MetricsRegistry, StageTimer, metrics, timed_stage, timed_iter, RequestProfiler
+
+
+def test_timed_stage_and_iter_record_rows():
+    metrics.reset()
+
+    @timed_stage("test.double")
+    def double(df):
+        return pd.concat([df, df])
+
+    double(pd.DataFrame({"a": range(10)}))
+    chunks = list(timed_iter("test.chunks", (pd.DataFrame({"a": range(n)}) for n in (3, 4, 5))))
+
+    summary = metrics.summary().set_index("stage")
+    assert summary.loc["test.double", "rows_in"] == 10 and summary.loc["test.double", "rows_out"] == 20
+    assert summary.loc["test.chunks", "calls"] == 1 and summary.loc["test.chunks", "rows_out"] == 12
+    assert len(chunks) == 3
+    recent = metrics.recent()
+    assert {"wall_s", "cpu_s", "mem_delta_mb"} <= set(recent.columns)
+
+
+def test_errors_are_counted_and_exports_written(tmp_path, monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setenv("NIDS_METRICS_LOG", str(tmp_path / "metrics.jsonl"))
+    monkeypatch.setenv("NIDS_METRICS_PROM", str(tmp_path / "metrics.prom"))
+
+    timer = StageTimer("test.fail", rows_in=5, registry=registry)
+    try:
+        with timer:
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    timer.record()
+
+    line = json.loads((tmp_path / "metrics.jsonl").read_text().splitlines()[0])
+    assert line["stage"] == "test.fail" and line["error"] == "ValueError"
+    prom = (tmp_path / "metrics.prom").read_text()
+    assert 'nids_stage_errors_total{stage="test.fail"} 1' in prom
+    assert "# TYPE nids_stage_wall_seconds_total counter" in prom
+
+
+def test_request_profiler_reports_functions():
+    profiler = RequestProfiler("cProfile").start()
+    sorted(range(10_000), key=lambda x: -x)
+    report = profiler.stop()
+    assert "function calls" in report
@@ -0,0 +1,61 @@
+import pytest
+import pandas as pd
+from core.packet_store import PacketStore
+
+
+def test_append_partitions_by_hour(tmp_path, packets):
+    df = packets(duration=3 * 3_600)
+    store = PacketStore(str(tmp_path / "store"))
+
+    assert store.append("lab", df.iloc[:2_000]) == 2_000
+    assert store.append("lab", df.iloc[2_000:]) == 2_000
+
+    hours = sorted(p.name for p in (tmp_path / "store" / "lab").iterdir())
+    assert len(hours) == df["time"].dt.floor("h").nunique()
+    assert all(h.startswith("hour=") for h in hours)
+
+    info = store.describe("lab")
+    assert info["rows"] == len(df)
+    assert info["start"] == df["time"].min() and info["end"] == df["time"].max()
+    assert store.datasets() == ["lab"]
+
+
+def test_query_matches_pandas_filter(tmp_path, packets):
+    df = packets(duration=3 * 3_600)
+    store = PacketStore(str(tmp_path / "store"))
+    store.append("lab", df)
+
+    start = df["time"].min() + pd.Timedelta(minutes=50)
+    end = start + pd.Timedelta(minutes=90)
+    src = df["src"].value_counts().index[:3].tolist()
+    protocol = int(df["protocol"].dropna().mode()[0])
+
+    result = store.query("lab", start=start, end=end, src=src, protocol=protocol)
+    expected = df[(df["time"] >= start) & (df["time"] < end)
+                  & df["src"].isin(src) & (df["protocol"] == protocol)]
+
+    assert len(result) == len(expected) > 0
+    assert result["time"].is_monotonic_increasing
+    assert result["time"].tolist() == expected["time"].tolist()
+    assert set(result["src"].astype(str)) <= set(src)
+    assert "minute" in result.columns
+
+
+def test_query_missing_dataset_raises(tmp_path):
+    store = PacketStore(str(tmp_path / "store"))
+    with pytest.raises(FileNotFoundError):
+        store.query("nope")
+
+
+def test_append_clusters_rows_and_bumps_version(tmp_path, packets):
+    df = packets(duration=3 * 3_600)
+    store = PacketStore(str(tmp_path / "store"))
+    store.append("lab", df.iloc[:2_000])
+    version = store.describe("lab")["version"]
+
+    for fragment in store._dataset("lab").get_fragments():
+        part = fragment.to_table(columns=["protocol", "src"]).to_pandas()
+        assert part["protocol"].is_monotonic_increasing
+
+    store.append("lab", df.iloc[2_000:])
+    assert store.describe("lab")["version"] != version
@@ -0,0 +1,59 @@
+import os
+import pandas as pd
+from benchmarks.synthetic import generate_capture
+from core.parse_cache import ParseCache, parse_pcap_cached, file_digest
+
+
+def test_parse_pcap_cached_hit_returns_same_table(tmp_path):
+    capture = tmp_path / "capture.pcap"
+    generate_capture(str(capture), 1_000, ipv6_ratio=0.2)
+    cache = ParseCache(cache_dir=str(tmp_path / "cache"))
+
+    first = parse_pcap_cached(str(capture), cache=cache)
+    second = parse_pcap_cached(str(capture), cache=cache)
+
+    pd.testing.assert_frame_equal(first, second)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    assert stats["bytes_saved"] == os.path.getsize(capture)
+    # kolom lebar tetap dibaca langsung dari file yang di-memory-map
+    assert not second["length"].to_numpy().flags.writeable
+
+
+def test_parse_cache_key_depends_on_content(tmp_path):
+    a, b = tmp_path / "a.pcap", tmp_path / "b.pcap"
+    generate_capture(str(a), 100, seed=1)
+    generate_capture(str(b), 100, seed=2)
+    assert file_digest(str(a)) != file_digest(str(b))
+    assert file_digest(str(a), chunk_size=7) == file_digest(str(a))
+
+
+def test_parse_cache_lru_eviction(tmp_path):
+    df = pd.DataFrame({"x": range(10_000)})
+    cache = ParseCache(cache_dir=str(tmp_path), max_bytes=10**9)
+    cache.put("old", df)
+    cache.put("new", df)
+    os.utime(tmp_path / "old.arrow", (1, 1))
+    cache.get("new")
+
+    cache.max_bytes = (tmp_path / "new.arrow").stat().st_size
+    cache.evict()
+
+    assert not (tmp_path / "old.arrow").exists()
+    assert (tmp_path / "new.arrow").exists()
+
+
+def test_parse_cache_hit_survives_concurrent_eviction(tmp_path, monkeypatch):
+    cache = ParseCache(cache_dir=str(tmp_path))
+    cache.put("k", pd.DataFrame({"x": range(100)}))
+
+    def evicted(path, *args):
+        # sesi lain menghapus file tepat setelah tabel terbaca
+        os.remove(path)
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr("core.parse_cache.os.utime", evicted)
+    assert cache.get("k")["x"].tolist() == list(range(100))
+    assert cache.stats()["entries"] == 1
+    cache.evict()
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,160 @@
+import struct
+import pandas as pd
+import pytest
+from benchmarks.synthetic import write_pcap, write_pcapng, generate_capture, _pcapng_header
+from parsers.parse_pcap_native import parse_pcap_file, iter_pcap_chunks, concat_chunks
+
+ETH_V4 = b"\x00" * 12 + b"\x08\x00"
+ETH_V6 = b"\x00" * 12 + b"\x86\xdd"
+
+
+def ipv4(proto: int, src: bytes, dst: bytes, frag: int = 0) -> bytes:
+    return struct.pack("!BBHHHBBH4s4s", 0x45, 0, 40, 1, frag, 64, proto, 0, src, dst)
+
+
+def ipv6(next_header: int, src: bytes, dst: bytes) -> bytes:
+    return struct.pack("!IHBB16s16s", 0x60000000, 8, next_header, 64, src, dst)
+
+
+def sample_frames():
+    v6_src = bytes.fromhex("20010db8000000000000000000000001")
+    v6_dst = bytes.fromhex("20010db8000000000000000000000002")
+    return [
+        ETH_V4 + ipv4(6, bytes([192, 168, 1, 10]), bytes([10, 0, 0, 1])) + struct.pack("!HHIIBB", 51000, 443, 0, 0, 0x50, 0x12) + b"\x00" * 6,
+        ETH_V6 + ipv6(17, v6_src, v6_dst) + struct.pack("!HHHH", 5353, 53, 8, 0),
+        b"\x00" * 12 + b"\x81\x00\x00\x05\x08\x00" + ipv4(17, bytes([172, 16, 0, 1]), bytes([172, 16, 0, 2])) + struct.pack("!HHHH", 1000, 123, 8, 0),
+        ETH_V4 + ipv4(17, bytes([10, 0, 0, 5]), bytes([10, 0, 0, 6]), frag=0x0010) + b"\x00" * 8,
+        b"\x00" * 12 + b"\x08\x06" + b"\x00" * 28,
+    ]
+
+
+@pytest.mark.parametrize("writer", [write_pcap, write_pcapng])
+def test_parse_pcap_native_headers(tmp_path, writer):
+    path = tmp_path / "sample.cap"
+    frames = sample_frames()
+    writer(str(path), frames, [1_700_000_000.5 + i for i in range(len(frames))], [100, 200, 300, 400, 60])
+
+    df = parse_pcap_file(str(path))
+
+    assert len(df) == 5
+    assert df["time"].iloc[0] == pytest.approx(1_700_000_000.5)
+    assert df["length"].tolist() == [100, 200, 300, 400, 60]
+    assert df["src"].iloc[0] == "192.168.1.10" and df["dst"].iloc[0] == "10.0.0.1"
+    assert df["src"].iloc[1] == "2001:db8::1" and df["dst"].iloc[1] == "2001:db8::2"
+    assert df["src"].iloc[2] == "172.16.0.1"
+    assert df["tcp_dstport"].iloc[0] == 443 and pd.isna(df["udp_dstport"].iloc[0])
+    assert df["udp_srcport"].iloc[1] == 5353 and df["udp_dstport"].iloc[1] == 53
+    assert df["udp_dstport"].iloc[2] == 123
+    # fragmen lanjutan tidak punya header UDP; ARP bukan IP
+    assert pd.isna(df["udp_dstport"].iloc[3])
+    assert pd.isna(df["src"].iloc[4]) and pd.isna(df["protocol"].iloc[4])
+    assert df["protocol"].tolist()[:4] == [6, 17, 17, 17]
+    assert df["tcp_flags"].iloc[0] == 0x12 and df["tcp_flags"].isna().sum() == 4
+
+
+def test_parse_pcap_native_dual_stack_and_tunnels(tmp_path):
+    outer = (bytes([192, 0, 2, 1]), bytes([192, 0, 2, 2]))
+    v6_src = bytes.fromhex("20010db8000000000000000000000001")
+    v6_dst = bytes.fromhex("20010db8000000000000000000000002")
+    tcp = struct.pack("!HHIIBB", 51000, 443, 0, 0, 0x50, 0x18) + b"\x00" * 6
+    arp = struct.pack("!HHBBH6s4s6s4s", 1, 0x0800, 6, 4, 1, b"\x00" * 6, bytes([10, 0, 0, 7]), b"\x00" * 6, bytes([10, 0, 0, 8]))
+    frames = [
+        b"\x00" * 12 + b"\x08\x06" + arp,
+        ETH_V4 + ipv4(4, *outer) + ipv4(6, bytes([10, 1, 0, 1]), bytes([10, 1, 0, 2])) + tcp,
+        ETH_V4 + ipv4(41, *outer) + ipv6(6, v6_src, v6_dst) + tcp,
+        ETH_V4 + ipv4(47, *outer) + b"\x00\x00\x86\xdd" + ipv6(6, v6_src, v6_dst) + tcp,
+        ETH_V4 + ipv4(17, *outer) + struct.pack("!HHHH", 40000, 4789, 0, 0) + b"\x08" + b"\x00" * 7
+        + ETH_V4 + ipv4(6, bytes([10, 2, 0, 1]), bytes([10, 2, 0, 2])) + tcp,
+        # ICMP error membawa header IP asli, bukan tunnel
+        ETH_V4 + ipv4(1, *outer) + b"\x03\x03\x00\x00\x00\x00\x00\x00" + ipv4(17, outer[1], outer[0]),
+    ]
+    path = tmp_path / "mixed.pcap"
+    write_pcap(str(path), frames, [float(i) for i in range(len(frames))])
+
+    df = parse_pcap_file(str(path))
+
+    assert df["src"].tolist()[:2] == ["10.0.0.7", "192.0.2.1"] and df["dst"].iloc[0] == "10.0.0.8"
+    assert df["ethertype"].tolist() == [0x0806] + [0x0800] * 5
+    assert pd.isna(df["protocol"].iloc[0]) and df["protocol"].tolist()[1:] == [4, 41, 47, 17, 1]
+    assert df["inner_src"].tolist()[1:5] == ["10.1.0.1", "2001:db8::1", "2001:db8::1", "10.2.0.1"]
+    assert df["inner_dst"].iloc[4] == "10.2.0.2"
+    assert pd.isna(df["inner_src"].iloc[0]) and pd.isna(df["inner_src"].iloc[5])
+    assert df["udp_dstport"].iloc[4] == 4789
+
+
+def test_parse_pcap_native_nanosecond_and_truncated(tmp_path):
+    path = tmp_path / "ns.pcap"
+    frames = sample_frames()[:2]
+    write_pcap(str(path), frames, [10.000000001, 11.25], nanosecond=True)
+    with open(path, "ab") as f:
+        f.write(struct.pack("<IIII", 12, 0, 60, 60) + b"\x00" * 10)  # record terakhir terpotong
+
+    df = parse_pcap_file(str(path))
+
+    assert len(df) == 2
+    assert df["time"].iloc[0] == pytest.approx(10.000000001, abs=1e-12)
+
+
+def test_iter_pcap_chunks_matches_full_parse(tmp_path):
+    path = tmp_path / "synthetic.pcapng"
+    info = generate_capture(str(path), 5_000, fmt="pcapng", ipv6_ratio=0.3)
+
+    chunks = list(iter_pcap_chunks(str(path), chunk_rows=1_000))
+    full = parse_pcap_file(str(path))
+
+    assert [len(c) for c in chunks] == [1_000] * 5
+    pd.testing.assert_frame_equal(concat_chunks(chunks), full, check_categorical=False)
+    assert int(full["length"].sum()) == info["bytes"]
+    assert full["src"].astype(str).str.contains(":").sum() == info["n_ipv6"]
+
+
+def test_parse_pcap_native_invalid_file(tmp_path):
+    path = tmp_path / "bogus.pcap"
+    path.write_bytes(b"not a capture at all")
+    assert parse_pcap_file(str(path)).empty
+
+
+def test_pcapng_simple_packet_blocks_take_neighbouring_time(tmp_path):
+    frame = sample_frames()[0]
+    pad = b"\x00" * ((-len(frame)) % 4)
+
+    def epb(ts: int) -> bytes:
+        total = 32 + len(frame) + len(pad)
+        return struct.pack("<IIIIIII", 6, total, 0, ts >> 32, ts & 0xFFFFFFFF, len(frame), len(frame)) \
+            + frame + pad + struct.pack("<I", total)
+
+    def spb() -> bytes:
+        total = 16 + len(frame) + len(pad)
+        return struct.pack("<III", 3, total, len(frame)) + frame + pad + struct.pack("<I", total)
+
+    path = tmp_path / "spb.pcapng"
+    t0, t1 = 1_700_000_000_000_000, 1_700_000_005_000_000
+    path.write_bytes(_pcapng_header(1) + spb() + epb(t0) + spb() + spb() + epb(t1) + spb())
+
+    expected = [1_700_000_000.0] * 4 + [1_700_000_005.0] * 2
+    assert parse_pcap_file(str(path))["time"].tolist() == expected
+    # SPB di awal batch berikutnya memakai waktu terakhir batch sebelumnya
+    assert concat_chunks(list(iter_pcap_chunks(str(path), chunk_rows=2)))["time"].tolist() == expected
+
+
+def test_concat_chunks_releases_chunks_while_copying(tmp_path):
+    import tracemalloc
+    from core.auto_parser import parse_pcap_iter
+    from parsers.parse_pcap_native import unify_categoricals
+
+    path = tmp_path / "capture.pcap"
+    generate_capture(str(path), 20_000)
+    expected = pd.concat(unify_categoricals(list(parse_pcap_iter(str(path), chunk_rows=2_000))), ignore_index=True)
+
+    tracemalloc.start()
+    chunks = list(parse_pcap_iter(str(path), chunk_rows=2_000))
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    df = concat_chunks(chunks)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # potongan dilepas per kolom: tambahan memori puncak jauh di bawah satu salinan tabel
+    assert chunks == []
+    assert peak - retained < retained / 2
+    pd.testing.assert_frame_equal(df, expected)
@@ -0,0 +1,79 @@
+import io
+import os
+import stat
+import pandas as pd
+from parsers.parse_pcap import open_tshark_reader, tshark_table_to_frame, parse_pcap_file
+from parsers.schema import PACKET_COLUMNS
+
+TSHARK_OUTPUT = (
+    "frame.time_epoch\tip.src\tip.dst\tframe.len\tip.proto\ttcp.srcport\ttcp.dstport\tudp.srcport\tudp.dstport\ttcp.flags\tframe.protocols\n"
+    "1700000000.123456000\t10.0.0.1\t10.0.0.2\t60\t6\t51000\t443\t\t\t0x0012\teth:ethertype:ip:tcp\n"
+    "1700000001.000000000\t10.0.0.2\t10.0.0.1\t90\t17\t\t\t5353\t53\t\teth:ethertype:ip:udp:dns\n"
+    "1700000002.000000000\t\t\t42\t\t\t\t\t\t\teth:ethertype:arp\n"
+)
+
+
+def test_tshark_reader_uses_typed_schema():
+    table = open_tshark_reader(io.BytesIO(TSHARK_OUTPUT.encode())).read_all()
+    df = tshark_table_to_frame(table)
+
+    assert list(df.columns) == PACKET_COLUMNS + ["layers"]
+    assert df["time"].dtype == "float64"
+    assert str(df["length"].dtype) == "uint32"
+    assert str(df["protocol"].dtype) == "UInt8"
+    assert str(df["tcp_dstport"].dtype) == "UInt16"
+    assert isinstance(df["src"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["layers"].dtype, pd.CategoricalDtype)
+    assert df["tcp_dstport"].iloc[0] == 443 and pd.isna(df["tcp_dstport"].iloc[1])
+    assert pd.isna(df["src"].iloc[2])
+    assert str(df["tcp_flags"].dtype) == "UInt8"
+    assert df["tcp_flags"].iloc[0] == 0x12 and pd.isna(df["tcp_flags"].iloc[1])
+
+
+MIXED_OUTPUT = (
+    "frame.time_epoch\tip.src\tip.dst\tipv6.src\tipv6.dst\tarp.src.proto_ipv4\tarp.dst.proto_ipv4\tframe.len\t"
+    "ip.proto\tipv6.nxt\ttcp.srcport\ttcp.dstport\tudp.srcport\tudp.dstport\ttcp.flags\tframe.protocols\n"
+    "1.0\t\t\t2001:db8::1\t2001:db8::2\t\t\t80\t\t17\t\t\t5353\t53\t\teth:ethertype:ipv6:udp:dns\n"
+    "2.0\t\t\t\t\t10.0.0.7\t10.0.0.8\t42\t\t\t\t\t\t\t\teth:ethertype:arp\n"
+    "3.0\t192.0.2.1,10.1.0.1\t192.0.2.2,10.1.0.2\t\t\t\t\t94\t4,6\t\t51000\t443\t\t\t0x0018\teth:ethertype:ip:ip:tcp\n"
+    "4.0\t192.0.2.1\t192.0.2.2\t2001:db8::1\t2001:db8::2\t\t\t114\t41\t6\t51000\t443\t\t\t0x0018\teth:ethertype:ip:ipv6:tcp\n"
+    "5.0\t192.0.2.1,192.0.2.2\t192.0.2.2,192.0.2.1\t\t\t\t\t70\t1,17\t\t\t\t\t\t\teth:ethertype:ip:icmp:ip:udp\n"
+)
+
+
+def test_tshark_dual_stack_single_pass():
+    table = open_tshark_reader(io.BytesIO(MIXED_OUTPUT.encode())).read_all()
+    df = tshark_table_to_frame(table)
+
+    assert df["src"].tolist() == ["2001:db8::1", "10.0.0.7", "192.0.2.1", "192.0.2.1", "192.0.2.1"]
+    assert df["ethertype"].tolist() == [0x86DD, 0x0806, 0x0800, 0x0800, 0x0800]
+    assert df["protocol"].iloc[0] == 17 and pd.isna(df["protocol"].iloc[1])
+    assert df["protocol"].tolist()[2:] == [4, 41, 1]
+    assert df["inner_src"].iloc[2] == "10.1.0.1" and df["inner_dst"].iloc[3] == "2001:db8::2"
+    # IP di dalam pesan error ICMP bukan tunnel
+    assert pd.isna(df["inner_src"].iloc[0]) and pd.isna(df["inner_src"].iloc[4])
+    assert df["tcp_dstport"].iloc[2] == 443 and df["tcp_flags"].iloc[3] == 0x18
+    assert str(df["ethertype"].dtype) == "UInt16" and isinstance(df["inner_src"].dtype, pd.CategoricalDtype)
+
+
+def test_parse_pcap_file_reads_tshark_stdout(tmp_path, monkeypatch):
+    fixture = tmp_path / "fields.tsv"
+    fixture.write_text(TSHARK_OUTPUT)
+    fake = tmp_path / "tshark"
+    fake.write_text(f"#!/bin/sh\ncat '{fixture}'\n")
+    fake.chmod(fake.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+
+    df = parse_pcap_file("capture.pcap")
+
+    assert len(df) == 3
+    assert df["udp_dstport"].iloc[1] == 53
+
+
+def test_parse_pcap_file_tshark_failure(tmp_path, monkeypatch):
+    fake = tmp_path / "tshark"
+    fake.write_text("#!/bin/sh\necho 'capture rusak' >&2\nexit 2\n")
+    fake.chmod(fake.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+
+    assert parse_pcap_file("capture.pcap").empty
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic import generate_capture
+from core.auto_parser import parse_pcap_auto
+from core.pca import fit_packet_pca, packet_features, stratified_sample, PCA_FEATURES
+
+
+def test_stratified_sample_keeps_rare_classes():
+    labels = pd.Series(["tcp"] * 9_900 + ["icmp"] * 100)
+
+    picked = stratified_sample(labels, 1_000)
+
+    assert len(picked) <= 1_000
+    assert len(np.unique(picked)) == len(picked)
+    counts = labels.iloc[picked].value_counts()
+    assert counts["icmp"] >= 10 and counts["tcp"] > counts["icmp"]
+
+
+def test_fit_packet_pca_sample_and_incremental(tmp_path):
+    path = tmp_path / "capture.pcap"
+    generate_capture(str(path), 4_000, n_hosts=10)
+    df = parse_pcap_auto(str(path))
+
+    features = packet_features(df)
+    assert features.shape == (len(df), len(PCA_FEATURES))
+    assert not np.isnan(features).any()
+
+    sampled = fit_packet_pca(df, method="sample", sample_rows=1_000)
+    incremental = fit_packet_pca(df, method="incremental", chunk_rows=700)
+
+    assert len(sampled.sample_rows) <= 1_000
+    projection = sampled.transform(df, chunk_rows=900)
+    assert projection.shape == (len(df), 2)
+    np.testing.assert_allclose(projection[sampled.sample_rows[:50]],
+                               sampled.transform(df.iloc[sampled.sample_rows[:50]]), rtol=1e-5)
+    np.testing.assert_allclose(incremental.explained_variance_ratio,
+                               sampled.explained_variance_ratio, atol=0.05)
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+from benchmarks.synthetic import generate_capture
+from parsers.parse_pcap_native import parse_pcap_file, concat_chunks
+from parsers.pcap_segments import split_capture, write_segment, merge_time_ordered, parse_segments_parallel
+
+
+@pytest.mark.parametrize("fmt", ["pcap", "pcapng"])
+def test_segments_cover_capture_exactly(tmp_path, fmt):
+    path = tmp_path / f"capture.{fmt}"
+    generate_capture(str(path), 1_001, fmt=fmt)
+    full = parse_pcap_file(str(path))
+
+    segments = split_capture(str(path), 4)
+    parts = []
+    for i, segment in enumerate(segments):
+        out = tmp_path / f"part{i}.{fmt}"
+        write_segment(segment, str(out))
+        parts.append(parse_pcap_file(str(out)))
+
+    assert sum(s.packets for s in segments) == 1_001
+    pd.testing.assert_frame_equal(concat_chunks(parts), full, check_categorical=False)
+
+
+def test_parse_segments_parallel_matches_serial(tmp_path):
+    path = tmp_path / "capture.pcapng"
+    generate_capture(str(path), 3_000, fmt="pcapng", ipv6_ratio=0.5)
+
+    parallel = parse_segments_parallel(str(path), jobs=3, backend="native")
+
+    pd.testing.assert_frame_equal(parallel, parse_pcap_file(str(path)), check_categorical=False)
+
+
+def test_merge_time_ordered_is_stable_k_way_merge():
+    a = pd.DataFrame({"time": [1.0, 3.0, 5.0], "src": ["a1", "a3", "a5"]})
+    b = pd.DataFrame({"time": [3.0, 2.0, 6.0], "src": ["b3", "b2", "b6"]})
+    c = pd.DataFrame({"time": [0.5], "src": ["c0"]})
+
+    merged = merge_time_ordered([a, b, c])
+
+    assert merged["src"].tolist() == ["c0", "a1", "b2", "a3", "b3", "a5", "b6"]
+    assert np.all(np.diff(merged["time"]) >= 0)
+
+    # kolom categorical & nullable disusun langsung ke urutan merge tanpa kehilangan dtype
+    typed = [f.assign(src=f["src"].astype("category"), port=pd.array(range(len(f)), dtype="UInt16"))
+             for f in (a, b, c)]
+    typed[1].loc[1, "port"] = pd.NA
+    merged = merge_time_ordered(typed)
+    assert isinstance(merged["src"].dtype, pd.CategoricalDtype)
+    assert merged["src"].astype(str).tolist() == ["c0", "a1", "b2", "a3", "b3", "a5", "b6"]
+    assert str(merged["port"].dtype) == "UInt16"
+    assert merged["port"].tolist() == [0, 0, pd.NA, 1, 0, 2, 2]
@@ -1,15 +1,28 @@
+import os
 import pytest
 import pandas as pd
-from core.file_processor import process_uploaded_file
+from core.file_processor import process_uploaded_file, spool_upload, UploadTooLarge
+from core.parse_cache import file_digest
+
+pytestmark = pytest.mark.usefixtures("isolated_cache")
 
 class DummyUpload:
     def __init__(self, content: bytes, name: str):
         self._content = content
+        self._pos = 0
         self.name = name
         self.size = len(content)
+        self.largest_read = 0
+
+    def read(self, size=-1):
+        end = len(self._content) if size is None or size < 0 else self._pos + size
+        block = self._content[self._pos:end]
+        self._pos += len(block)
+        self.largest_read = max(self.largest_read, len(block))
+        return block
 
-    def read(self):
-        return self._content
+    def seek(self, pos):
+        self._pos = pos
 
 def test_process_uploaded_file_valid_csv():
     csv_content = b"col1,col2\n1,2\n3,4"
@@ -19,8 +32,9 @@ def test_process_uploaded_file_valid_csv():
     assert not df.empty
     assert "berhasil" in msg.lower()
 
-def test_process_uploaded_file_large_file():
-    large_content = b"a,b\n" + b"1,2\n" * (200 * 1024 * 1024 // 4)
+def test_process_uploaded_file_large_file(monkeypatch):
+    monkeypatch.setenv("NIDS_MAX_UPLOAD_MB", "1")
+    large_content = b"a,b\n" + b"1,2\n" * (2 * 1024 * 1024 // 4)
     dummy = DummyUpload(large_content, "large.csv")
     df, msg = process_uploaded_file(dummy)
     assert df.empty
@@ -31,3 +45,26 @@ def test_process_uploaded_file_invalid():
     df, msg = process_uploaded_file(dummy)
     assert df.empty
     assert "gagal" in msg.lower() or "error" in msg.lower()
+
+def test_spool_upload_hashes_in_chunks_and_cleans_up(tmp_path, monkeypatch):
+    monkeypatch.setenv("NIDS_SPOOL_DIR", str(tmp_path))
+    content = os.urandom(300_000)
+    dummy = DummyUpload(content, "capture.pcap")
+
+    with spool_upload(dummy, chunk_size=64 * 1024) as spooled:
+        assert spooled.size == len(content)
+        assert spooled.digest == file_digest(spooled.path)
+        assert dummy.largest_read <= 64 * 1024
+        path = spooled.path
+    assert not os.path.exists(path)
+
+def test_spool_upload_limit_without_declared_size(tmp_path, monkeypatch):
+    spool_dir = tmp_path / "spool"
+    spool_dir.mkdir()
+    monkeypatch.setenv("NIDS_SPOOL_DIR", str(spool_dir))
+    dummy = DummyUpload(b"x" * 5_000, "capture.pcap")
+    del dummy.size
+
+    with pytest.raises(UploadTooLarge):
+        spool_upload(dummy, max_bytes=4_000, chunk_size=1_000)
+    assert os.listdir(spool_dir) == []
@@ -0,0 +1,59 @@
+import io
+import pandas as pd
+from benchmarks.synthetic import generate_capture
+from core.auto_parser import parse_pcap_auto
+from core.aggregates import build_summary_cube
+from core.preprocessor import preprocess_packets
+from core.protocols import classify_protocols, classify_stack, L3_NAMES, L4_NAMES, L7_NAMES
+from parsers.parse_pcap import open_tshark_reader, tshark_table_to_frame
+from tests.test_parse_pcap_tshark import TSHARK_OUTPUT
+
+
+def _triples(df):
+    return [tuple(None if pd.isna(v) else v for v in row) for row in df[["l3", "l4", "l7"]].itertuples(index=False)]
+
+
+def test_parsers_agree_on_normalized_layers():
+    tshark = preprocess_packets(tshark_table_to_frame(open_tshark_reader(io.BytesIO(TSHARK_OUTPUT.encode())).read_all()))
+    # Baris yang sama dari parser native (nomor protokol) dan pyshark (highest_layer)
+    native = classify_protocols(pd.DataFrame({
+        "src": ["10.0.0.1", "10.0.0.2", None],
+        "protocol": pd.array([6, 17, None], dtype="UInt8"),
+        "tcp_srcport": pd.array([51000, None, None], dtype="UInt16"),
+        "tcp_dstport": pd.array([443, None, None], dtype="UInt16"),
+        "udp_srcport": pd.array([None, 5353, None], dtype="UInt16"),
+        "udp_dstport": pd.array([None, 53, None], dtype="UInt16"),
+    }))
+    pyshark = classify_protocols(pd.DataFrame({"src": ["10.0.0.1", "10.0.0.2", ""],
+                                               "protocol": ["TCP", "DNS", "ARP"],
+                                               "tcp_dstport": [443, None, None]}))
+
+    assert _triples(tshark) == [("IPv4", "TCP", "TLS"), ("IPv4", "UDP", "DNS"), ("ARP", None, None)]
+    assert _triples(native)[:2] == _triples(tshark)[:2]
+    assert _triples(pyshark)[0] == ("IPv4", "TCP", "TLS") and _triples(pyshark)[2] == ("ARP", None, None)
+    assert _triples(pyshark)[1][2] == "DNS"
+    for col, names in (("l3", L3_NAMES), ("l4", L4_NAMES), ("l7", L7_NAMES)):
+        assert list(tshark[col].cat.categories) == names
+
+
+def test_port_inference_and_stack_parsing():
+    df = classify_protocols(pd.DataFrame({
+        "protocol": [6, 17, 17, 6, 47],
+        "tcp_srcport": [40000, None, None, 22, None],
+        "tcp_dstport": [443, None, None, 50000, None],
+        "udp_srcport": [None, 50000, 40000, None, None],
+        "udp_dstport": [None, 443, 9999, None, None],
+    }))
+    assert df["l7"].tolist()[:2] == ["TLS", "QUIC"]
+    assert pd.isna(df["l7"].iloc[2]) and df["l7"].iloc[3] == "SSH"
+    assert df["l4"].tolist() == ["TCP", "UDP", "UDP", "TCP", "GRE"]
+    assert classify_stack("eth:ethertype:vlan:ethertype:ipv6:tcp:http:urlencoded-form") == (1, 0, 1)
+
+
+def test_cube_counts_normalized_protocols(tmp_path):
+    generate_capture(str(tmp_path / "mix.pcap"), 3_000, ipv6_ratio=0.2)
+    df = parse_pcap_auto(str(tmp_path / "mix.pcap"))
+    labels = df["l7"].astype(object).fillna(df["l4"].astype(object)).fillna(df["l3"].astype(object))
+
+    counts = build_summary_cube(df, chunk_rows=700).normalized_protocol_counts()
+    assert counts.sort_index().to_dict() == labels.value_counts().sort_index().to_dict()
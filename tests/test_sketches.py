@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+from core.sketches import HyperLogLog, CountMinSketch, TrafficSketches, build_sketches, hash_values
+
+
+def _scan_packets(n=60_000, seed=0):
+    # beberapa host berat + banyak sumber acak (spoofed) yang masing-masing muncul sekali
+    rng = np.random.default_rng(seed)
+    heavy = rng.choice([f"10.0.0.{i}" for i in range(20)], size=n // 2, p=np.arange(20, 0, -1) / 210)
+    spoofed = [f"172.{i // 65536}.{(i // 256) % 256}.{i % 256}" for i in range(n - n // 2)]
+    src = np.concatenate([heavy, spoofed])
+    rng.shuffle(src)
+    return pd.DataFrame({
+        "src": pd.Categorical(src),
+        "dst": "192.168.1.1",
+        "tcp_dstport": pd.array(rng.choice([22, 80, 443, 8080], size=n), dtype="UInt16"),
+        "length": 60,
+    })
+
+
+def test_hyperloglog_estimate_and_merge():
+    values = np.arange(100_000).astype(str).astype(object)
+    a, b, whole = HyperLogLog(12), HyperLogLog(12), HyperLogLog(12)
+    a.update(values[:60_000])
+    b.update(values[40_000:])
+    whole.update(values)
+
+    assert abs(whole.estimate() / 100_000 - 1) < 3 * whole.relative_error
+    assert np.array_equal(a.merge(b).registers, whole.registers)
+
+
+def test_count_min_never_underestimates():
+    keys = np.arange(5_000)
+    counts = np.random.default_rng(1).integers(1, 50, size=len(keys))
+    sketch = CountMinSketch(epsilon=1e-3, delta=0.01).update_hashes(hash_values(keys), counts)
+
+    estimate = sketch.estimate_hashes(hash_values(keys))
+    assert np.all(estimate >= counts)
+    assert np.mean(estimate - counts <= sketch.error_bound) >= 0.99
+
+
+def test_traffic_sketches_bounded_and_mergeable():
+    df = _scan_packets()
+    exact = df["src"].value_counts()
+    sketches = build_sketches(df, chunk_rows=7_000, capacity=200)
+
+    top = sketches.top_src.top(10)
+    assert list(top.index[:5]) == list(exact.index[:5])
+    truth = exact.reindex(top.index).to_numpy()
+    assert np.all(top["lower_bound"].to_numpy() <= truth) and np.all(truth <= top["packets"].to_numpy())
+    # memori tetap: jumlah counter tidak ikut jumlah host unik
+    assert len(sketches.top_src.summary.counts) <= 200
+    assert abs(sketches.unique_sources() / df["src"].nunique() - 1) < 3 * sketches.distinct_src.relative_error
+
+    halves = TrafficSketches(capacity=200).update(df.iloc[:30_000])
+    halves.merge(TrafficSketches(capacity=200).update(df.iloc[30_000:]))
+    assert halves.total_packets == len(df)
+    assert list(halves.top_talkers(5).index) == list(exact.index[:5])
+    assert list(halves.top_ports(4).sort_index().index) == [22, 80, 443, 8080]
+
+
+def test_summary_cube_in_sketch_mode_skips_host_groups():
+    from core.aggregates import build_summary_cube
+
+    df = _scan_packets()
+    cube = build_summary_cube(df, chunk_rows=7_000, sketches=TrafficSketches(capacity=200))
+
+    # grup per host tidak dibuat; query host dijawab sketch yang dilipat pada potongan yang sama
+    assert cube.by_src is None and cube.by_dst is None
+    assert cube.sketches.total_packets == cube.total_packets == len(df)
+    assert list(cube.top_talkers(5).index) == list(df["src"].value_counts().index[:5])
+    assert abs(cube.unique_sources() / df["src"].nunique() - 1) < 3 * cube.sketches.distinct_src.relative_error
+    assert cube.top_destinations(1).index[0] == "192.168.1.1"
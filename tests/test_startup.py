@@ -0,0 +1,48 @@
+import os
+import sys
+import json
+import subprocess
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+# Library berat yang hanya boleh dimuat saat halamannya dibuka
+HEAVY_MODULES = ("sklearn", "matplotlib", "plotly.express", "seaborn", "pyshark", "scipy")
+
+# Batas longgar untuk cold start halaman Upload (proses Python baru, termasuk import streamlit)
+STARTUP_BUDGET_SECONDS = 15
+
+_SCRIPT = f"""
+import sys, time, json
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({APP!r}, default_timeout=60)
+at.run()
+print(json.dumps({{
+    "seconds": time.perf_counter() - start,
+    "heavy": [m for m in {HEAVY_MODULES!r} if m in sys.modules],
+    "exceptions": [e.value for e in at.exception],
+    "code_blocks": len(at.code),
+}}))
+"""
+
+
+def _cold_start(tmp_path, **env):
+    env = {**os.environ, "NIDS_STORE_DIR": str(tmp_path / "store"), "NIDS_CACHE_DIR": str(tmp_path / "cache"), **env}
+    out = subprocess.run([sys.executable, "-c", _SCRIPT], capture_output=True, text=True, cwd=tmp_path, env=env,
+                         timeout=120, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_cold_start_skips_heavy_imports(tmp_path):
+    result = _cold_start(tmp_path)
+    print(f"cold start: {result['seconds']:.2f}s")
+
+    assert result["exceptions"] == []
+    assert result["heavy"] == []
+    assert result["code_blocks"] == 0  # listing direktori debug mati secara default
+    assert result["seconds"] < STARTUP_BUDGET_SECONDS
+
+
+def test_debug_listing_behind_flag(tmp_path):
+    result = _cold_start(tmp_path, NIDS_DEBUG="1")
+    assert result["code_blocks"] >= 1
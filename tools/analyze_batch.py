@@ -0,0 +1,50 @@
+# tools/analyze_batch.py
+
+import sys
+import os
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.analysis import analyze_batch  # noqa: E402
+from core.detectors import DETECTORS  # noqa: E402
+from core.report import summary_table, write_json, write_parquet, write_pdf_report  # noqa: E402
+
+
+def print_progress(analysis):
+    status = f"❌ {analysis.error}" if analysis.error else f"{analysis.summary['total_packets']:,} packets"
+    print(f"  {analysis.name}: {status} ({analysis.seconds:.2f}s)", flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Analyze captures headlessly (same numbers as the dashboard pages) and write JSON/Parquet/PDF reports.")
+    parser.add_argument("inputs", nargs="+", help="Directory, glob (quote it) or capture files")
+    parser.add_argument("-o", "--output", default="reports", help="Output directory (default: reports)")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--detectors", nargs="*", choices=list(DETECTORS), default=None,
+                        help="Run detectors (opt-in; the flag without names runs all of them)")
+    parser.add_argument("--pca", action="store_true", help="Add the PCA outlier summary (sampled fit)")
+    parser.add_argument("--formats", nargs="+", choices=("json", "parquet", "pdf"), default=["json", "parquet", "pdf"])
+    parser.add_argument("--cache", action="store_true", help="Use/populate the Arrow parse cache")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    # default hanya cube: ringkasan, top-N, timeline & paket besar
+    detectors = None if args.detectors is None else (args.detectors or list(DETECTORS))
+    analyses = analyze_batch(args.inputs, jobs=args.jobs, detectors=detectors, pca=args.pca,
+                             use_cache=args.cache, progress=print_progress)
+    os.makedirs(args.output, exist_ok=True)
+    written = []
+    if "json" in args.formats:
+        written += write_json(analyses, args.output)
+    if "parquet" in args.formats:
+        written += write_parquet(analyses, args.output)
+    if "pdf" in args.formats:
+        written.append(write_pdf_report(analyses, os.path.join(args.output, "report.pdf")))
+
+    print(summary_table(analyses).to_string(index=False))
+    print(f"✅ {len(analyses)} captures in {time.perf_counter() - start:.2f}s -> {len(written)} files in {args.output}")
+    if any(a.error for a in analyses):
+        sys.exit(1)
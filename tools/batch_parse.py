@@ -0,0 +1,34 @@
+# tools/batch_parse.py
+
+import sys
+import os
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.batch import parse_batch  # noqa: E402
+
+
+def write_output(df, output_path: str):
+    # Parquet mempertahankan tipe (categorical, nullable int); selain itu CSV
+    if output_path.lower().endswith(".parquet"):
+        df.to_parquet(output_path, index=False)
+    else:
+        df.to_csv(output_path, index=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parse a directory or glob of captures in parallel into one time-ordered table.")
+    parser.add_argument("inputs", nargs="+", help="Directory, glob (quote it) or capture files")
+    parser.add_argument("-o", "--output", help="Write the merged packets to .csv or .parquet")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    result = parse_batch(args.inputs, jobs=args.jobs)
+    print(result.report().to_string(index=False))
+    print(f"✅ {len(result.df):,} packets from {len(result.files)} files in {result.seconds:.2f}s")
+    if args.output:
+        write_output(result.df, args.output)
+        print(f"✅ Written: {args.output}")
+    if any(r.error for r in result.files):
+        sys.exit(1)
@@ -1,58 +1,123 @@
 # tools/pcap_to_csv.py
 
+import sys
 import subprocess
 import argparse
 import shutil
 import os
 
-FIELDS = [
-    "frame.time_epoch",
-    "ip.src",
-    "ip.dst",
-    "frame.len",
-    "ip.proto",
-    "tcp.srcport",
-    "tcp.dstport",
-    "udp.srcport",
-    "udp.dstport",
-    "frame.protocols"
-]
-
-def convert_pcap_to_csv(pcap_path: str, output_csv: str):
-    tshark_path = shutil.which("tshark")
-    if not tshark_path:
-        print("❌ TShark not found. Please install Wireshark/TShark and add to PATH.")
-        return
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class _OutputWriter:
+    """
+    Tulis RecordBatch Arrow ke CSV atau Parquet (dari ekstensi file) secara bertahap.
+    """
+
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self.parquet = output_path.lower().endswith(".parquet")
+        self._writer = None
+        self.rows = 0
+
+    def write(self, batch):
+        import pyarrow.csv as pa_csv
+        import pyarrow.parquet as pq
+
+        batch = _widen_dictionaries(batch)
+        if self._writer is None:
+            os.makedirs(os.path.dirname(self.output_path) or ".", exist_ok=True)
+            if self.parquet:
+                self._writer = pq.ParquetWriter(self.output_path, batch.schema)
+            else:
+                self._writer = pa_csv.CSVWriter(self.output_path, batch.schema)
+        if self.parquet:
+            self._writer.write_batch(batch)
+        else:
+            # CSV tidak mendukung dictionary secara langsung -> decode ke string
+            self._writer.write_batch(_decode_dictionaries(batch))
+        self.rows += batch.num_rows
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def _widen_dictionaries(batch):
+    import pyarrow as pa
+
+    # lebar indeks categorical pandas berbeda per batch -> samakan agar skema file tetap
+    columns = [c.cast(pa.dictionary(pa.int32(), c.type.value_type)) if pa.types.is_dictionary(c.type) else c
+               for c in batch.columns]
+    return pa.RecordBatch.from_arrays(columns, names=batch.schema.names)
+
+
+def _decode_dictionaries(batch):
+    import pyarrow as pa
+
+    columns = [c.dictionary_decode() if pa.types.is_dictionary(c.type) else c for c in batch.columns]
+    return pa.RecordBatch.from_arrays(columns, names=batch.schema.names)
 
-    tshark_cmd = [
-        tshark_path,
-        "-r", pcap_path,
-        "-T", "fields",
-        "-E", "header=y",
-        "-E", "separator=/,",
-        "-E", "quote=d"
-    ]
 
-    for field in FIELDS:
-        tshark_cmd += ["-e", field]
+def convert_pcap_to_csv(pcap_path: str, output_csv: str, jobs: int = 1, backend: str = "tshark"):
+    if jobs > 1 or backend == "native":
+        return convert_pcap_to_csv_parallel(pcap_path, output_csv, jobs=jobs, backend=backend)
+
+    import pyarrow as pa
+    from parsers.parse_pcap import iter_tshark_batches, tshark_table_to_frame
+
+    if not shutil.which("tshark"):
+        print("❌ TShark not found. Please install Wireshark/TShark and add to PATH.")
+        return
 
     print(f"🚀 Converting {pcap_path} to {output_csv} ...")
 
+    # stdout tshark dibaca langsung sebagai batch bertipe, dinormalisasi ke skema paket bersama
+    # (parsers.schema, sama dengan backend native), lalu ditulis bertahap
+    writer = _OutputWriter(output_csv)
     try:
-        # 🔧 Cegah error: buat folder kalau belum ada
-        os.makedirs(os.path.dirname(output_csv), exist_ok=True)
-
-        with open(output_csv, "w") as f:
-            subprocess.run(tshark_cmd, stdout=f, stderr=subprocess.PIPE, check=True)
-        print("✅ Conversion complete!")
+        for batch in iter_tshark_batches(pcap_path):
+            frame = tshark_table_to_frame(pa.Table.from_batches([batch]))
+            for out in pa.Table.from_pandas(frame, preserve_index=False).to_batches():
+                writer.write(out)
+        print(f"✅ Conversion complete! Rows: {writer.rows:,}")
     except subprocess.CalledProcessError as e:
         print(f"❌ Error: {e.stderr.decode()}")
+    finally:
+        writer.close()
+
+
+def convert_pcap_to_csv_parallel(pcap_path: str, output_csv: str, jobs: int, backend: str = "tshark"):
+    import pyarrow as pa
+    from parsers.pcap_segments import parse_segments_parallel
+
+    if backend == "tshark" and not shutil.which("tshark"):
+        print("❌ TShark not found. Please install Wireshark/TShark and add to PATH.")
+        return
+
+    print(f"🚀 Converting {pcap_path} to {output_csv} with {jobs} job(s), backend={backend} ...")
+    df = parse_segments_parallel(pcap_path, jobs=max(1, jobs), backend=backend)
+    if df.empty:
+        print("❌ Error: tidak ada paket yang berhasil diparse.")
+        return
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    writer = _OutputWriter(output_csv)
+    try:
+        for batch in table.to_batches():
+            writer.write(batch)
+    finally:
+        writer.close()
+    print(f"✅ Conversion complete! Rows: {writer.rows:,}")
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Convert .pcap file to .csv using TShark.")
+    parser = argparse.ArgumentParser(description="Convert .pcap file to .csv (or .parquet) using TShark.")
     parser.add_argument("pcap_path", help="Path to the input .pcap file")
-    parser.add_argument("output_csv", help="Path to save the output .csv file")
+    parser.add_argument("output_csv", help="Path to save the output .csv or .parquet file")
+    parser.add_argument("--jobs", type=int, default=1, help="Number of parallel workers (capture is split into segments)")
+    parser.add_argument("--backend", choices=["tshark", "native"], default="tshark",
+                        help="Field extractor used by each worker")
     args = parser.parse_args()
 
-    convert_pcap_to_csv(args.pcap_path, args.output_csv)
+    convert_pcap_to_csv(args.pcap_path, args.output_csv, jobs=args.jobs, backend=args.backend)